@@ -1,18 +1,79 @@
+import csv
+import json
 import logging
+import subprocess
 import sys
-from datetime import datetime
+from datetime import datetime, timedelta
+from enum import Enum
+from pathlib import Path
 from typing import List
 
 import typer
 from snakesay import snakesay
 from tabulate import tabulate
 
+from pythonanywhere.cron import DEFAULT_MAX_TASKS, compile_expression
+from pythonanywhere.logs import LogOffsets, RemoteLog
+from pythonanywhere.resource_profile import METRICS, profile_command, summarize
+from pythonanywhere.schedule_balance import hotspots, peak, propose_balance, slot_histogram
+from pythonanywhere.schedule_snapshot import load_snapshot, make_snapshot, restore
+from pythonanywhere.schedule_timeline import (
+    concurrency,
+    expiring,
+    expiry_date,
+    next_runs,
+    plot,
+    window_start,
+)
 from pythonanywhere.scripts_commons import get_logger, get_task_from_id, tabulate_formats
 from pythonanywhere.task import Task, TaskList
+from pythonanywhere.task_mux import JobTable, dispatcher_command
+from pythonanywhere.task_runner import aggregate_metrics, read_metrics, unwrap_command, wrap_command
+from pythonanywhere.task_stats import collect_task_stats
+from pythonanywhere.utils import on_pythonanywhere, run_concurrently
 
 app = typer.Typer(no_args_is_help=True)
 
 
+class OverlapPolicy(str, Enum):
+    skip = "skip"
+    queue = "queue"
+
+
+class OutputFormat(str, Enum):
+    json = "json"
+    ndjson = "ndjson"
+    csv = "csv"
+
+
+MACHINE_FORMATS = tuple(fmt.value for fmt in OutputFormat)
+RECORD_FIELDS = (
+    "task_id", "interval", "hour", "minute", "printable_time", "enabled", "command", "expiry", "logfile"
+)
+
+
+def task_record(task, fields=RECORD_FIELDS):
+    """Returns dictionary of task's `fields` (logfile as path in user's filesystem)."""
+
+    return {field: task.logfile_path if field == "logfile" else getattr(task, field) for field in fields}
+
+
+def echo_records(records, fields, fmt):
+    """Writes `records` to stdout in machine readable `fmt` one by one
+    (as they are produced), so NDJSON and CSV output is streamed."""
+
+    if fmt == OutputFormat.json:
+        typer.echo(json.dumps(list(records)))
+    elif fmt == OutputFormat.ndjson:
+        for record in records:
+            typer.echo(json.dumps(record))
+    else:
+        writer = csv.DictWriter(sys.stdout, fieldnames=fields, lineterminator="\n")
+        writer.writeheader()
+        for record in records:
+            writer.writerow(record)
+
+
 @app.command()
 def set(
     command: str = typer.Option(
@@ -27,16 +88,48 @@ def set(
         help="Sets the task to be performed daily at HOUR",
     ),
     minute: int = typer.Option(
-        ...,
+        None,
         "-m",
         "--minute",
         min=0,
         max=59,
-        help="Minute on which the task will be executed",
+        help="Minute on which the task will be executed (required unless --cron is used)",
+    ),
+    cron: str = typer.Option(
+        None,
+        "--cron",
+        help="Cron expression (UTC) compiled into daily/hourly tasks instead of --hour and --minute",
+    ),
+    max_tasks: int = typer.Option(
+        DEFAULT_MAX_TASKS,
+        "--max-tasks",
+        min=1,
+        help="With --cron: maximum number of tasks to create before falling back to one dispatcher task",
     ),
     disabled: bool = typer.Option(
         False, "-d", "--disabled", help="Creates disabled task (otherwise enabled)"
     ),
+    profile: bool = typer.Option(
+        False,
+        "-p",
+        "--profile",
+        help="Records resource usage of every run (see `pa schedule metrics`)",
+    ),
+    no_overlap: bool = typer.Option(
+        False, "--no-overlap", help="Prevents a run from starting while the previous one is still active"
+    ),
+    on_overlap: OverlapPolicy = typer.Option(
+        OverlapPolicy.skip,
+        "--on-overlap",
+        help="With --no-overlap: skip the run or queue it until the previous one finishes",
+    ),
+
+    python: str = typer.Option(
+        None,
+        "--python",
+        help="With --profile, --no-overlap or --cron: interpreter on PythonAnywhere running the wrapper, "
+        "eg python3.10 or a virtualenv's python (default: python3.X matching local version)",
+    ),
 ):
     """Create a scheduled task.
 
@@ -54,6 +147,20 @@ def set(
 
         pa schedule set --command "echo bar" --minute 27 --disabled
 
+      Create a daily task recording wall time, CPU time, peak memory and exit
+      code of every run:
+
+        pa schedule set --command "python3 heavy.py" --hour 2 --minute 5 --profile
+
+      Create an hourly task which is skipped while its previous run is still active:
+
+        pa schedule set --command "python3 sync.py" --minute 0 --no-overlap
+
+      Run a command every 15 minutes between 2:00 and 5:45 (compiled into
+      a dispatcher task as it would need 16 daily tasks):
+
+        pa schedule set --command "python3 poll.py" --cron "*/15 2-5 * * *"
+
     Note:
       Once task is created its behavior may be altered later on with
       `pa schedule update` or deleted with `pa schedule delete`
@@ -61,13 +168,34 @@ def set(
 
     logger = get_logger(set_info=True)
 
-    task = Task.to_be_created(
-        command=command, hour=hour, minute=minute, disabled=disabled
-    )
-    try:
-        task.create_schedule()
-    except Exception as e:
-        logger.warning(snakesay(str(e)))
+    if cron is not None and (hour is not None or minute is not None):
+        raise typer.BadParameter("--cron can't be used together with --hour or --minute")
+    if cron is None and minute is None:
+        raise typer.BadParameter("Missing option '-m' / '--minute' (or '--cron')")
+
+    if profile or no_overlap:
+        command = wrap_command(
+            command, metrics=profile or None, lock=no_overlap or None, on_overlap=on_overlap.value, python=python
+        )
+
+    slots = [(hour, minute)]
+    if cron is not None:
+        try:
+            plan = compile_expression(cron, command, max_tasks=max_tasks, python=python)
+        except ValueError as e:
+            raise typer.BadParameter(str(e))
+        command, slots = plan.command, plan.slots
+        kind = "1 dispatcher task" if plan.dispatcher else f"{len(slots)} task(s)"
+        logger.info(snakesay(f"Cron '{cron}' compiled to {kind}"))
+
+    for hour, minute in slots:
+        task = Task.to_be_created(
+            command=command, hour=hour, minute=minute, disabled=disabled
+        )
+        try:
+            task.create_schedule()
+        except Exception as e:
+            logger.warning(snakesay(str(e)))
 
 
 delete_app = typer.Typer()
@@ -142,7 +270,10 @@ def get(
     ),
     snake: bool = typer.Option(
         False, "-s", "--snakesay", help="Turns on snakesay... because why not"
-    )
+    ),
+    output_format: OutputFormat = typer.Option(
+        None, "-f", "--format", help="Prints specs in machine readable format instead of a table"
+    ),
 ):
     """Get scheduled task's specs.
 
@@ -166,9 +297,13 @@ def get(
 
     Get only logfile name for task with id 42:
 
-        pa schedule get 42 --logfile --no-spec"""
+        pa schedule get 42 --logfile --no-spec
 
-    kwargs = {k: v for k, v in locals().items() if k != "task_id"}
+    Get all specs as JSON:
+
+        pa schedule get 42 --format json"""
+
+    kwargs = {k: v for k, v in locals().items() if k not in ("task_id", "output_format")}
     logger = get_logger(set_info=True)
 
     task = get_task_from_id(task_id)
@@ -186,7 +321,11 @@ def get(
         specs.update({"logfile": task.logfile.replace(f"/user/{task.user}/files", "")})
 
     intro = f"Task {task_id} specs: "
-    if print_only_values:
+    if output_format == OutputFormat.json:
+        typer.echo(json.dumps(specs))
+    elif output_format is not None:
+        echo_records([specs], list(specs), output_format)
+    elif print_only_values:
         specs = "\n".join([str(val) for val in specs.values()])
         logger.info(specs)
     elif print_snake:
@@ -206,21 +345,43 @@ def tablefmt_callback(value: str):
     return value
 
 
+def list_format_callback(value: str):
+    if value not in tabulate_formats and value not in MACHINE_FORMATS:
+        raise typer.BadParameter(
+            f"Table format has to be one of: {', '.join(tabulate_formats)} "
+            f"(or one of machine readable formats: {', '.join(MACHINE_FORMATS)})"
+        )
+    return value
+
+
 @app.command("list")
 def list_(
     tablefmt: str = typer.Option(
-        "simple", "-f", "--format", help="Table format", callback=tablefmt_callback
+        "simple",
+        "-f",
+        "--format",
+        help="Table format or machine readable format (json, ndjson, csv)",
+        callback=list_format_callback,
     )
 ):
     """Get list of user's scheduled tasks as a table with columns:
     id, interval, at (hour:minute/minute past), status (enabled/disabled), command.
 
+    With json, ndjson or csv format all specs of every task are printed
+    to stdout without building a table (ndjson and csv are streamed one
+    task per line).
+
     Note:
     This script provides an overview of all tasks. Once a task id is
     known and some specific data is required it's more convenient to get
     it using `pa schedule get` command instead of parsing the table.
     """
 
+    if tablefmt in MACHINE_FORMATS:
+        records = (task_record(task) for task in TaskList().tasks)
+        echo_records(records, RECORD_FIELDS, OutputFormat(tablefmt))
+        return
+
     logger = get_logger(set_info=True)
 
     headers = "id", "interval", "at", "status", "command"
@@ -282,6 +443,25 @@ def update(
         "--hourly",
         help="Switches interval to hourly (takes precedence over --hour, i.e. sets hour to None)"
     ),
+    profile: bool = typer.Option(
+        False,
+        "--profile",
+        help="Records resource usage of every run (see `pa schedule metrics`)",
+    ),
+    no_overlap: bool = typer.Option(
+        False, "--no-overlap", help="Prevents a run from starting while the previous one is still active"
+    ),
+    on_overlap: OverlapPolicy = typer.Option(
+        None,
+        "--on-overlap",
+        help="With --no-overlap: skip the run or queue it until the previous one finishes (default: skip)",
+    ),
+    python: str = typer.Option(
+        None,
+        "--python",
+        help="When wrapping command: interpreter on PythonAnywhere running the wrapper, "
+        "eg python3.10 or a virtualenv's python (default: python3.X matching local version)",
+    ),
     quiet: bool = typer.Option(False, "-q", "--quiet", help="Turns off messages"),
     porcelain: bool = typer.Option(
         False, "-p", "--porcelain", help="Prints message in easy-to-parse format"
@@ -293,7 +473,12 @@ def update(
     created until first execution of the task.
     To change interval from hourly to daily use --daily flag and provide --hour.
     When --daily flag is not accompanied with --hour, new hour for the task
-    will be automatically set to current hour.
+    will be automatically set to current hour (hour of a task which is
+    already daily is kept).
+    Task's current specs are fetched only when needed (--toggle-enabled,
+    --daily without --hour, --hour without --daily, changing or wrapping
+    command), otherwise the task is updated with a single request.
+    New --command keeps --profile/--no-overlap options of the current one.
     When changing interval from daily to hourly --hour flag is ignored.
 
     Example:
@@ -321,13 +506,58 @@ def update(
         logger.warning(msg if porcelain else snakesay(msg))
         sys.exit(1)
 
+    profile = kwargs.pop("profile")
+    no_overlap = kwargs.pop("no_overlap")
+    on_overlap = kwargs.pop("on_overlap")
+    python = kwargs.pop("python")
+    daily = kwargs.pop("daily")
+
+    wrapping = profile or no_overlap or on_overlap or python
+
+    # current specs are fetched only when new ones depend on them,
+    # otherwise the update takes a single request
+    needs_current_specs = (
+        kwargs["toggle_enabled"]
+        or (daily and not kwargs["hour"])
+        or (kwargs["hour"] is not None and not daily and not kwargs["hourly"])
+        or wrapping
+        or kwargs["command"]
+    )
+    task = get_task_from_id(task_id) if needs_current_specs else Task.to_be_updated(task_id)
+
     if kwargs.pop("hourly"):
         kwargs["interval"] = "hourly"
-    if kwargs.pop("daily"):
-        kwargs["hour"] = kwargs["hour"] if kwargs["hour"] else datetime.now().hour
+        kwargs["hour"] = None
+    if daily:
+        if not kwargs["hour"]:
+            kwargs["hour"] = task.hour if task.interval == "daily" else datetime.now().hour
         kwargs["interval"] = "daily"
 
-    task = get_task_from_id(task_id)
+    if kwargs["command"] or wrapping:
+        _, current_options = unwrap_command(task.command or "")
+        if on_overlap and not no_overlap and "--lock" not in current_options:
+            raise typer.BadParameter(
+                "--on-overlap needs --no-overlap (or a task already guarded against overlapping runs)"
+            )
+        command = kwargs["command"] or task.command or ""
+        if kwargs["command"] and current_options:
+            # new command keeps wrapper options of the current one
+            command = wrap_command(
+                command,
+                metrics=current_options.get("--metrics"),
+                lock=current_options.get("--lock"),
+                on_overlap=current_options.get("--on-overlap"),
+                python=python,
+            )
+        if wrapping:
+            command = wrap_command(
+                command,
+                metrics=profile or None,
+                lock=no_overlap or None,
+                on_overlap=on_overlap.value if on_overlap else None,
+                python=python,
+            )
+        kwargs["command"] = command
 
     enable_opt = [k for k in ["toggle_enabled", "disable", "enable"] if kwargs.pop(k)]
     params = {k: v for k, v in kwargs.items() if v}
@@ -339,3 +569,577 @@ def update(
         task.update_schedule(params, porcelain=porcelain)
     except Exception as e:
         logger.warning(snakesay(str(e)))
+
+
+@app.command()
+def balance(
+    pin: List[int] = typer.Option(
+        [], "-p", "--pin", help="Id of a task which must not be moved (may be repeated)"
+    ),
+    top: int = typer.Option(10, "-t", "--top", min=1, help="Number of hotspots to report"),
+    apply: bool = typer.Option(
+        False, "-a", "--apply", help="Applies proposed changes (otherwise only reports them)"
+    ),
+):
+    """Find minute slots shared by many tasks and spread tasks out.
+
+    Builds a histogram of enabled tasks starting in every (hour, minute) slot
+    (hourly tasks count in every hour), reports the most crowded slots and
+    proposes new minutes that minimise the peak number of tasks starting
+    together.  Daily tasks keep their hour; pinned and disabled tasks are
+    never moved.
+
+    Example:
+      Show hotspots and the proposed changes, keeping task 42 where it is:
+
+        pa schedule balance --pin 42
+
+      Apply the proposed changes:
+
+        pa schedule balance --pin 42 --apply"""
+
+    logger = get_logger(set_info=True)
+
+    tasks = TaskList().tasks
+    current = slot_histogram(tasks)
+    if not current:
+        logger.info(snakesay("No enabled scheduled tasks"))
+        return
+
+    crowded = hotspots(current, top=top)
+    if not crowded:
+        logger.info(snakesay("No two tasks start at the same time, nothing to balance"))
+        return
+
+    logger.info(f"Current peak: {peak(current)} tasks starting at the same time")
+    logger.info(
+        tabulate(
+            [[f"{hour:02d}:{minute:02d}", count] for (hour, minute), count in crowded],
+            ("slot", "tasks"),
+            tablefmt="simple",
+        )
+    )
+
+    proposed, moves = propose_balance(tasks, pinned=pin)
+    if not moves or peak(proposed) >= peak(current):
+        logger.info(snakesay("Could not find a better distribution, nothing to change"))
+        return
+
+    logger.info(f"Proposed peak: {peak(proposed)} tasks starting at the same time")
+    logger.info(
+        tabulate(
+            [
+                [move.task.task_id, move.task.interval, move.old_minute, move.new_minute, move.task.command]
+                for move in moves
+            ],
+            ("id", "interval", "from minute", "to minute", "command"),
+            tablefmt="simple",
+        )
+    )
+
+    if not apply:
+        logger.info(snakesay("Run again with --apply to update the tasks"))
+        return
+
+    for move in moves:
+        try:
+            move.task.update_schedule({"minute": move.new_minute}, porcelain=True)
+        except Exception as e:
+            logger.warning(snakesay(str(e)))
+
+
+@app.command()
+def logs(
+    task_id: int = typer.Argument(..., metavar="id"),
+    new: bool = typer.Option(
+        False, "-n", "--new", help="Prints only output appended since the previous --new call"
+    ),
+    follow: bool = typer.Option(
+        False, "-f", "--follow", help="Keeps printing output as it is appended to the log"
+    ),
+    interval: float = typer.Option(
+        1.0, "-i", "--interval", min=0.1, help="Seconds between checks while log grows (with --follow)"
+    ),
+    max_interval: float = typer.Option(
+        30.0, "-x", "--max-interval", min=0.1, help="Longest pause between checks when log is idle (with --follow)"
+    ),
+):
+    """Print output of a scheduled task from its current logfile.
+
+    Only bytes which have not been read yet are fetched: with --new read
+    offset is remembered between calls, with --follow the log is polled
+    for new output, checking less often (up to --max-interval) while it
+    stays idle.  Log rotation is detected and the new file is read from
+    the beginning.
+
+    Example:
+      Watch output of the task with id 42:
+
+        pa schedule logs 42 --follow"""
+
+    logger = get_logger()
+
+    task = get_task_from_id(task_id)
+    path = task.logfile_path
+    if path is None:
+        logger.warning(snakesay(f"Task {task_id} has no logfile"))
+        sys.exit(1)
+    offsets = LogOffsets() if new else None
+    log = RemoteLog(path, offset=offsets.get(path) if offsets else 0)
+
+    try:
+        typer.echo(log.read_new(), nl=False)
+        if follow:
+            for chunk in log.follow(min_interval=interval, max_interval=max_interval):
+                typer.echo(chunk, nl=False)
+    except KeyboardInterrupt:
+        pass
+    except Exception as e:
+        logger.warning(snakesay(str(e)))
+        sys.exit(1)
+    finally:
+        if offsets:
+            offsets.set(path, log.offset)
+
+
+@app.command()
+def stats(
+    workers: int = typer.Option(
+        8, "-w", "--workers", min=1, help="Number of logfiles fetched concurrently"
+    ),
+    tablefmt: str = typer.Option(
+        "simple", "-f", "--format", help="Table format", callback=tablefmt_callback
+    ),
+):
+    """Show run statistics of scheduled tasks collected from their logfiles.
+
+    For every task its current logfile is parsed for completion records and
+    the table shows number of runs, failure rate (non-zero return codes),
+    total, median, 95th percentile and longest run duration in seconds, and
+    the trend -- change of mean duration between older and newer half of
+    runs.  Tasks using most time are listed first.
+
+    Note:
+    Only the current logfile of each task is taken into account."""
+
+    logger = get_logger(set_info=True)
+
+    tasks = TaskList().tasks
+    if not tasks:
+        logger.info(snakesay("No scheduled tasks"))
+        return
+
+    collected = collect_task_stats(tasks, max_workers=workers)
+    for task_stats, error in collected:
+        if error is not None:
+            logger.warning(f"Could not read logfile of task {task_stats.task.task_id}: {error}")
+
+    def fmt(value, pattern="{:.2f}"):
+        return "-" if value is None else pattern.format(value)
+
+    headers = "id", "runs", "failures", "total", "p50", "p95", "max", "trend", "command"
+    table = [
+        [
+            s.task.task_id,
+            s.runs,
+            fmt(s.failure_rate, "{:.0%}"),
+            fmt(s.total),
+            fmt(s.p50),
+            fmt(s.p95),
+            fmt(s.max),
+            fmt(s.trend, "{:+.0%}"),
+            s.task.command,
+        ]
+        for s in sorted((s for s, _ in collected), key=lambda s: s.total, reverse=True)
+    ]
+    logger.info(tabulate(table, headers, tablefmt=tablefmt))
+
+
+def _format_metric(metric, value):
+    if metric == "peak_rss" or metric.endswith("_bytes"):
+        return f"{value / 2 ** 20:.1f} MiB"
+    return f"{value:.2f} s"
+
+
+@app.command("run-local")
+def run_local(
+    task_id: int = typer.Argument(None, metavar="[id]"),
+    command: str = typer.Option(
+        None, "-c", "--command", help="Command to profile instead of an existing task's command"
+    ),
+    repeat: int = typer.Option(1, "-r", "--repeat", min=1, help="Runs the command REPEAT times"),
+    interval: float = typer.Option(
+        0.05, "-i", "--interval", min=0.01, help="Resource sampling interval in seconds"
+    ),
+    hide_output: bool = typer.Option(
+        False, "-o", "--hide-output", help="Discards output of the command"
+    ),
+):
+    """Run a scheduled task's command locally and report its resource usage.
+
+    Command is taken from the task with given id (or provided with --command)
+    and run in a shell.  Report contains wall time, CPU user and system time,
+    peak memory (RSS) and bytes read/written.  With --repeat the command is
+    run several times and min/median/mean/max of every metric is shown.
+
+    Example:
+      Check how many CPU seconds the task 42 needs, running it 5 times:
+
+        pa schedule run-local 42 --repeat 5 --hide-output"""
+
+    logger = get_logger(set_info=True)
+
+    if (task_id is None) == (command is None):
+        logger.warning(snakesay("Provide either task id or --command"))
+        sys.exit(1)
+
+    if command is None:
+        command = get_task_from_id(task_id).command
+
+    output = subprocess.DEVNULL if hide_output else None
+    profiles = []
+    for run in range(1, repeat + 1):
+        logger.info(f"Run {run}/{repeat}: {command}")
+        profiles.append(profile_command(command, interval=interval, stdout=output, stderr=output))
+
+    failed = [profile.returncode for profile in profiles if profile.returncode != 0]
+    if failed:
+        logger.warning(f"{len(failed)} of {repeat} runs failed (return codes: {', '.join(map(str, failed))})")
+
+    if repeat == 1:
+        table = [[metric, _format_metric(metric, getattr(profiles[0], metric))] for metric in METRICS]
+        table.append(["returncode", profiles[0].returncode])
+        logger.info(tabulate(table, tablefmt="simple"))
+    else:
+        summary = summarize(profiles)
+        headers = "metric", "min", "median", "mean", "max"
+        table = [
+            [metric] + [_format_metric(metric, summary[metric][key]) for key in headers[1:]]
+            for metric in METRICS
+        ]
+        logger.info(tabulate(table, headers, tablefmt="simple"))
+
+
+@app.command()
+def metrics(
+    task_id: int = typer.Argument(..., metavar="id"),
+    tablefmt: str = typer.Option(
+        "simple", "-f", "--format", help="Table format", callback=tablefmt_callback
+    ),
+):
+    """Show resource usage of runs of a task created or updated with --profile.
+
+    Every run of a profiled task appends a record with wall time, CPU user
+    and system time, peak memory (RSS), bytes read/written and exit code to
+    a metrics file next to task logs.  This command shows min, median, mean
+    and max of every metric over all recorded runs.  High CPU time close to
+    wall time means the task is CPU-bound, wall time much longer than CPU
+    time means it's mostly waiting (e.g. on I/O or network)."""
+
+    logger = get_logger(set_info=True)
+
+    task = get_task_from_id(task_id)
+    _, options = unwrap_command(task.command or "")
+    if "--metrics" not in options:
+        logger.warning(snakesay(f"Task {task_id} is not profiled, update it with --profile first"))
+        sys.exit(1)
+
+    try:
+        profiles = read_metrics(RemoteLog(options["--metrics"]).iter_lines())
+    except Exception as e:
+        logger.warning(snakesay(str(e)))
+        sys.exit(1)
+
+    summary = aggregate_metrics(profiles)
+    if summary is None:
+        logger.info(snakesay(f"No runs of task {task_id} recorded yet"))
+        return
+
+    logger.info(f"Task {task_id}: {summary['runs']} runs, {summary['failures']} failed")
+    headers = "metric", "min", "median", "mean", "max"
+    table = [
+        [metric] + [_format_metric(metric, summary[metric][key]) for key in headers[1:]]
+        for metric in METRICS
+    ]
+    logger.info(tabulate(table, headers, tablefmt=tablefmt))
+
+
+mux_app = typer.Typer(no_args_is_help=True)
+app.add_typer(
+    mux_app,
+    name="mux",
+    help="Run many jobs from a single scheduled task (task multiplexer).",
+)
+
+DEFAULT_MUX_TABLE = "~/pa_mux.json"
+
+
+def table_option():
+    return typer.Option(DEFAULT_MUX_TABLE, "-t", "--table", help="Path to the job table (JSON file)")
+
+
+@mux_app.command("add")
+def mux_add(
+    name: str = typer.Argument(..., help="Job name (existing job with that name is replaced)"),
+    command: str = typer.Option(..., "-c", "--command", help="Job's command"),
+    hours: List[int] = typer.Option(
+        [], "-o", "--hour", min=0, max=23, help="Hour in which the job runs (may be repeated; default: every hour)"
+    ),
+    table: str = table_option(),
+):
+    """Add a job to the multiplexer's job table."""
+
+    logger = get_logger(set_info=True)
+    job_table = JobTable(table)
+    job_table.add(name, command, hours=hours)
+    job_table.save()
+    logger.info(snakesay(f"Job {name} saved in {job_table.path}"))
+
+
+@mux_app.command("remove")
+def mux_remove(
+    name: str = typer.Argument(..., help="Job name"),
+    table: str = table_option(),
+):
+    """Remove a job from the multiplexer's job table."""
+
+    logger = get_logger(set_info=True)
+    job_table = JobTable(table)
+    if not job_table.remove(name):
+        logger.warning(snakesay(f"No job named {name} in {job_table.path}"))
+        sys.exit(1)
+    job_table.save()
+    logger.info(snakesay(f"Job {name} removed"))
+
+
+@mux_app.command("list")
+def mux_list(table: str = table_option()):
+    """List jobs from the multiplexer's job table."""
+
+    logger = get_logger(set_info=True)
+    job_table = JobTable(table)
+    rows = [
+        [
+            job["name"],
+            ", ".join(map(str, job["hours"])) if job.get("hours") else "every hour",
+            job["command"],
+            job_table.log_path(job),
+        ]
+        for job in job_table.jobs
+    ]
+    msg = tabulate(rows, ("name", "hours", "command", "log"), tablefmt="simple") if rows else snakesay("No jobs")
+    logger.info(msg)
+
+
+@mux_app.command("install")
+def mux_install(
+    minute: int = typer.Option(
+        ..., "-m", "--minute", min=0, max=59, help="Minute past every hour on which jobs are dispatched"
+    ),
+    workers: int = typer.Option(4, "-w", "--workers", min=1, help="Maximum number of jobs run concurrently"),
+    table: str = table_option(),
+    python: str = typer.Option(
+        None,
+        "--python",
+        help="Interpreter on PythonAnywhere running the dispatcher (default: python3.X matching local version)",
+    ),
+):
+    """Create hourly scheduled task dispatching jobs from the job table.
+
+    The dispatcher reads the job table when it runs, so this command (and
+    `pa schedule mux add/remove`) has to be run on PythonAnywhere, where
+    the table is stored.
+
+    On every run the dispatcher starts all due jobs concurrently (at most
+    --workers at once) and every job logs to its own file (see
+    `pa schedule mux list`).  Jobs may be added or removed later without
+    touching the scheduled task.
+
+    Example:
+      Run a backup at 2 am and a feed refresh every hour, using one task slot:
+
+        pa schedule mux add backup --command "python3 backup.py" --hour 2
+
+        pa schedule mux add feeds --command "python3 refresh_feeds.py"
+
+        pa schedule mux install --minute 5"""
+
+    logger = get_logger(set_info=True)
+    if not on_pythonanywhere():
+        logger.warning(
+            snakesay(
+                "The dispatcher reads the job table on PythonAnywhere, so it has to be installed "
+                "from a PythonAnywhere console"
+            )
+        )
+        sys.exit(1)
+    job_table = JobTable(table)
+    if not job_table.path.exists():
+        job_table.save()
+
+    task = Task.to_be_created(
+        command=dispatcher_command(job_table.path, workers=workers, python=python), minute=minute
+    )
+    try:
+        task.create_schedule()
+    except Exception as e:
+        logger.warning(snakesay(str(e)))
+
+
+@app.command()
+def timeline(
+    hours: int = typer.Option(24, "-o", "--hours", min=1, help="Length of the forecast window in hours"),
+    runs: int = typer.Option(3, "-r", "--runs", min=1, help="Number of next runs shown for every task"),
+):
+    """Show next runs of scheduled tasks and expected load in coming hours.
+
+    Lists next run times (UTC) of every enabled task, plots the number of
+    tasks starting in every minute of the window (one line per hour, one
+    character per minute: '.' for none, digit for number of starting tasks,
+    '+' for more than 9) and warns about tasks expiring within the window.
+
+    Example:
+      Find a quiet slot for a heavy job in the next 12 hours:
+
+        pa schedule timeline --hours 12"""
+
+    logger = get_logger(set_info=True)
+
+    tasks = TaskList().tasks
+    if not tasks:
+        logger.info(snakesay("No scheduled tasks"))
+        return
+
+    start = window_start()
+    minutes = hours * 60
+
+    table = [
+        [task.task_id, task.interval, ", ".join(f"{run:%m-%d %H:%M}" for run in next_runs(task, start, runs)),
+         task.command]
+        for task in tasks
+        if task.enabled
+    ]
+    logger.info(tabulate(table, ("id", "interval", "next runs (UTC)", "command"), tablefmt="simple"))
+
+    load = concurrency(tasks, start, minutes)
+    logger.info("")
+    logger.info(f"Tasks starting per minute, peak {max(load.values(), default=0)}:")
+    logger.info(plot(load, start, minutes))
+
+    for task in expiring(tasks, start, minutes):
+        logger.warning(
+            snakesay(f"Task {task.task_id} '{task.command}' expires on {task.expiry} -- extend it to keep it running")
+        )
+
+
+@app.command()
+def extend(
+    id_numbers: List[int] = typer.Argument(None, metavar="[ID_NUMBERS]..."),
+    all_tasks: bool = typer.Option(False, "-a", "--all", help="Extends all expiring tasks"),
+    expiring_within: int = typer.Option(
+        None, "-e", "--expiring-within", min=0, help="Extends tasks expiring within DAYS", metavar="DAYS"
+    ),
+    workers: int = typer.Option(4, "-w", "--workers", min=1, help="Number of tasks extended concurrently"),
+):
+    """Extend expiry of scheduled tasks.
+
+    Tasks may be selected by id, with --all (every task which has an expiry
+    date) or with --expiring-within DAYS.  Selected tasks are extended
+    concurrently (at most --workers at once).  Requested ids which are
+    not extended (missing tasks, tasks without expiry) are reported.
+
+    Example:
+      Extend all tasks expiring within the next week:
+
+        pa schedule extend --expiring-within 7"""
+
+    logger = get_logger(set_info=True)
+
+    if not (id_numbers or all_tasks or expiring_within is not None):
+        logger.warning(snakesay("Provide task ids, --all or --expiring-within DAYS"))
+        sys.exit(1)
+
+    listed = TaskList().tasks
+    tasks = [task for task in listed if task.expiry]
+    if id_numbers:
+        by_id = {task.task_id: task for task in listed}
+        for task_id in dict.fromkeys(id_numbers):
+            if task_id not in by_id:
+                logger.warning(f"Task {task_id} not extended: no such task")
+            elif not by_id[task_id].expiry:
+                logger.warning(f"Task {task_id} not extended: it has no expiry date")
+        tasks = [task for task in tasks if task.task_id in id_numbers]
+    if expiring_within is not None:
+        deadline = datetime.now().date() + timedelta(days=expiring_within)
+
+        def expires_by_deadline(task):
+            expiry = expiry_date(task)
+            return expiry is not None and expiry <= deadline
+
+        expiring = [task for task in tasks if expires_by_deadline(task)]
+        if id_numbers:
+            for task in tasks:
+                if task not in expiring:
+                    logger.warning(f"Task {task.task_id} not extended: it doesn't expire within {expiring_within} days")
+        tasks = expiring
+
+    if not tasks:
+        logger.info(snakesay("No tasks to extend"))
+        return
+
+    results = run_concurrently(lambda task: task.extend_schedule(), tasks, max_workers=workers)
+    failed = [(task, error) for task, _, error in results if error is not None]
+    for task, error in failed:
+        logger.warning(f"Task {task.task_id} not extended: {error}")
+    logger.info(snakesay(f"Extended {len(tasks) - len(failed)} of {len(tasks)} tasks"))
+    if failed:
+        sys.exit(1)
+
+
+@app.command()
+def export(
+    output: Path = typer.Option(None, "-o", "--output", help="Path of the snapshot file (defaults to stdout)"),
+):
+    """Export scheduled tasks to a versioned JSON snapshot with checksums.
+
+    Snapshot may be restored (e.g. on another account) with
+    `pa schedule import`."""
+
+    snapshot = json.dumps(make_snapshot(TaskList()), indent=2)
+    if output is None:
+        typer.echo(snapshot)
+        return
+    output.write_text(snapshot)
+    get_logger(set_info=True).info(snakesay(f"Schedule exported to {output}"))
+
+
+@app.command("import")
+def import_(
+    snapshot_file: Path = typer.Argument(..., exists=True, dir_okay=False, help="Snapshot created by export"),
+    workers: int = typer.Option(4, "-w", "--workers", min=1, help="Number of tasks created concurrently"),
+):
+    """Recreate scheduled tasks from a snapshot created by `pa schedule export`.
+
+    Tasks already present in the schedule (same command, interval, time
+    and enabled state) are skipped, so importing the same snapshot twice
+    is safe."""
+
+    logger = get_logger(set_info=True)
+    try:
+        records = load_snapshot(json.loads(snapshot_file.read_text()))
+    except ValueError as e:
+        logger.warning(snakesay(f"Invalid snapshot: {e}"))
+        sys.exit(1)
+
+    results, skipped = restore(records, TaskList(), max_workers=workers)
+    failed = [(record, error) for record, _, error in results if error is not None]
+    for record, error in failed:
+        logger.warning(f"Task '{record['command']}' not created: {error}")
+    logger.info(
+        snakesay(
+            f"Created {len(results) - len(failed)} tasks, "
+            f"skipped {len(skipped)} already existing, failed {len(failed)}"
+        )
+    )
+    if failed:
+        sys.exit(1)
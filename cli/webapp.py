@@ -1,5 +1,7 @@
 #!/usr/bin/python3
 import getpass
+import json
+from datetime import datetime, timedelta, timezone
 from enum import Enum
 from pathlib import Path
 
@@ -9,24 +11,93 @@ from pythonanywhere_core.webapp import Webapp
 from snakesay import snakesay
 from tabulate import tabulate
 
+from pythonanywhere.access_log import collect_access_stats
+from pythonanywhere.error_log import collect_error_clusters
+from pythonanywhere.log_store import LogStore
+from pythonanywhere.logs import LogOffsets
 from pythonanywhere.project import Project
-from pythonanywhere.utils import ensure_domain, format_log_deletion_message
+from pythonanywhere.server_log import EVENT_KINDS, collect_server_health
+from pythonanywhere.static_audit import collect_static_audit, get_static_file_mappings, locate_directory
+from pythonanywhere.utils import ensure_domain, on_pythonanywhere, run_concurrently
+from pythonanywhere.warmup import read_urls, time_to_first_success, warm_up
+from pythonanywhere.webapp_logs import (
+    WebappLog,
+    delete_webapp_logs,
+    format_deletion_summary,
+    log_path,
+    log_targets,
+)
 
 app = typer.Typer(no_args_is_help=True)
 
 
+class DetailsFormat(str, Enum):
+    table = "table"
+    json = "json"
+
+
 @app.command(name="list")
-def list_():
+def list_(
+    details: bool = typer.Option(
+        False, "--details", help="Fetches details of all webapps concurrently and prints them in one table"
+    ),
+    output_format: DetailsFormat = typer.Option(
+        DetailsFormat.table, "-f", "--format", help="With --details: print table or JSON"
+    ),
+    workers: int = typer.Option(8, "-w", "--workers", min=1, help="Number of webapps fetched concurrently"),
+):
     """List all your webapps"""
     webapps = Webapp.list_webapps()
     if not webapps:
         typer.echo(snakesay("No webapps found."))
         return
 
+    if details:
+        _get_many([webapp["domain_name"] for webapp in webapps], workers, output_format)
+        return
     for webapp in webapps:
         typer.echo(webapp['domain_name'])
 
 
+def _target_domains(all_webapps, domains_from):
+    if all_webapps and domains_from:
+        raise typer.BadParameter("use either --all or --domains-from, not both")
+    if all_webapps:
+        return [webapp["domain_name"] for webapp in Webapp.list_webapps()]
+    lines = (line.strip() for line in domains_from.read_text().splitlines())
+    return [line for line in lines if line and not line.startswith("#")]
+
+
+def _echo_status_table(results, describe):
+    """Prints table with status of every domain from `results` (as
+    returned by `run_concurrently`), `describe` turns successful result
+    into (status, details) tuple.  Returns number of failed domains."""
+
+    table = []
+    failed = 0
+    for domain, result, error in results:
+        if error is None:
+            table.append([domain, *describe(result)])
+        else:
+            failed += 1
+            table.append([domain, "failed", str(error) or type(error).__name__])
+    typer.echo(tabulate(table, ["domain", "status", "details"], tablefmt="simple"))
+    return failed
+
+
+WEBAPP_DETAILS = [
+    ("Domain", "domain_name", "unknown"),
+    ("Python version", "python_version", "unknown"),
+    ("Source directory", "source_directory", "not set"),
+    ("Virtualenv path", "virtualenv_path", "not set"),
+    ("Enabled", "enabled", "unknown"),
+]
+
+
+def _webapp_details(webapp_info):
+    return [webapp_info.get(key, default) for _, key, default in WEBAPP_DETAILS]
+
+
 @app.command()
 def get(
     domain_name: str = typer.Option(
@@ -34,24 +105,41 @@ def get(
         "-d",
         "--domain",
         help="Domain name, eg www.mydomain.com",
-    )
+    ),
+    all_webapps: bool = typer.Option(False, "--all", help="Gets details of all your webapps"),
+    domains_from: Path = typer.Option(
+        None, "--domains-from", exists=True, dir_okay=False, help="File with domain names, one per line"
+    ),
+    workers: int = typer.Option(8, "-w", "--workers", min=1, help="Number of webapps fetched concurrently"),
 ):
-    """Get details for a specific webapp"""
+    """Get details for a specific webapp (or several of them with --all or --domains-from)"""
+    if all_webapps or domains_from:
+        _get_many(_target_domains(all_webapps, domains_from), workers)
+        return
     domain_name = ensure_domain(domain_name)
     webapp = Webapp(domain_name)
     webapp_info = webapp.get()
 
-    table = [
-        ["Domain", webapp_info['domain_name']],
-        ["Python version", webapp_info.get('python_version', 'unknown')],
-        ["Source directory", webapp_info.get('source_directory', 'not set')],
-        ["Virtualenv path", webapp_info.get('virtualenv_path', 'not set')],
-        ["Enabled", webapp_info.get('enabled', 'unknown')]
-    ]
-
+    table = [[label, value] for (label, _, _), value in zip(WEBAPP_DETAILS, _webapp_details(webapp_info))]
     typer.echo(tabulate(table, tablefmt="simple"))
 
 
+def _get_many(domains, workers, output_format=DetailsFormat.table):
+    results = run_concurrently(lambda domain: Webapp(domain).get(), domains, max_workers=workers)
+    infos = [info for _, info, error in results if error is None]
+    if output_format == DetailsFormat.json:
+        typer.echo(json.dumps(infos, indent=2))
+    else:
+        headers = [label for label, _, _ in WEBAPP_DETAILS]
+        table = [_webapp_details(info) for info in infos]
+        typer.echo(tabulate(table, headers, tablefmt="simple", disable_numparse=True))
+    failures = [(domain, error) for domain, _, error in results if error is not None]
+    for domain, error in failures:
+        typer.echo(snakesay(f"Could not get {domain}: {error}"), err=output_format == DetailsFormat.json)
+    if failures:
+        raise typer.Exit(code=1)
+
+
 @app.command()
 def create(
     domain_name: str = typer.Option(
@@ -98,9 +186,40 @@ def reload(
         "-d",
         "--domain",
         help="Domain name, eg www.mydomain.com",
-    )
+    ),
+    all_webapps: bool = typer.Option(False, "--all", help="Reloads all your webapps"),
+    domains_from: Path = typer.Option(
+        None, "--domains-from", exists=True, dir_okay=False, help="File with domain names, one per line"
+    ),
+    workers: int = typer.Option(
+        8, "-w", "--workers", min=1, help="Number of webapps reloaded (or URLs warmed up, with --warm) concurrently"
+    ),
+    warm: Path = typer.Option(
+        None,
+        "--warm",
+        exists=True,
+        dir_okay=False,
+        help="File with URLs (or paths) requested after reload until they respond (single webapp only)",
+        metavar="URLS_FILE",
+    ),
+    warm_timeout: int = typer.Option(60, "--warm-timeout", min=1, help="Seconds to wait for warm up URLs"),
 ):
-    """Reload a webapp to apply code or configuration changes"""
+    """Reload a webapp to apply code or configuration changes
+
+    With --all or --domains-from webapps are reloaded concurrently and a
+    status table is printed; exits with an error when any of the reloads
+    failed.
+
+    With --warm URLs listed in URLS_FILE (one per line, paths are
+    prefixed with the domain) are requested concurrently right after
+    reload, until they respond without a server error, and time to the
+    first successful response and latency of every URL are reported.
+    Warm up works only for a single webapp."""
+    if warm and (all_webapps or domains_from):
+        raise typer.BadParameter("--warm can't be used with --all or --domains-from")
+    if all_webapps or domains_from:
+        _reload_many(_target_domains(all_webapps, domains_from), workers)
+        return
     domain_name = ensure_domain(domain_name)
     webapp = Webapp(domain_name)
     typer.echo(snakesay(f"Reloading {domain_name} via API"))
@@ -109,6 +228,47 @@ def reload(
     except MissingCNAMEException as e:
         typer.echo(snakesay(str(e)))
     typer.echo(snakesay(f"{domain_name} has been reloaded"))
+    if warm:
+        _warm_up(read_urls(warm, domain_name), warm_timeout, workers)
+
+
+def _warm_up(urls, timeout, workers):
+    typer.echo(snakesay(f"Warming up {len(urls)} URLs"))
+    results = warm_up(urls, timeout=timeout, max_workers=workers)
+    table = [
+        [
+            result.url,
+            result.status if result.status is not None else result.error,
+            result.attempts,
+            _format_seconds(result.latency),
+            "-" if result.ready_after is None else f"{result.ready_after:.1f}s",
+        ]
+        for result in results
+    ]
+    typer.echo(tabulate(table, ["url", "status", "attempts", "latency", "ready after"], tablefmt="simple"))
+    first = time_to_first_success(results)
+    if first is None:
+        typer.echo(snakesay(f"None of the URLs responded within {timeout} seconds"))
+        raise typer.Exit(code=1)
+    typer.echo(f"Time to first success: {first:.1f}s")
+    if any(result.ready_after is None for result in results):
+        typer.echo(snakesay(f"Some of the URLs didn't respond within {timeout} seconds"))
+        raise typer.Exit(code=1)
+
+
+def _reload_one(domain):
+    try:
+        Webapp(domain).reload()
+    except MissingCNAMEException as e:
+        return str(e)
+    return ""
+
+
+def _reload_many(domains, workers):
+    typer.echo(snakesay(f"Reloading {len(domains)} webapps via API"))
+    results = run_concurrently(_reload_one, domains, max_workers=workers)
+    if _echo_status_table(results, lambda warning: ("reloaded", warning)):
+        raise typer.Exit(code=1)
 
 
 @app.command()
@@ -203,31 +363,499 @@ def delete_logs(
         callback=index_callback,
         help="0 for current log, 1-9 for one of archive logs or all for all of them",
     ),
+    workers: int = typer.Option(
+        4, "-w", "--workers", min=1, help="Number of logs (or webapps, with --all/--domains-from) deleted concurrently"
+    ),
+    all_webapps: bool = typer.Option(False, "--all", help="Deletes logs of all your webapps"),
+    domains_from: Path = typer.Option(
+        None, "--domains-from", exists=True, dir_okay=False, help="File with domain names, one per line"
+    ),
 ):
-    """Delete webapp log files (access, error, server logs)"""
+    """Delete webapp log files (access, error, server logs)
+
+    Logs are deleted concurrently (at most --workers API calls at once)
+    and a summary per log type is printed.  With --all or --domains-from
+    webapps are processed concurrently too and a status table is printed
+    instead.  Exits with an error when any of the logs could not be
+    deleted."""
+    if all_webapps or domains_from:
+        domains = _target_domains(all_webapps, domains_from)
+        _delete_logs_many(domains, log_type.value, log_index, workers)
+        return
     domain = ensure_domain(domain_name)
     webapp = Webapp(domain)
-    log_types = ["access", "error", "server"]
-    logs = webapp.get_log_info()
-    if log_type == "all" and log_index == "all":
-        for key in log_types:
-            for log in logs[key]:
-                typer.echo(snakesay(format_log_deletion_message(domain, key, log)))
-                webapp.delete_log(key, log)
-    elif log_type == "all":
-        for key in log_types:
-            typer.echo(snakesay(format_log_deletion_message(domain, key, int(log_index))))
-            webapp.delete_log(key, int(log_index))
-    elif log_index == "all":
-        for i in logs[log_type]:
-            typer.echo(snakesay(format_log_deletion_message(domain, log_type.value, i)))
-            webapp.delete_log(log_type, int(i))
-    else:
-        typer.echo(snakesay(format_log_deletion_message(domain, log_type.value, int(log_index))))
-        webapp.delete_log(log_type, int(log_index))
+    logs = webapp.get_log_info() if log_index == "all" else {}
+    targets = log_targets(logs, log_type.value, log_index)
+    typer.echo(snakesay(f"Deleting {len(targets)} log files for {domain} via API"))
+    summary = delete_webapp_logs(webapp, targets, max_workers=workers)
+    typer.echo(format_deletion_summary(domain, summary))
+    if any(failed for _, failed in summary.values()):
+        typer.echo(snakesay("Some logs could not be deleted"))
+        raise typer.Exit(code=1)
     typer.echo(snakesay("All done!"))
 
 
+def _delete_logs_many(domains, log_type, log_index, workers):
+    def delete(domain):
+        webapp = Webapp(domain)
+        logs = webapp.get_log_info() if log_index == "all" else {}
+        # webapps are already handled concurrently, so their logs are
+        # deleted one by one to keep at most `workers` API calls in flight
+        return delete_webapp_logs(webapp, log_targets(logs, log_type, log_index), max_workers=1)
+
+    def describe(summary):
+        deleted = sum(len(done) for done, _ in summary.values())
+        failed = sum(len(errors) for _, errors in summary.values())
+        if failed:
+            return "partial", f"{deleted} deleted, {failed} failed"
+        return "deleted", f"{deleted} deleted"
+
+    typer.echo(snakesay(f"Deleting logs of {len(domains)} webapps via API"))
+    results = run_concurrently(delete, domains, max_workers=workers)
+    failed = _echo_status_table(results, describe)
+    partial = any(
+        errors for _, summary, error in results if error is None for _, errors in summary.values()
+    )
+    if failed or partial:
+        raise typer.Exit(code=1)
+
+
+def single_log_type_callback(value: LogType):
+    if value == LogType.all:
+        raise typer.BadParameter("log type has to be one of: access, error, server")
+    return value.value
+
+
+logs_app = typer.Typer()
+app.add_typer(logs_app, name="logs", help="Print webapp logs or import them to the local store.")
+
+
+@logs_app.callback(invoke_without_command=True)
+def logs(
+    ctx: typer.Context,
+    domain_name: str = typer.Option(
+        "your-username.pythonanywhere.com",
+        "-d",
+        "--domain",
+        help="Domain name, eg www.mydomain.com",
+    ),
+    log_type: LogType = typer.Option(
+        LogType.error, "-t", "--log-type", callback=single_log_type_callback, help="access, error or server"
+    ),
+    new: bool = typer.Option(
+        False, "-n", "--new", help="Prints only entries appended since the previous --new call"
+    ),
+    follow: bool = typer.Option(
+        False, "-f", "--follow", help="Keeps printing entries as they are appended to the log"
+    ),
+    interval: float = typer.Option(
+        1.0, "-i", "--interval", min=0.1, help="Seconds between checks while log grows (with --follow)"
+    ),
+    max_interval: float = typer.Option(
+        30.0, "-x", "--max-interval", min=0.1, help="Longest pause between checks when log is idle (with --follow)"
+    ),
+):
+    """Print current access, error or server log of a webapp.
+
+    Only bytes which have not been read yet are fetched: with --new read
+    offset is remembered between calls, with --follow the log is polled
+    for new entries, checking less often (up to --max-interval) while it
+    stays idle.  When the log is rotated (its size shrinks or its archives
+    change, which is checked whenever followed log is idle), entries written just before the rotation are read from the
+    archived log and the new log is read from the beginning.
+
+    Example:
+      Watch error log of www.mydomain.com:
+
+        pa webapp logs -d www.mydomain.com -t error --follow"""
+    if ctx.invoked_subcommand is not None:
+        return
+    domain = ensure_domain(domain_name)
+    webapp = Webapp(domain)
+    indices = webapp.get_log_info().get(log_type.value, [])
+    if 0 not in indices and not follow:
+        typer.echo(snakesay(f"There is no current {log_type.value} log for {domain}"))
+        return
+
+    offsets = LogOffsets() if new else None
+    path = log_path(domain, log_type.value)
+    archives = [index for index in indices if index != 0]
+    state = offsets.get_state(path) if offsets else None
+    # changed archives mean the log has been rotated since the previous call
+    rotated = state is not None and state["archives"] is not None and state["archives"] != archives
+    # while following, archives are checked again whenever the log is idle
+    log = WebappLog(
+        domain,
+        log_type.value,
+        offset=state["offset"] if state else 0,
+        rotated=rotated,
+        archives=archives if follow else None,
+    )
+
+    try:
+        typer.echo(log.read_new(), nl=False)
+        if follow:
+            for chunk in log.follow(min_interval=interval, max_interval=max_interval):
+                typer.echo(chunk, nl=False)
+    except KeyboardInterrupt:
+        pass
+    except Exception as e:
+        typer.echo(snakesay(str(e)))
+        raise typer.Exit(code=1)
+    finally:
+        if offsets:
+            offsets.set(path, log.offset, size=log.size, archives=log.archives if follow else archives)
+
+
+@logs_app.command("import")
+def import_logs(
+    domain_name: str = typer.Option(
+        "your-username.pythonanywhere.com",
+        "-d",
+        "--domain",
+        help="Domain name, eg www.mydomain.com",
+    ),
+    archives: bool = typer.Option(
+        False, "-a", "--archives", help="Imports archived access logs too (already imported ones are skipped)"
+    ),
+):
+    """Import access log entries to the local store used by `pa webapp log-stats --store`.
+
+    Only lines appended to the current access log since the previous
+    import are fetched and parsed."""
+    domain = ensure_domain(domain_name)
+    store = LogStore()
+    try:
+        indices = Webapp(domain).get_log_info().get("access", [])
+        count = store.import_current(domain, archives=[index for index in indices if index])
+        if archives:
+            count += store.import_archives(domain, indices)
+    finally:
+        store.close()
+    typer.echo(snakesay(f"Imported {count} requests to {domain} into {store.path}"))
+
+
+def _format_seconds(value):
+    return "-" if value is None else f"{value * 1000:.0f}ms"
+
+
+def _log_stats_from_store(domain, top, since):
+    log_store = LogStore()
+    try:
+        summary = log_store.summary(
+            domain, since=datetime.now(timezone.utc) - timedelta(hours=since) if since else None, top=top
+        )
+    finally:
+        log_store.close()
+    if not summary["requests"]:
+        typer.echo(snakesay(f"No requests to {domain} in the local store -- use `pa webapp logs import`"))
+        return
+    requests = summary["requests"]
+    p50, p95, p99 = summary["quantiles"]
+    typer.echo(
+        f"{requests} requests in the local store, p50 {_format_seconds(p50)}, "
+        f"p95 {_format_seconds(p95)}, p99 {_format_seconds(p99)}"
+    )
+    typer.echo(
+        "Status mix: "
+        + ", ".join(f"{status} {count / requests:.1%}" for status, count in summary["status_mix"].items())
+    )
+    table = [
+        [endpoint, count, errors, *(_format_seconds(value) for value in quantiles)]
+        for endpoint, count, errors, quantiles in summary["endpoints"]
+    ]
+    typer.echo(tabulate(table, ["endpoint", "requests", "5xx", "p50", "p95", "p99"], tablefmt="simple"))
+
+
+def _collect_from_logs(webapp, domain, log_type, current_only, collect, found, nothing_found):
+    """Runs `collect` on indices of `log_type` logs of `webapp` (current
+    log only with `current_only`) and reports logs which could not be
+    read.  Exits when there are no logs or `found` is false for the
+    result (with an error when some logs could not be read).
+
+    :param collect: function taking indices of logs and returning
+        (result, failures) tuple, like `collect_logs`
+    :param found: function telling whether the result has anything to
+        report
+    :param nothing_found: message printed when it doesn't
+    :returns: tuple of result, failures and number of logs read"""
+
+    indices = webapp.get_log_info().get(log_type, [])
+    if current_only:
+        indices = [index for index in indices if index == 0]
+    if not indices:
+        typer.echo(snakesay(f"There are no {log_type} logs for {domain}"))
+        raise typer.Exit()
+
+    result, failures = collect(indices)
+    for path, error in failures:
+        typer.echo(snakesay(f"Could not read {path}: {error}"))
+    if not found(result):
+        typer.echo(snakesay(f"{nothing_found} in {log_type} logs for {domain}"))
+        raise typer.Exit(code=1 if failures else 0)
+    return result, failures, len(indices) - len(failures)
+
+
+@app.command("log-stats")
+def log_stats(
+    domain_name: str = typer.Option(
+        "your-username.pythonanywhere.com",
+        "-d",
+        "--domain",
+        help="Domain name, eg www.mydomain.com",
+    ),
+    top: int = typer.Option(20, "-n", "--top", min=1, help="Number of endpoints to report"),
+    current_only: bool = typer.Option(False, "-c", "--current-only", help="Skips archived access logs"),
+    workers: int = typer.Option(4, "-w", "--workers", min=1, help="Number of logs streamed concurrently"),
+    store: bool = typer.Option(
+        False, "-s", "--store", help="Queries the local store (see `pa webapp logs import`) instead of logs"
+    ),
+    since: int = typer.Option(
+        None, "--since", min=1, help="With --store: only requests from the last HOURS", metavar="HOURS"
+    ),
+):
+    """Report requests per endpoint, status mix and response times from access logs.
+
+    Current and archived (gzipped ones included) access logs are streamed
+    and every line is parsed once; response time percentiles are
+    estimated with bounded-memory sketches (within 1%), so memory use
+    doesn't grow with the size of logs.  Numeric and hex id segments of
+    paths are replaced with :id, so e.g. /items/1 and /items/2 are counted
+    as one endpoint.
+
+    With --store requests imported with `pa webapp logs import` are
+    queried instead (exact percentiles, no logs are fetched)."""
+    domain = ensure_domain(domain_name)
+    if store:
+        _log_stats_from_store(domain, top, since)
+        return
+    stats, errors, read = _collect_from_logs(
+        Webapp(domain),
+        domain,
+        "access",
+        current_only,
+        lambda indices: collect_access_stats(domain, indices, max_workers=workers),
+        lambda stats: stats.requests,
+        "No requests found",
+    )
+
+    sketch = stats.response_times
+    typer.echo(
+        f"{stats.requests} requests in {read} log(s), "
+        f"p50 {_format_seconds(sketch.quantile(0.5))}, p95 {_format_seconds(sketch.quantile(0.95))}, "
+        f"p99 {_format_seconds(sketch.quantile(0.99))}"
+    )
+    typer.echo(
+        "Status mix: "
+        + ", ".join(f"{status} {count / stats.requests:.1%}" for status, count in stats.status_mix().items())
+    )
+    table = [
+        [
+            endpoint,
+            endpoint_stats.requests,
+            endpoint_stats.errors,
+            _format_seconds(endpoint_stats.response_times.quantile(0.5)),
+            _format_seconds(endpoint_stats.response_times.quantile(0.95)),
+            _format_seconds(endpoint_stats.response_times.quantile(0.99)),
+        ]
+        for endpoint, endpoint_stats in stats.top(top)
+    ]
+    typer.echo(tabulate(table, ["endpoint", "requests", "5xx", "p50", "p95", "p99"], tablefmt="simple"))
+    if errors:
+        raise typer.Exit(code=1)
+
+
+def _format_frame(frame):
+    file_name, function = frame
+    return f"{Path(file_name).name}:{function}"
+
+
+@app.command()
+def errors(
+    domain_name: str = typer.Option(
+        "your-username.pythonanywhere.com",
+        "-d",
+        "--domain",
+        help="Domain name, eg www.mydomain.com",
+    ),
+    top: int = typer.Option(10, "-n", "--top", min=1, help="Number of error clusters to report"),
+    depth: int = typer.Option(3, "--depth", min=1, help="Number of innermost frames in a signature"),
+    current_only: bool = typer.Option(False, "-c", "--current-only", help="Skips archived error logs"),
+    workers: int = typer.Option(4, "-w", "--workers", min=1, help="Number of logs streamed concurrently"),
+):
+    """Group tracebacks from error logs by signature, biggest groups first.
+
+    Signature is exception type plus innermost frames (file and function),
+    so tracebacks differing only in line numbers or exception messages
+    are counted together.  Logs are streamed and read once, keeping only
+    counts, first and last seen time and one sample per group."""
+    domain = ensure_domain(domain_name)
+    clusters, failures, read = _collect_from_logs(
+        Webapp(domain),
+        domain,
+        "error",
+        current_only,
+        lambda indices: collect_error_clusters(domain, indices, max_workers=workers, depth=depth),
+        lambda clusters: clusters.total,
+        "No tracebacks found",
+    )
+
+    top_clusters = clusters.top(top)
+    typer.echo(f"{clusters.total} tracebacks in {len(clusters.clusters)} group(s) in {read} log(s)")
+    table = [
+        [
+            number,
+            cluster.count,
+            key[0],
+            " <- ".join(_format_frame(frame) for frame in reversed(key[1:])),
+            cluster.first_seen,
+            cluster.last_seen,
+        ]
+        for number, (key, cluster) in enumerate(top_clusters, start=1)
+    ]
+    typer.echo(tabulate(table, ["#", "count", "exception", "innermost frames", "first seen", "last seen"]))
+    for number, (key, cluster) in enumerate(top_clusters, start=1):
+        typer.echo(f"\n#{number} sample:")
+        typer.echo("\n".join(f"    {line}" for line in cluster.sample.splitlines()))
+    if failures:
+        raise typer.Exit(code=1)
+
+
+@app.command("server-health")
+def server_health(
+    domain_name: str = typer.Option(
+        "your-username.pythonanywhere.com",
+        "-d",
+        "--domain",
+        help="Domain name, eg www.mydomain.com",
+    ),
+    bucket: int = typer.Option(5, "-b", "--bucket", min=1, help="Timeline bucket width in minutes"),
+    current_only: bool = typer.Option(False, "-c", "--current-only", help="Skips archived server logs"),
+    workers: int = typer.Option(4, "-w", "--workers", min=1, help="Number of logs streamed concurrently"),
+):
+    """Report worker timeouts, deaths, respawns, full listen queue and reloads from server logs.
+
+    Events are counted in a timeline of --bucket minutes wide buckets
+    (only buckets with events are shown).  Buckets with worker timeouts
+    (harakiri) or full listen queue mean all workers were busy -- they are
+    marked and reported as saturation periods, a sign to add workers or
+    look for slow views."""
+    domain = ensure_domain(domain_name)
+    health, failures, _ = _collect_from_logs(
+        Webapp(domain),
+        domain,
+        "server",
+        current_only,
+        lambda indices: collect_server_health(domain, indices, max_workers=workers, bucket=timedelta(minutes=bucket)),
+        lambda health: health.buckets,
+        "No worker events found",
+    )
+    timeline = health.timeline()
+
+    table = [
+        [start, *(events[kind] for kind in EVENT_KINDS), "yes" if health.is_saturated(events) else ""]
+        for start, events in timeline
+    ]
+    typer.echo(tabulate(table, ["from", *EVENT_KINDS, "saturated"], tablefmt="simple"))
+    totals = health.totals
+    typer.echo("Totals: " + ", ".join(f"{kind} {totals[kind]}" for kind in EVENT_KINDS))
+    periods = health.saturated_periods()
+    if periods:
+        typer.echo(snakesay(f"Workers were saturated in {len(periods)} period(s):"))
+        for start, end, events in periods:
+            typer.echo(
+                f"  {start} - {end}: {events['harakiri']} harakiri, {events['listen_queue']} listen queue full"
+            )
+    else:
+        typer.echo(snakesay("No saturation found"))
+    if failures:
+        raise typer.Exit(code=1)
+
+
+@app.command("static-audit")
+def static_audit(
+    domain_name: str = typer.Option(
+        "your-username.pythonanywhere.com",
+        "-d",
+        "--domain",
+        help="Domain name, eg www.mydomain.com",
+    ),
+    project_dir: Path = typer.Option(
+        None, "-p", "--project-dir", help="Directory to look for assets in (defaults to webapp's source directory)"
+    ),
+    apply: bool = typer.Option(False, "--apply", help="Creates static file mappings for found directories"),
+    reload: bool = typer.Option(False, "--reload", help="Reloads the webapp after --apply to activate new mappings"),
+    current_only: bool = typer.Option(False, "-c", "--current-only", help="Skips archived access logs"),
+    workers: int = typer.Option(4, "-w", "--workers", min=1, help="Number of logs streamed concurrently"),
+):
+    """Find assets served by Python workers instead of static file mappings.
+
+    Successful requests for asset-like files (css, js, images, fonts...)
+    not covered by existing static file mappings are grouped by URL prefix
+    (first path segment) and matched to local directories holding the
+    requested files.  With --apply static file mappings are created for
+    the matched prefixes; they're active after the webapp is reloaded
+    (add --reload to do it right away).
+
+    Directories are looked up in the local filesystem, so the command has
+    to be run on PythonAnywhere (e.g. in a Bash console) to match them --
+    elsewhere prefixes are only reported.
+
+    Example:
+      Map assets of www.mydomain.com and activate the mappings:
+
+        pa webapp static-audit -d www.mydomain.com --apply --reload"""
+    domain = ensure_domain(domain_name)
+    webapp = Webapp(domain)
+    mapped_urls = [mapping["url"] for mapping in get_static_file_mappings(webapp)]
+    audit, failures, _ = _collect_from_logs(
+        webapp,
+        domain,
+        "access",
+        current_only,
+        lambda indices: collect_static_audit(domain, indices, mapped_urls, max_workers=workers),
+        lambda audit: audit.prefixes,
+        "No assets served by workers found",
+    )
+
+    root = project_dir or Path(webapp.get().get("source_directory") or Path.home())
+    found = []
+    table = []
+    for prefix, stats in audit.top():
+        directory = locate_directory(prefix, stats.samples, root)
+        if directory is not None:
+            found.append((prefix, directory))
+        table.append([prefix, stats.requests, f"{stats.worker_time:.1f}s", directory or "not found"])
+    typer.echo(tabulate(table, ["url prefix", "requests", "worker time", "directory"], tablefmt="simple"))
+
+    if not found:
+        message = f"Could not match any of the prefixes to directories in {root}"
+        if not on_pythonanywhere():
+            message += ", directories are looked up locally, so run this command on PythonAnywhere"
+        typer.echo(snakesay(message))
+    elif apply:
+        for prefix, directory in found:
+            webapp.create_static_file_mapping(prefix, directory)
+            typer.echo(f"Mapped {prefix} to {directory}")
+        if reload:
+            try:
+                webapp.reload()
+            except MissingCNAMEException as e:
+                typer.echo(snakesay(str(e)))
+            typer.echo(snakesay(f"{len(found)} static file mapping(s) created, {domain} has been reloaded"))
+        else:
+            typer.echo(
+                snakesay(
+                    f"{len(found)} static file mapping(s) created, reload {domain} "
+                    "(or run with --reload) to activate them"
+                )
+            )
+    else:
+        typer.echo(snakesay(f"Run with --apply to create {len(found)} static file mapping(s)"))
+    if failures:
+        raise typer.Exit(code=1)
+
+
 @app.command()
 def delete(
     domain_name: str = typer.Option(
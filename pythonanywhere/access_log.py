@@ -0,0 +1,197 @@
+"""Single-pass analytics of webapp access logs.
+
+Every line of PythonAnywhere access log looks like:
+
+    1.2.3.4 - - [01/Mar/2024:16:00:05 +0000] "GET /api/items/42?page=2 HTTP/1.1" 200 1234
+    "https://example.com/" "Mozilla/5.0" "1.2.3.4" response-time=0.123
+
+(in one line).  :func:`parse_access_line` extracts the request from such
+line and :class:`AccessLogStats` accumulates requests per endpoint, status
+mix and response time quantiles in bounded memory: response times go to
+:class:`QuantileSketch` instances and number of tracked endpoints is
+capped."""
+
+import math
+import re
+from collections import Counter, namedtuple
+from datetime import datetime
+
+from pythonanywhere.webapp_logs import collect_logs
+
+ACCESS_LINE_RE = re.compile(
+    rb'\[(?P<timestamp>[^\]]+)\] "(?P<method>[A-Z]+) (?P<path>\S+)[^"]*" (?P<status>\d{3}) '
+    rb".*response-time[=:]\s*(?P<response_time>[\d.]+)"
+)
+ID_SEGMENT_RE = re.compile(r"/(?:\d+|[0-9a-fA-F]{8,}|[0-9a-fA-F-]{36})(?=/|$)")
+OTHER_ENDPOINTS = "(other)"
+
+AccessRecord = namedtuple("AccessRecord", ["timestamp", "method", "endpoint", "status", "response_time"])
+
+
+def normalize_endpoint(path):
+    """Returns `path` without query string and with numeric and hex id
+    segments replaced by `:id`, so requests for the same view share one
+    endpoint."""
+
+    return ID_SEGMENT_RE.sub("/:id", path.split("?", 1)[0]) or "/"
+
+
+def parse_access_line(line):
+    """Returns `AccessRecord` parsed from access log `line` (bytes) or None
+    when line doesn't look like an access log entry.  Timestamp is left
+    as text (see :func:`parse_timestamp`) to keep parsing cheap."""
+
+    match = ACCESS_LINE_RE.search(line)
+    if match is None:
+        return None
+    return AccessRecord(
+        timestamp=match["timestamp"].decode(),
+        method=match["method"].decode(),
+        endpoint=normalize_endpoint(match["path"].decode(errors="replace")),
+        status=int(match["status"]),
+        response_time=float(match["response_time"]),
+    )
+
+
+def parse_timestamp(text):
+    """Returns datetime parsed from access log timestamp, e.g.
+    `01/Mar/2024:16:00:05 +0000`."""
+
+    return datetime.strptime(text, "%d/%b/%Y:%H:%M:%S %z")
+
+
+class QuantileSketch:
+    """Bounded-memory quantile estimator for positive values.
+
+    Values are counted in logarithmic buckets, so every quantile is
+    returned with relative error not greater than `accuracy` and number
+    of buckets depends only on the range of values (about 1200 buckets
+    for values between a microsecond and three hours with the default
+    accuracy), not on number of values.  Sketches are mergeable."""
+
+    MIN_VALUE = 1e-6
+
+    def __init__(self, accuracy=0.01):
+        self.accuracy = accuracy
+        self.gamma = (1 + accuracy) / (1 - accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.buckets = Counter()
+        self.zeros = 0
+        self.count = 0
+
+    def add(self, value):
+        self.count += 1
+        if value < self.MIN_VALUE:
+            self.zeros += 1
+        else:
+            self.buckets[math.ceil(math.log(value) / self._log_gamma)] += 1
+
+    def merge(self, other):
+        self.buckets.update(other.buckets)
+        self.zeros += other.zeros
+        self.count += other.count
+
+    def quantile(self, fraction):
+        """Returns estimated `fraction` quantile (e.g. 0.95) or None when
+        sketch is empty."""
+
+        if not self.count:
+            return None
+        rank = fraction * (self.count - 1)
+        seen = self.zeros
+        if rank < seen:
+            return 0.0
+        for key in sorted(self.buckets):
+            seen += self.buckets[key]
+            if seen > rank:
+                return 2 * self.gamma ** key / (self.gamma + 1)
+        return 2 * self.gamma ** max(self.buckets) / (self.gamma + 1)
+
+
+class EndpointStats:
+    """Requests count and response time sketch of a single endpoint."""
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.response_times = QuantileSketch()
+
+    def add(self, record):
+        self.requests += 1
+        if record.status >= 500:
+            self.errors += 1
+        self.response_times.add(record.response_time)
+
+    def merge(self, other):
+        self.requests += other.requests
+        self.errors += other.errors
+        self.response_times.merge(other.response_times)
+
+
+class AccessLogStats:
+    """Accumulates access log records.
+
+    Use :method:`AccessLogStats.add_line` on every log line (or
+    :method:`AccessLogStats.add` on parsed records) and read `endpoints`,
+    `statuses` and `response_times` afterwards.  Once `max_endpoints`
+    endpoints are tracked, requests for new ones are counted under
+    "(other)"."""
+
+    def __init__(self, max_endpoints=1000):
+        self.max_endpoints = max_endpoints
+        self.endpoints = {}
+        self.statuses = Counter()
+        self.response_times = QuantileSketch()
+        self.skipped = 0
+
+    @property
+    def requests(self):
+        return self.response_times.count
+
+    def _endpoint(self, endpoint):
+        if endpoint not in self.endpoints and len(self.endpoints) >= self.max_endpoints:
+            endpoint = OTHER_ENDPOINTS
+        return self.endpoints.setdefault(endpoint, EndpointStats())
+
+    def add(self, record):
+        self._endpoint(record.endpoint).add(record)
+        self.statuses[record.status] += 1
+        self.response_times.add(record.response_time)
+
+    def add_line(self, line):
+        record = parse_access_line(line)
+        if record is None:
+            self.skipped += 1
+        else:
+            self.add(record)
+
+    def merge(self, other):
+        for endpoint, stats in other.endpoints.items():
+            self._endpoint(endpoint).merge(stats)
+        self.statuses.update(other.statuses)
+        self.response_times.merge(other.response_times)
+        self.skipped += other.skipped
+
+    def top(self, count=20):
+        """Returns list of (endpoint, `EndpointStats`) tuples of `count`
+        endpoints with the most requests."""
+
+        return sorted(self.endpoints.items(), key=lambda item: item[1].requests, reverse=True)[:count]
+
+    def status_mix(self):
+        """Returns dictionary mapping status classes ("2xx", "3xx"...) to
+        number of requests."""
+
+        mix = Counter()
+        for status, count in self.statuses.items():
+            mix[f"{status // 100}xx"] += count
+        return dict(sorted(mix.items()))
+
+
+def collect_access_stats(domain, indices, max_workers=4, max_endpoints=1000):
+    """Returns `AccessLogStats` of access logs of `domain` with `indices`
+    and list of logs which could not be read (see `collect_logs`)."""
+
+    return collect_logs(
+        domain, "access", indices, lambda: AccessLogStats(max_endpoints=max_endpoints), max_workers=max_workers
+    )
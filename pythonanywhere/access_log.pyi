@@ -0,0 +1,60 @@
+import re
+from collections import Counter
+from datetime import datetime
+from typing import ClassVar, Dict, Iterable, List, NamedTuple, Optional, Pattern, Tuple
+
+ACCESS_LINE_RE: Pattern[bytes] = ...
+ID_SEGMENT_RE: Pattern[str] = ...
+OTHER_ENDPOINTS: str = ...
+
+class AccessRecord(NamedTuple):
+    timestamp: str
+    method: str
+    endpoint: str
+    status: int
+    response_time: float
+
+def normalize_endpoint(path: str) -> str: ...
+def parse_access_line(line: bytes) -> Optional[AccessRecord]: ...
+def parse_timestamp(text: str) -> datetime: ...
+
+class QuantileSketch:
+    MIN_VALUE: ClassVar[float] = ...
+    accuracy: float = ...
+    gamma: float = ...
+    _log_gamma: float = ...
+    buckets: Counter = ...
+    zeros: int = ...
+    count: int = ...
+    def __init__(self, accuracy: float = ...) -> None: ...
+    def add(self, value: float) -> None: ...
+    def merge(self, other: QuantileSketch) -> None: ...
+    def quantile(self, fraction: float) -> Optional[float]: ...
+
+class EndpointStats:
+    requests: int = ...
+    errors: int = ...
+    response_times: QuantileSketch = ...
+    def __init__(self) -> None: ...
+    def add(self, record: AccessRecord) -> None: ...
+    def merge(self, other: EndpointStats) -> None: ...
+
+class AccessLogStats:
+    max_endpoints: int = ...
+    endpoints: Dict[str, EndpointStats] = ...
+    statuses: Counter = ...
+    response_times: QuantileSketch = ...
+    skipped: int = ...
+    def __init__(self, max_endpoints: int = ...) -> None: ...
+    @property
+    def requests(self) -> int: ...
+    def _endpoint(self, endpoint: str) -> EndpointStats: ...
+    def add(self, record: AccessRecord) -> None: ...
+    def add_line(self, line: bytes) -> None: ...
+    def merge(self, other: AccessLogStats) -> None: ...
+    def top(self, count: int = ...) -> List[Tuple[str, EndpointStats]]: ...
+    def status_mix(self) -> Dict[str, int]: ...
+
+def collect_access_stats(
+    domain: str, indices: Iterable[int], max_workers: int = ..., max_endpoints: int = ...
+) -> Tuple[AccessLogStats, List[Tuple[str, Exception]]]: ...
@@ -0,0 +1,201 @@
+"""Compiles cron expressions into PythonAnywhere daily and hourly tasks.
+
+Scheduled tasks may only run daily (at hour and minute) or hourly (at
+minute), so a cron expression is compiled into a `CronPlan` -- either the
+minimal set of such tasks or, when that would need more than allowed
+number of tasks, one dispatcher task running this module, e.g.:
+
+    python3.10 -m pythonanywhere.cron '*/15 2-5 * * *' -- 'echo foo'
+
+Usage:
+  cron.py <expression> [--date-only] [--] <command>
+
+Options:
+  --date-only       Runs command once when today matches the day-of-month,
+                    month and day-of-week fields (the task's own schedule
+                    takes care of the time)
+
+Without --date-only the dispatcher runs command at every minute of the
+current hour matching the expression (the most recent already passed
+minute immediately, later ones after sleeping until they come), one run
+after another.  Expressions are evaluated in UTC, like scheduled tasks."""
+
+import shlex
+import subprocess
+import sys
+import time
+from collections import namedtuple
+from datetime import datetime, timezone
+
+from docopt import docopt
+
+from pythonanywhere.utils import server_python
+
+CRON_MODULE = "pythonanywhere.cron"
+DEFAULT_MAX_TASKS = 4
+
+FIELDS = (
+    ("minute", 0, 59),
+    ("hour", 0, 23),
+    ("day", 1, 31),
+    ("month", 1, 12),
+    ("weekday", 0, 7),
+)
+FIELD_SIZES = {"minute": 60, "hour": 24, "day": 31, "month": 12, "weekday": 7}
+
+CronExpression = namedtuple(
+    "CronExpression", ["minutes", "hours", "days", "months", "weekdays", "text"]
+)
+CronPlan = namedtuple("CronPlan", ["slots", "command", "dispatcher"])
+
+
+def parse_field(text, low, high):
+    """Returns sorted list of values of cron field `text` (lists, ranges,
+    steps and `*`) within `low`..`high` inclusive.
+
+    :raises ValueError: when field is malformed or out of range"""
+
+    values = set()
+    for part in text.split(","):
+        spec, _, step = part.partition("/")
+        step = int(step) if step else 1
+        if spec == "*":
+            start, end = low, high
+        elif "-" in spec:
+            start, end = (int(bound) for bound in spec.split("-", 1))
+        else:
+            start = int(spec)
+            end = high if step > 1 else start
+        if step < 1 or not low <= start <= end <= high:
+            raise ValueError(f"Invalid cron field '{text}' (values have to be in {low}..{high})")
+        values.update(range(start, end + 1, step))
+    return sorted(values)
+
+
+def parse_expression(text):
+    """Returns `CronExpression` parsed from 5-field cron `text` (day of
+    week 7 is treated as Sunday, like in cron).
+
+    :raises ValueError: when expression is malformed"""
+
+    fields = text.split()
+    if len(fields) != 5:
+        raise ValueError(f"Cron expression has to have 5 fields, got {len(fields)}: '{text}'")
+    values = [parse_field(field, low, high) for field, (_, low, high) in zip(fields, FIELDS)]
+    values[4] = sorted({weekday % 7 for weekday in values[4]})
+    return CronExpression(*values, text=" ".join(fields))
+
+
+def _is_full(values, field):
+    return len(values) == FIELD_SIZES[field]
+
+
+def date_restricted(expression):
+    return not (
+        _is_full(expression.days, "day")
+        and _is_full(expression.months, "month")
+        and _is_full(expression.weekdays, "weekday")
+    )
+
+
+def matches_date(expression, moment):
+    """Checks day-of-month, month and day-of-week fields against `moment`
+    (when both day fields are restricted either of them has to match,
+    like in cron)."""
+
+    if moment.month not in expression.months:
+        return False
+    day_ok = moment.day in expression.days
+    weekday_ok = moment.isoweekday() % 7 in expression.weekdays
+    if not _is_full(expression.days, "day") and not _is_full(expression.weekdays, "weekday"):
+        return day_ok or weekday_ok
+    return day_ok and weekday_ok
+
+
+def dispatcher_command(expression, command, date_only=False, python=None):
+    """Returns `command` wrapped to be run by this module with `python`
+    interpreter on PythonAnywhere (see `server_python`)."""
+
+    date_only = " --date-only" if date_only else ""
+    return (
+        f"{shlex.quote(server_python(python))} -m {CRON_MODULE} {shlex.quote(expression.text)}"
+        f"{date_only} -- {shlex.quote(command)}"
+    )
+
+
+def compile_expression(text, command, max_tasks=DEFAULT_MAX_TASKS, python=None):
+    """Compiles cron expression `text` running `command` into `CronPlan`.
+
+    Plan's `slots` is a list of (hour, minute) tuples of tasks to create
+    (hour is None for hourly tasks) and `command` is the command all of
+    them run.  Exact plan uses hourly tasks when the expression covers
+    every hour and daily tasks otherwise, wrapping the command with a date
+    check when day fields are restricted.  When exact plan would need
+    more than `max_tasks` tasks a single dispatcher task is used instead
+    (plan's `dispatcher` is True then).  Wrapped commands are run with
+    `python` interpreter on PythonAnywhere.
+
+    :raises ValueError: when expression is malformed"""
+
+    expression = parse_expression(text)
+    every_hour = _is_full(expression.hours, "hour")
+    if every_hour:
+        slots = [(None, minute) for minute in expression.minutes]
+    else:
+        slots = [(hour, minute) for hour in expression.hours for minute in expression.minutes]
+
+    if len(slots) <= max_tasks:
+        if date_restricted(expression):
+            command = dispatcher_command(expression, command, date_only=True, python=python)
+        return CronPlan(slots=slots, command=command, dispatcher=False)
+
+    first_minute = expression.minutes[0]
+    hour = expression.hours[0] if len(expression.hours) == 1 else None
+    return CronPlan(
+        slots=[(hour, first_minute)],
+        command=dispatcher_command(expression, command, python=python),
+        dispatcher=True,
+    )
+
+
+def due_minutes(expression, now):
+    """Returns minutes of `now`'s hour the dispatcher should run command
+    at -- the most recent matching minute which has already come and all
+    later matching minutes (none when hour or date doesn't match)."""
+
+    if now.hour not in expression.hours or not matches_date(expression, now):
+        return []
+    passed = [minute for minute in expression.minutes if minute <= now.minute]
+    return passed[-1:] + [minute for minute in expression.minutes if minute > now.minute]
+
+
+def _now():
+    return datetime.now(timezone.utc)
+
+
+def dispatch(expression, command):
+    """Runs `command` at every due minute of current hour, returns the
+    highest return code (0 when nothing was due)."""
+
+    started = _now()
+    returncode = 0
+    for minute in due_minutes(expression, started):
+        wait = (started.replace(minute=minute, second=0, microsecond=0) - _now()).total_seconds()
+        if wait > 0:
+            time.sleep(wait)
+        returncode = max(returncode, subprocess.call(command, shell=True))
+    return returncode
+
+
+def main(argv=None):
+    arguments = docopt(__doc__, argv=argv)
+    expression = parse_expression(arguments["<expression>"])
+    if arguments["--date-only"]:
+        if not matches_date(expression, _now()):
+            return 0
+        return subprocess.call(arguments["<command>"], shell=True)
+    return dispatch(expression, arguments["<command>"])
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,36 @@
+from datetime import datetime
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+CRON_MODULE: str = ...
+DEFAULT_MAX_TASKS: int = ...
+FIELDS: Tuple[Tuple[str, int, int], ...] = ...
+FIELD_SIZES: Dict[str, int] = ...
+
+class CronExpression(NamedTuple):
+    minutes: List[int]
+    hours: List[int]
+    days: List[int]
+    months: List[int]
+    weekdays: List[int]
+    text: str
+
+class CronPlan(NamedTuple):
+    slots: List[Tuple[Optional[int], int]]
+    command: str
+    dispatcher: bool
+
+def parse_field(text: str, low: int, high: int) -> List[int]: ...
+def parse_expression(text: str) -> CronExpression: ...
+def _is_full(values: List[int], field: str) -> bool: ...
+def date_restricted(expression: CronExpression) -> bool: ...
+def matches_date(expression: CronExpression, moment: datetime) -> bool: ...
+def dispatcher_command(
+    expression: CronExpression, command: str, date_only: bool = ..., python: Optional[str] = ...
+) -> str: ...
+def compile_expression(
+    text: str, command: str, max_tasks: int = ..., python: Optional[str] = ...
+) -> CronPlan: ...
+def due_minutes(expression: CronExpression, now: datetime) -> List[int]: ...
+def _now() -> datetime: ...
+def dispatch(expression: CronExpression, command: str) -> int: ...
+def main(argv: Optional[List[str]] = ...) -> int: ...
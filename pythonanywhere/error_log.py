@@ -0,0 +1,145 @@
+"""Clustering of tracebacks from webapp error logs.
+
+Every line of PythonAnywhere error log is prefixed with a timestamp, e.g.:
+
+    2024-03-01 16:00:05,123: Traceback (most recent call last):
+    2024-03-01 16:00:05,123:   File "/home/me/app/views.py", line 10, in detail
+    2024-03-01 16:00:05,123:     item = Item.objects.get(pk=pk)
+    2024-03-01 16:00:05,124: app.models.DoesNotExist: Item matching query does not exist.
+
+:class:`ErrorClusters` reads such lines one by one, and groups tracebacks
+by signature -- exception type and innermost frames (file and function,
+without line numbers, so the signature survives unrelated edits) --
+keeping counts, first and last seen time and one sample per cluster.
+Number of clusters, sample length and frames kept for the traceback
+being read are capped, so memory doesn't grow with the size of logs."""
+
+import re
+from collections import deque
+from datetime import datetime
+
+from pythonanywhere.webapp_logs import collect_logs
+
+LINE_RE = re.compile(rb"^(?P<timestamp>\d{4}-\d\d-\d\d \d\d:\d\d:\d\d)[,.]\d+: ?(?P<message>.*)$")
+FRAME_RE = re.compile(r'^\s*File "(?P<file>[^"]+)", line \d+, in (?P<function>\S+)')
+EXCEPTION_RE = re.compile(r"^(?P<type>[A-Za-z_][\w.]*)(?::|$)")
+TRACEBACK_START = "Traceback (most recent call last):"
+OTHER_ERRORS = ("(other)",)
+
+
+def parse_error_line(line):
+    """Returns (timestamp, message) tuple of error log `line` (bytes) or
+    (None, message) when line has no timestamp prefix."""
+
+    match = LINE_RE.match(line)
+    if match is None:
+        return None, line.decode(errors="replace")
+    timestamp = datetime.strptime(match["timestamp"].decode(), "%Y-%m-%d %H:%M:%S")
+    return timestamp, match["message"].decode(errors="replace")
+
+
+def signature(exception_type, frames, depth=3):
+    """Returns signature of traceback -- tuple of `exception_type` and
+    (file, function) tuples of `depth` innermost `frames`."""
+
+    return (exception_type, *list(frames)[-depth:])
+
+
+class ErrorCluster:
+    """Tracebacks sharing the same signature."""
+
+    def __init__(self, sample, seen):
+        self.count = 0
+        self.first_seen = seen
+        self.last_seen = seen
+        self.sample = sample
+
+    def add(self, seen):
+        self.count += 1
+        if seen is not None:
+            self.first_seen = min(self.first_seen or seen, seen)
+            self.last_seen = max(self.last_seen or seen, seen)
+
+    def merge(self, other):
+        if other.first_seen is not None and (self.first_seen is None or other.first_seen < self.first_seen):
+            self.sample = other.sample
+        self.count += other.count
+        for seen in (other.first_seen, other.last_seen):
+            if seen is not None:
+                self.first_seen = min(self.first_seen or seen, seen)
+                self.last_seen = max(self.last_seen or seen, seen)
+
+
+class ErrorClusters:
+    """Groups tracebacks read line by line from error logs.
+
+    Use :method:`ErrorClusters.add_line` on every log line and
+    :method:`ErrorClusters.top` to get the biggest clusters.  Once
+    `max_clusters` clusters exist, tracebacks with new signatures are
+    counted in the "(other)" cluster; samples are limited to
+    `max_sample_lines` lines."""
+
+    def __init__(self, depth=3, max_clusters=1000, max_sample_lines=40):
+        self.depth = depth
+        self.max_clusters = max_clusters
+        self.max_sample_lines = max_sample_lines
+        self.clusters = {}
+        self._reset()
+
+    def _reset(self):
+        self._in_traceback = False
+        self._frames = deque(maxlen=self.depth)
+        self._lines = []
+        self._started = None
+
+    def _cluster(self, key, sample, seen):
+        if key not in self.clusters and len(self.clusters) >= self.max_clusters:
+            key = OTHER_ERRORS
+        return self.clusters.setdefault(key, ErrorCluster(sample, seen))
+
+    def add_line(self, line):
+        timestamp, message = parse_error_line(line)
+        if message.startswith(TRACEBACK_START):
+            self._reset()
+            self._in_traceback = True
+            self._started = timestamp
+            self._lines.append(message)
+            return
+        if not self._in_traceback:
+            return
+
+        if len(self._lines) < self.max_sample_lines:
+            self._lines.append(message)
+        frame = FRAME_RE.match(message)
+        if frame:
+            self._frames.append((frame["file"], frame["function"]))
+            return
+        if message[:1].isspace() or not message:
+            return
+        exception = EXCEPTION_RE.match(message)
+        if exception:
+            key = signature(exception["type"], self._frames, self.depth)
+            self._cluster(key, "\n".join(self._lines), self._started).add(self._started or timestamp)
+        self._reset()
+
+    @property
+    def total(self):
+        return sum(cluster.count for cluster in self.clusters.values())
+
+    def merge(self, other):
+        for key, cluster in other.clusters.items():
+            target = self._cluster(key, cluster.sample, cluster.first_seen)
+            target.merge(cluster)
+
+    def top(self, count=10):
+        """Returns list of (signature, `ErrorCluster`) tuples of `count`
+        biggest clusters."""
+
+        return sorted(self.clusters.items(), key=lambda item: item[1].count, reverse=True)[:count]
+
+
+def collect_error_clusters(domain, indices, max_workers=4, depth=3):
+    """Returns `ErrorClusters` of error logs of `domain` with `indices`
+    and list of logs which could not be read (see `collect_logs`)."""
+
+    return collect_logs(domain, "error", indices, lambda: ErrorClusters(depth=depth), max_workers=max_workers)
@@ -0,0 +1,42 @@
+from datetime import datetime
+from typing import Any, Deque, Dict, Iterable, List, Optional, Pattern, Tuple
+
+LINE_RE: Pattern[bytes] = ...
+FRAME_RE: Pattern[str] = ...
+EXCEPTION_RE: Pattern[str] = ...
+TRACEBACK_START: str = ...
+OTHER_ERRORS: Tuple[str] = ...
+
+def parse_error_line(line: bytes) -> Tuple[Optional[datetime], str]: ...
+def signature(exception_type: str, frames: Iterable[Tuple[str, str]], depth: int = ...) -> Tuple[Any, ...]: ...
+
+class ErrorCluster:
+    count: int = ...
+    first_seen: Optional[datetime] = ...
+    last_seen: Optional[datetime] = ...
+    sample: str = ...
+    def __init__(self, sample: str, seen: Optional[datetime]) -> None: ...
+    def add(self, seen: Optional[datetime]) -> None: ...
+    def merge(self, other: ErrorCluster) -> None: ...
+
+class ErrorClusters:
+    depth: int = ...
+    max_clusters: int = ...
+    max_sample_lines: int = ...
+    clusters: Dict[Tuple[Any, ...], ErrorCluster] = ...
+    _in_traceback: bool = ...
+    _frames: Deque[Tuple[str, str]] = ...
+    _lines: List[str] = ...
+    _started: Optional[datetime] = ...
+    def __init__(self, depth: int = ..., max_clusters: int = ..., max_sample_lines: int = ...) -> None: ...
+    def _reset(self) -> None: ...
+    def _cluster(self, key: Tuple[Any, ...], sample: str, seen: Optional[datetime]) -> ErrorCluster: ...
+    def add_line(self, line: bytes) -> None: ...
+    @property
+    def total(self) -> int: ...
+    def merge(self, other: ErrorClusters) -> None: ...
+    def top(self, count: int = ...) -> List[Tuple[Tuple[Any, ...], ErrorCluster]]: ...
+
+def collect_error_clusters(
+    domain: str, indices: Iterable[int], max_workers: int = ..., depth: int = ...
+) -> Tuple[ErrorClusters, List[Tuple[str, Exception]]]: ...
@@ -0,0 +1,249 @@
+"""Local SQLite store of parsed webapp access log entries.
+
+Access logs are parsed once into `LogStore` (one row per request with
+timestamp, method, endpoint, status and response time) and imported
+incrementally -- read offset of every current log is kept in the store,
+so next import fetches and parses only lines appended since the previous
+one.  Logs are streamed in chunks, so memory use doesn't grow with their
+size.  Aggregations (requests per endpoint, status mix, response time
+percentiles) are then computed by SQLite using indexes."""
+
+import json
+import sqlite3
+from contextlib import closing
+from itertools import chain
+
+from pythonanywhere.access_log import parse_access_line, parse_timestamp
+from pythonanywhere.logs import RemoteLog
+from pythonanywhere.utils import get_cache_dir
+from pythonanywhere.webapp_logs import WebappLog, log_path
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS requests (
+    domain TEXT NOT NULL,
+    timestamp INTEGER NOT NULL,
+    method TEXT NOT NULL,
+    endpoint TEXT NOT NULL,
+    status INTEGER NOT NULL,
+    response_time REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS requests_domain_timestamp ON requests (domain, timestamp);
+CREATE INDEX IF NOT EXISTS requests_domain_response_time ON requests (domain, response_time);
+CREATE INDEX IF NOT EXISTS requests_domain_endpoint ON requests (domain, endpoint, response_time);
+CREATE TABLE IF NOT EXISTS offsets (
+    domain TEXT NOT NULL,
+    path TEXT NOT NULL,
+    offset INTEGER NOT NULL,
+    size INTEGER,
+    archives TEXT,
+    PRIMARY KEY (domain, path)
+);
+"""
+# columns added to `offsets` after the first release of the store
+OFFSETS_COLUMNS = {"size": "INTEGER", "archives": "TEXT"}
+BATCH_SIZE = 5000
+CHUNK_SIZE = 4 * 1024 * 1024
+
+
+def default_store_path():
+    return get_cache_dir() / "webapp_logs.sqlite"
+
+
+def _rows(domain, lines):
+    for line in lines:
+        record = parse_access_line(line)
+        if record is not None:
+            yield (
+                domain,
+                int(parse_timestamp(record.timestamp).timestamp()),
+                record.method,
+                record.endpoint,
+                record.status,
+                record.response_time,
+            )
+
+
+class LogStore:
+    """Class representing local store of access log entries of webapps.
+
+    Use :method:`LogStore.import_current` to add entries appended to the
+    current access log since the previous import,
+    :method:`LogStore.import_archives` to add archived logs once and
+    :method:`LogStore.summary` to query the store."""
+
+    def __init__(self, path=None):
+        self.path = path or default_store_path()
+        self.connection = sqlite3.connect(str(self.path))
+        self.connection.executescript(SCHEMA)
+        self._migrate()
+
+    def _migrate(self):
+        existing = {row[1] for row in self.connection.execute("PRAGMA table_info(offsets)")}
+        with self.connection:
+            for column, column_type in OFFSETS_COLUMNS.items():
+                if column not in existing:
+                    self.connection.execute(f"ALTER TABLE offsets ADD COLUMN {column} {column_type}")
+
+    def close(self):
+        self.connection.close()
+
+    def _insert(self, rows):
+        """Inserts `rows` in batches, within caller's transaction."""
+
+        count = 0
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= BATCH_SIZE:
+                self.connection.executemany("INSERT INTO requests VALUES (?, ?, ?, ?, ?, ?)", batch)
+                count += len(batch)
+                batch = []
+        self.connection.executemany("INSERT INTO requests VALUES (?, ?, ?, ?, ?, ?)", batch)
+        return count + len(batch)
+
+    def _contains(self, row):
+        return (
+            self.connection.execute(
+                "SELECT 1 FROM requests WHERE domain = ? AND timestamp = ? AND method = ? AND endpoint = ? "
+                "AND status = ? AND response_time = ? LIMIT 1",
+                row,
+            ).fetchone()
+            is not None
+        )
+
+    def get_offset(self, domain, path):
+        return self.get_state(domain, path)["offset"]
+
+    def get_state(self, domain, path):
+        """Returns dictionary with `offset`, `size` and `archives` (indices
+        of archived logs) stored for `path` of `domain`; values are None
+        when they were not stored."""
+
+        row = self.connection.execute(
+            "SELECT offset, size, archives FROM offsets WHERE domain = ? AND path = ?", (domain, path)
+        ).fetchone()
+        offset, size, archives = row or (None, None, None)
+        return {"offset": offset, "size": size, "archives": None if archives is None else json.loads(archives)}
+
+    def _set_offset(self, domain, path, offset, size=None, archives=None):
+        self.connection.execute(
+            "INSERT OR REPLACE INTO offsets (domain, path, offset, size, archives) VALUES (?, ?, ?, ?, ?)",
+            (domain, path, offset, size, None if archives is None else json.dumps(list(archives))),
+        )
+
+    def import_current(self, domain, archives=None, chunk_size=CHUNK_SIZE):
+        """Imports lines appended to current access log of `domain` since
+        the previous import (incomplete last line is left for the next
+        one), returns number of imported requests.
+
+        `archives` are current indices of archived access logs (as listed
+        by `Webapp.get_log_info`); when they differ from the ones stored
+        with the offset, the log has been rotated since the previous
+        import -- the rest of the old log is read from archive number 1
+        and the new one from the beginning, even when it's already longer
+        than the stored offset.
+
+        Log is read in `chunk_size` byte ranges; requests of every chunk
+        are committed together with the new offset, so an interrupted
+        import is resumed without duplicates."""
+
+        path = log_path(domain, "access")
+        archives = None if archives is None else [index for index in archives if index]
+        state = self.get_state(domain, path)
+        rotated = None not in (archives, state["archives"]) and archives != state["archives"]
+        log = WebappLog(domain, "access", offset=state["offset"] or 0, rotated=rotated)
+        count = 0
+        tail = b""
+        while True:
+            chunk = log.read_new(max_bytes=chunk_size)
+            if not chunk:
+                break
+            complete, _, tail = (tail + chunk).rpartition(b"\n")
+            with self.connection:
+                count += self._insert(_rows(domain, complete.split(b"\n") if complete else []))
+                self._set_offset(domain, path, log.offset - len(tail), log.size, archives)
+            if len(chunk) < chunk_size:
+                break
+        if state["offset"] is None or state["archives"] != archives:
+            # records archives (and offset reset by rotation) even when
+            # nothing new was read
+            with self.connection:
+                self._set_offset(domain, path, log.offset - len(tail), log.size, archives)
+        return count
+
+    def import_archives(self, domain, indices):
+        """Imports archived access logs of `domain` with `indices` (1-9),
+        returns number of imported requests.
+
+        Archive keeps its content when it's renamed (and gzipped) by
+        rotation, so archives whose first request is already in the store
+        -- imported before, or read from the current log before it was
+        rotated -- are skipped.  Every archive is imported in a single
+        transaction."""
+
+        count = 0
+        for index in indices:
+            if not index:
+                continue
+            rows = _rows(domain, RemoteLog(log_path(domain, "access", index)).iter_lines())
+            with closing(rows):
+                first = next(rows, None)
+                if first is None or self._contains(first):
+                    continue
+                with self.connection:
+                    count += self._insert(chain([first], rows))
+        return count
+
+    def _where(self, domain, since):
+        if since is None:
+            return "domain = ?", (domain,)
+        return "domain = ? AND timestamp >= ?", (domain, int(since.timestamp()))
+
+    def _quantiles(self, where, params, count, fractions):
+        return [
+            self.connection.execute(
+                f"SELECT response_time FROM requests WHERE {where} ORDER BY response_time LIMIT 1 OFFSET ?",
+                (*params, int(fraction * (count - 1))),
+            ).fetchone()[0]
+            for fraction in fractions
+        ]
+
+    def summary(self, domain, since=None, top=20, fractions=(0.5, 0.95, 0.99)):
+        """Returns dictionary with number of `requests`, response time
+        `quantiles` (for `fractions`), `status_mix` (status class to number
+        of requests) and `endpoints` -- list of (endpoint, requests, 5xx
+        responses, quantiles) tuples of `top` endpoints with the most
+        requests -- of requests to `domain` (since `since` datetime)."""
+
+        where, params = self._where(domain, since)
+        with closing(self.connection.cursor()) as cursor:
+            count = cursor.execute(f"SELECT COUNT(*) FROM requests WHERE {where}", params).fetchone()[0]
+            if not count:
+                return {"requests": 0, "quantiles": [], "status_mix": {}, "endpoints": []}
+            status_mix = {
+                f"{status_class}xx": requests
+                for status_class, requests in cursor.execute(
+                    f"SELECT status / 100, COUNT(*) FROM requests WHERE {where} GROUP BY 1 ORDER BY 1", params
+                )
+            }
+            top_endpoints = cursor.execute(
+                f"SELECT endpoint, COUNT(*), SUM(status >= 500) FROM requests WHERE {where} "
+                "GROUP BY endpoint ORDER BY 2 DESC, 1 LIMIT ?",
+                (*params, top),
+            ).fetchall()
+
+        endpoints = [
+            (
+                endpoint,
+                requests,
+                errors,
+                self._quantiles(f"{where} AND endpoint = ?", (*params, endpoint), requests, fractions),
+            )
+            for endpoint, requests, errors in top_endpoints
+        ]
+        return {
+            "requests": count,
+            "quantiles": self._quantiles(where, params, count, fractions),
+            "status_mix": status_mix,
+            "endpoints": endpoints,
+        }
@@ -0,0 +1,46 @@
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+SCHEMA: str = ...
+BATCH_SIZE: int = ...
+CHUNK_SIZE: int = ...
+OFFSETS_COLUMNS: Dict[str, str] = ...
+
+def default_store_path() -> Path: ...
+def _rows(domain: str, lines: Iterable[bytes]) -> Iterator[Tuple[str, int, str, str, int, float]]: ...
+
+class LogStore:
+    path: Union[str, Path] = ...
+    connection: sqlite3.Connection = ...
+    def __init__(self, path: Optional[Union[str, Path]] = ...) -> None: ...
+    def _migrate(self) -> None: ...
+    def close(self) -> None: ...
+    def _insert(self, rows: Iterable[Tuple[str, int, str, str, int, float]]) -> int: ...
+    def _contains(self, row: Tuple[str, int, str, str, int, float]) -> bool: ...
+    def get_offset(self, domain: str, path: str) -> Optional[int]: ...
+    def get_state(self, domain: str, path: str) -> Dict[str, Any]: ...
+    def _set_offset(
+        self,
+        domain: str,
+        path: str,
+        offset: int,
+        size: Optional[int] = ...,
+        archives: Optional[Sequence[int]] = ...,
+    ) -> None: ...
+    def import_current(
+        self, domain: str, archives: Optional[Sequence[int]] = ..., chunk_size: int = ...
+    ) -> int: ...
+    def import_archives(self, domain: str, indices: Iterable[int]) -> int: ...
+    def _where(self, domain: str, since: Optional[datetime]) -> Tuple[str, Tuple[Any, ...]]: ...
+    def _quantiles(
+        self, where: str, params: Tuple[Any, ...], count: int, fractions: Sequence[float]
+    ) -> List[float]: ...
+    def summary(
+        self,
+        domain: str,
+        since: Optional[datetime] = ...,
+        top: int = ...,
+        fractions: Sequence[float] = ...,
+    ) -> Dict[str, Any]: ...
@@ -0,0 +1,187 @@
+"""Incremental reading of PythonAnywhere log files.
+
+Provides `RemoteLog` class which reads only the bytes appended to a log
+file since the previous read and `LogOffsets` class which keeps read
+offsets between `pa` invocations."""
+
+import gzip
+import json
+import logging
+import os
+import time
+from pathlib import Path
+
+from pythonanywhere_core.base import call_api
+from pythonanywhere_core.exceptions import PythonAnywhereApiException
+from pythonanywhere_core.files import Files
+
+from pythonanywhere.utils import get_cache_dir
+
+logger = logging.getLogger(name=__name__)
+
+
+class RemoteLog:
+    """Class representing a log file available to PythonAnywhere user.
+
+    Keeps `offset` of the first byte which has not been read yet, so
+    :method:`RemoteLog.read_new` returns only new bytes.  When the file
+    exists locally (e.g. in a PythonAnywhere console) it's read directly
+    using size check and seek, otherwise it's fetched via Files API with
+    a `Range` request.  When file shrinks (it has been rotated or
+    truncated) or, for a local file, is replaced by another one, it's read
+    again from the beginning.  `size` is the size of
+    the file seen by the last read (None before the first one).
+
+    Use :method:`RemoteLog.follow` to poll for new bytes with backoff."""
+
+    def __init__(self, path, offset=0):
+        self.path = path
+        self.offset = offset
+        self.rotated = False
+        self.size = None
+        self._inode = None
+
+    @property
+    def url(self):
+        return f"{Files.path_endpoint}{self.path}"
+
+    def _read_local(self, max_bytes=None):
+        stat = os.stat(self.path)
+        size = self.size = stat.st_size
+        replaced = self._inode is not None and stat.st_ino != self._inode
+        self._inode = stat.st_ino
+        if size < self.offset or (replaced and self.offset):
+            self.offset = 0
+            self.rotated = True
+        if size == self.offset:
+            return b""
+        with open(self.path, "rb") as f:
+            f.seek(self.offset)
+            return f.read(size - self.offset if max_bytes is None else min(size - self.offset, max_bytes))
+
+    def _read_remote(self, max_bytes=None):
+        end = "" if max_bytes is None else self.offset + max_bytes - 1
+        headers = {"Range": f"bytes={self.offset}-{end}"} if self.offset or max_bytes else {}
+        result = call_api(self.url, "GET", headers=headers)
+
+        if result.status_code == 206:
+            size = result.headers.get("Content-Range", "").rpartition("/")[2]
+            self.size = int(size) if size.isdigit() else self.offset + len(result.content)
+            return result.content
+        if result.status_code == 200:
+            content = result.content
+            self.size = len(content)
+            if len(content) < self.offset:
+                self.offset = 0
+                self.rotated = True
+            return content[self.offset:] if max_bytes is None else content[self.offset:self.offset + max_bytes]
+        if result.status_code == 416:
+            size = result.headers.get("Content-Range", "").rpartition("/")[2]
+            self.size = int(size) if size.isdigit() else self.offset
+            if size.isdigit() and int(size) < self.offset:
+                self.offset = 0
+                self.rotated = True
+                return self._read_remote(max_bytes)
+            return b""
+        if result.status_code == 404:
+            self.size = 0
+            return b""
+
+        raise PythonAnywhereApiException(f"GET to fetch {self.url} failed, got {result}: {result.text}")
+
+    def read_new(self, max_bytes=None):
+        """Returns bytes appended since the last read (at most `max_bytes`
+        of them, when given) and moves `offset` past them.  Missing file
+        is treated as an empty one."""
+
+        self.rotated = False
+        chunk = self._read_local(max_bytes) if Path(self.path).is_file() else self._read_remote(max_bytes)
+        self.offset += len(chunk)
+        return chunk
+
+    def iter_lines(self):
+        """Yields lines of the whole file (as bytes, without line
+        endings) without loading it into memory at once.  Gzipped files
+        (with `.gz` suffix, like archived webapp logs) are decompressed
+        while they are streamed."""
+
+        gzipped = self.path.endswith(".gz")
+        if Path(self.path).is_file():
+            with (gzip.open if gzipped else open)(self.path, "rb") as f:
+                for line in f:
+                    yield line.rstrip(b"\r\n")
+            return
+
+        result = call_api(self.url, "GET", stream=True)
+        if result.status_code == 404:
+            return
+        if not result.ok:
+            raise PythonAnywhereApiException(f"GET to fetch {self.url} failed, got {result}: {result.text}")
+        with result:
+            if not gzipped:
+                yield from result.iter_lines()
+                return
+            with gzip.GzipFile(fileobj=result.raw) as f:
+                for line in f:
+                    yield line.rstrip(b"\r\n")
+
+    def follow(self, min_interval=1.0, max_interval=30.0):
+        """Yields new chunks of the file forever.
+
+        Polls every `min_interval` seconds while file grows and doubles
+        the interval (up to `max_interval`) every time nothing new
+        appeared."""
+
+        interval = min_interval
+        while True:
+            chunk = self.read_new()
+            if chunk:
+                interval = min_interval
+                yield chunk
+            else:
+                interval = min(interval * 2, max_interval)
+            time.sleep(interval)
+
+
+class LogOffsets:
+    """Read offsets of log files stored in `pa` cache directory, so
+    consecutive invocations print only new log entries.
+
+    Along with the offset, size of the file and indices of its archives
+    (as listed by `Webapp.get_log_info`, when known) are stored, so
+    rotation between invocations can be detected even when the new file
+    has already grown past the stored offset."""
+
+    def __init__(self, path=None):
+        self.path = Path(path) if path else get_cache_dir() / "log_offsets.json"
+
+    def _load(self):
+        try:
+            return json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            return {}
+
+    def get(self, log_path):
+        return self.get_state(log_path)["offset"]
+
+    def get_state(self, log_path):
+        """Returns dictionary with `offset`, `size` and `archives` stored
+        for `log_path` (`archives` is None when they were not stored)."""
+
+        state = self._load().get(log_path, 0)
+        if isinstance(state, int):
+            # offsets stored by older versions
+            state = {"offset": state, "size": state}
+        return {"offset": 0, "size": 0, "archives": None, **state}
+
+    def set(self, log_path, offset, size=None, archives=None):
+        offsets = self._load()
+        offsets[log_path] = {
+            "offset": offset,
+            "size": offset if size is None else size,
+            "archives": None if archives is None else list(archives),
+        }
+        try:
+            self.path.write_text(json.dumps(offsets))
+        except OSError as e:
+            logger.debug(f"Could not store log offset: {e}")
@@ -0,0 +1,34 @@
+import logging
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Union
+
+logger: logging.Logger = ...
+
+class RemoteLog:
+    path: str = ...
+    offset: int = ...
+    rotated: bool = ...
+    size: Optional[int] = ...
+    _inode: Optional[int] = ...
+    def __init__(self, path: str, offset: int = ...) -> None: ...
+    @property
+    def url(self) -> str: ...
+    def _read_local(self, max_bytes: Optional[int] = ...) -> bytes: ...
+    def _read_remote(self, max_bytes: Optional[int] = ...) -> bytes: ...
+    def read_new(self, max_bytes: Optional[int] = ...) -> bytes: ...
+    def iter_lines(self) -> Iterator[bytes]: ...
+    def follow(self, min_interval: float = ..., max_interval: float = ...) -> Iterator[bytes]: ...
+
+class LogOffsets:
+    path: Path = ...
+    def __init__(self, path: Optional[Union[str, Path]] = ...) -> None: ...
+    def _load(self) -> Dict[str, Any]: ...
+    def get(self, log_path: str) -> int: ...
+    def get_state(self, log_path: str) -> Dict[str, Any]: ...
+    def set(
+        self,
+        log_path: str,
+        offset: int,
+        size: Optional[int] = ...,
+        archives: Optional[Sequence[int]] = ...,
+    ) -> None: ...
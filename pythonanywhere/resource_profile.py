@@ -0,0 +1,101 @@
+"""Resource usage profiling of shell commands run locally.
+
+`profile_command` runs a command (e.g. scheduled task's command) in a
+subprocess and returns a `RunProfile` with wall time, CPU user/system
+time, peak RSS, I/O counters and return code.  `summarize` aggregates
+profiles of repeated runs."""
+
+import resource
+import statistics
+import subprocess
+import time
+from collections import namedtuple
+
+import psutil
+
+RunProfile = namedtuple(
+    "RunProfile",
+    ["wall", "cpu_user", "cpu_system", "peak_rss", "read_bytes", "write_bytes", "returncode"],
+)
+
+METRICS = ("wall", "cpu_user", "cpu_system", "peak_rss", "read_bytes", "write_bytes")
+
+
+def _process_tree(pid):
+    try:
+        parent = psutil.Process(pid)
+        return [parent] + parent.children(recursive=True)
+    except psutil.Error:
+        return []
+
+
+def profile_command(command, *, interval=0.05, stdout=None, stderr=None):
+    """Runs shell `command` and samples its resource usage.
+
+    CPU times come from `getrusage` of terminated children, so they are
+    exact.  RSS and I/O counters are sampled from the whole process tree
+    every `interval` seconds -- peak RSS is the highest of summed tree RSS
+    and the maximum RSS reported by the kernel (when this run set a new
+    maximum for all children of current process); I/O counters are the
+    last values seen for every process (processes living shorter than
+    `interval` may be missed, and counters are zero where the platform
+    doesn't provide them).
+
+    :param command: shell command to execute
+    :param interval: sampling interval in seconds
+    :param stdout: passed to `subprocess.Popen`
+    :param stderr: passed to `subprocess.Popen`
+    :returns: `RunProfile` instance"""
+
+    usage_before = resource.getrusage(resource.RUSAGE_CHILDREN)
+    started = time.perf_counter()
+    process = subprocess.Popen(command, shell=True, stdout=stdout, stderr=stderr)
+
+    peak_rss = 0
+    io = {}
+    while process.poll() is None:
+        rss = 0
+        for proc in _process_tree(process.pid):
+            try:
+                rss += proc.memory_info().rss
+                counters = proc.io_counters()
+                io[proc.pid] = (counters.read_bytes, counters.write_bytes)
+            except (psutil.Error, AttributeError):
+                continue
+        peak_rss = max(peak_rss, rss)
+        try:
+            process.wait(timeout=interval)
+        except subprocess.TimeoutExpired:
+            pass
+
+    wall = time.perf_counter() - started
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    if usage.ru_maxrss > usage_before.ru_maxrss:
+        # ru_maxrss is in kilobytes on Linux and covers all children so far
+        peak_rss = max(peak_rss, usage.ru_maxrss * 1024)
+
+    return RunProfile(
+        wall=wall,
+        cpu_user=usage.ru_utime - usage_before.ru_utime,
+        cpu_system=usage.ru_stime - usage_before.ru_stime,
+        peak_rss=peak_rss,
+        read_bytes=sum(read for read, _ in io.values()),
+        write_bytes=sum(write for _, write in io.values()),
+        returncode=process.returncode,
+    )
+
+
+def summarize(profiles):
+    """Returns dictionary mapping every metric from `METRICS` to a
+    dictionary with its min, median, mean and max over `profiles`."""
+
+    summary = {}
+    for metric in METRICS:
+        values = [getattr(profile, metric) for profile in profiles]
+        summary[metric] = {
+            "min": min(values),
+            "median": statistics.median(values),
+            "mean": statistics.mean(values),
+            "max": max(values),
+        }
+    return summary
@@ -0,0 +1,23 @@
+import psutil
+from typing import IO, Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
+
+class RunProfile(NamedTuple):
+    wall: float
+    cpu_user: float
+    cpu_system: float
+    peak_rss: int
+    read_bytes: int
+    write_bytes: int
+    returncode: int
+
+METRICS: Tuple[str, ...] = ...
+
+def _process_tree(pid: int) -> List[psutil.Process]: ...
+def profile_command(
+    command: str,
+    *,
+    interval: float = ...,
+    stdout: Optional[Union[int, IO]] = ...,
+    stderr: Optional[Union[int, IO]] = ...,
+) -> RunProfile: ...
+def summarize(profiles: Iterable[RunProfile]) -> Dict[str, Dict[str, float]]: ...
@@ -0,0 +1,86 @@
+"""Helpers for spreading scheduled tasks over (hour, minute) slots.
+
+Hourly tasks occupy their minute in every hour of the day, daily tasks
+occupy one (hour, minute) slot.  Functions in this module build a
+histogram of enabled tasks per slot, report the busiest slots and
+propose new minutes for tasks so that the peak number of tasks starting
+at the same time is as low as possible."""
+
+from collections import Counter, namedtuple
+
+HOURS = range(24)
+MINUTES = range(60)
+
+Move = namedtuple("Move", ["task", "old_minute", "new_minute"])
+
+
+def task_slots(task, minute=None):
+    """Returns list of (hour, minute) slots in which `task` starts.
+
+    :param task: `Task` instance (or anything with `interval`, `hour`
+      and `minute` attributes)
+    :param minute: minute to use instead of `task.minute`"""
+
+    minute = task.minute if minute is None else minute
+    if task.interval == "hourly":
+        return [(hour, minute) for hour in HOURS]
+    return [(task.hour, minute)]
+
+
+def slot_histogram(tasks):
+    """Returns `Counter` of enabled tasks starting in each (hour, minute) slot."""
+
+    histogram = Counter()
+    for task in tasks:
+        if task.enabled:
+            histogram.update(task_slots(task))
+    return histogram
+
+
+def peak(histogram):
+    return max(histogram.values(), default=0)
+
+
+def hotspots(histogram, top=10):
+    """Returns up to `top` most crowded slots with more than one task as a
+    list of ((hour, minute), count) tuples, busiest first."""
+
+    crowded = [(slot, count) for slot, count in histogram.items() if count > 1]
+    crowded.sort(key=lambda item: (-item[1], item[0]))
+    return crowded[:top]
+
+
+def propose_balance(tasks, pinned=()):
+    """Proposes new minutes for enabled tasks minimising peak concurrency.
+
+    Pinned and disabled tasks are never moved, but pinned ones are taken
+    into account.  Daily tasks keep their hour.  Tasks are placed greedily
+    (hourly tasks first, as they occupy a slot in every hour) on the
+    minute where they raise the load least, preferring their current
+    minute and then the closest one.
+
+    :param tasks: iterable of `Task` instances
+    :param pinned: collection of task ids that must not be moved
+    :returns: tuple of proposed histogram and list of `Move` tuples for
+      tasks which should change minute"""
+
+    enabled = [task for task in tasks if task.enabled]
+    fixed = [task for task in enabled if task.task_id in pinned]
+    movable = [task for task in enabled if task.task_id not in pinned]
+    movable.sort(key=lambda t: (t.interval != "hourly", t.hour or 0, t.minute, t.task_id or 0))
+
+    histogram = slot_histogram(fixed)
+    moves = []
+    for task in movable:
+
+        def cost(minute):
+            load = max(histogram[slot] for slot in task_slots(task, minute))
+            distance = min(abs(minute - task.minute), 60 - abs(minute - task.minute))
+            return load, distance, minute
+
+        best = min(MINUTES, key=cost)
+        histogram.update(task_slots(task, best))
+        if best != task.minute:
+            moves.append(Move(task, task.minute, best))
+
+    return histogram, moves
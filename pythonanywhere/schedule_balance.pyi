@@ -0,0 +1,20 @@
+from collections import Counter
+from typing import Collection, Iterable, List, NamedTuple, Optional, Tuple
+
+from pythonanywhere.task import Task
+
+HOURS: range = ...
+MINUTES: range = ...
+
+Slot = Tuple[Optional[int], int]
+
+class Move(NamedTuple):
+    task: Task
+    old_minute: int
+    new_minute: int
+
+def task_slots(task: Task, minute: Optional[int] = ...) -> List[Slot]: ...
+def slot_histogram(tasks: Iterable[Task]) -> Counter: ...
+def peak(histogram: Counter) -> int: ...
+def hotspots(histogram: Counter, top: int = ...) -> List[Tuple[Slot, int]]: ...
+def propose_balance(tasks: Iterable[Task], pinned: Collection[int] = ...) -> Tuple[Counter, List[Move]]: ...
@@ -0,0 +1,152 @@
+"""Local snapshot cache for scheduled tasks specs.
+
+Provides `ScheduleCache` class which stores the result of
+`Schedule.get_list` on disk, so consecutive reads (e.g. `pa schedule get`
+called for many tasks in a shell loop) may be served with one API call.
+
+Cache is opt-in: it's used only when `PYTHONANYWHERE_SCHEDULE_CACHE_TTL`
+environment variable is set to a positive number of seconds."""
+
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from urllib.parse import urlparse
+
+from pythonanywhere_core.schedule import Schedule
+
+from pythonanywhere.utils import get_cache_dir
+
+logger = logging.getLogger(name=__name__)
+
+TTL_ENV_VAR = "PYTHONANYWHERE_SCHEDULE_CACHE_TTL"
+
+
+def default_cache_path(base_url):
+    """Returns path of snapshot for schedule API at `base_url` -- keyed by
+    API host and username, so accounts don't share cached tasks."""
+
+    url = urlparse(base_url)
+    username = url.path.rstrip("/").split("/")[-2]
+    return get_cache_dir() / f"schedule-{url.hostname}-{username}.json"
+
+
+class ScheduleCache:
+    """Class representing on-disk snapshot of scheduled tasks specs.
+
+    Snapshot is a json file containing the time it was taken and the
+    list of specs returned by API.  It's considered fresh for `ttl`
+    seconds.  When `ttl` is not provided it's read from
+    `PYTHONANYWHERE_SCHEDULE_CACHE_TTL` environment variable every time
+    it's needed; cache with `ttl` not greater than 0 is disabled.  Unless
+    `path` is given, snapshot is kept per API host and user taken from
+    `base_url` (`Schedule.base_url` by default).
+
+    Use :method:`ScheduleCache.load` to get fresh snapshot (or None),
+    :method:`ScheduleCache.store` to save a new one and
+    :method:`ScheduleCache.patch`, :method:`ScheduleCache.remove` or
+    :method:`ScheduleCache.invalidate` to keep it in sync with writes
+    (patches and removals are serialized, so tasks written concurrently
+    from many threads don't overwrite each other's changes)."""
+
+    _lock = threading.Lock()
+
+    def __init__(self, ttl=None, path=None, base_url=None):
+        self._ttl = ttl
+        self._path = path
+        self._base_url = base_url
+
+    @property
+    def ttl(self):
+        if self._ttl is not None:
+            return self._ttl
+        try:
+            return float(os.environ.get(TTL_ENV_VAR, 0))
+        except ValueError:
+            return 0
+
+    @property
+    def path(self):
+        if self._path:
+            return Path(self._path)
+        return default_cache_path(self._base_url or Schedule.base_url)
+
+    @property
+    def enabled(self):
+        return self.ttl > 0
+
+    def _read(self):
+        try:
+            with self.path.open() as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write(self, snapshot):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.path.parent, prefix=".schedule-")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(snapshot, f)
+            os.replace(tmp, self.path)
+        except OSError as e:
+            logger.debug(f"Could not write schedule cache: {e}")
+            Path(tmp).unlink(missing_ok=True)
+
+    def load(self):
+        """Returns list of cached specs when cache is enabled and
+        snapshot is fresh, None otherwise."""
+
+        if not self.enabled:
+            return None
+        snapshot = self._read()
+        if not snapshot or time.time() - snapshot.get("taken_at", 0) > self.ttl:
+            return None
+        return snapshot["tasks"]
+
+    def store(self, specs_list):
+        """Saves `specs_list` as a new snapshot (when cache is enabled)."""
+
+        if self.enabled:
+            self._write({"taken_at": time.time(), "tasks": specs_list})
+
+    def get_specs(self, task_id):
+        """Returns cached specs of task with `task_id` or None when task
+        is not in a fresh snapshot."""
+
+        for specs in self.load() or []:
+            if specs.get("id") == task_id:
+                return specs
+        return None
+
+    def patch(self, specs):
+        """Replaces (or adds) task `specs` in a fresh snapshot keeping
+        its timestamp.  Stale snapshot is left to expire."""
+
+        with self._lock:
+            cached = self.load()
+            if cached is None:
+                return
+            tasks = [task for task in cached if task.get("id") != specs.get("id")]
+            tasks.append(specs)
+            snapshot = self._read()
+            self._write({"taken_at": snapshot["taken_at"], "tasks": tasks})
+
+    def remove(self, task_id):
+        """Removes task with `task_id` from a fresh snapshot."""
+
+        with self._lock:
+            cached = self.load()
+            if cached is None:
+                return
+            snapshot = self._read()
+            tasks = [task for task in cached if task.get("id") != task_id]
+            self._write({"taken_at": snapshot["taken_at"], "tasks": tasks})
+
+    def invalidate(self):
+        """Removes snapshot file."""
+
+        self.path.unlink(missing_ok=True)
@@ -0,0 +1,32 @@
+import logging
+import threading
+from pathlib import Path
+from typing import ClassVar, List, Optional, Union
+
+logger: logging.Logger = ...
+TTL_ENV_VAR: str = ...
+
+def default_cache_path(base_url: str) -> Path: ...
+
+class ScheduleCache:
+    _lock: ClassVar[threading.Lock] = ...
+    _ttl: Optional[float] = ...
+    _path: Optional[Union[str, Path]] = ...
+    _base_url: Optional[str] = ...
+    def __init__(
+        self, ttl: Optional[float] = ..., path: Optional[Union[str, Path]] = ..., base_url: Optional[str] = ...
+    ) -> None: ...
+    @property
+    def ttl(self) -> float: ...
+    @property
+    def path(self) -> Path: ...
+    @property
+    def enabled(self) -> bool: ...
+    def _read(self) -> Optional[dict]: ...
+    def _write(self, snapshot: dict) -> None: ...
+    def load(self) -> Optional[List[dict]]: ...
+    def store(self, specs_list: List[dict]) -> None: ...
+    def get_specs(self, task_id: int) -> Optional[dict]: ...
+    def patch(self, specs: dict) -> None: ...
+    def remove(self, task_id: int) -> None: ...
+    def invalidate(self) -> None: ...
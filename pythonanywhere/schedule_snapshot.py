@@ -0,0 +1,90 @@
+"""Versioned JSON snapshots of the schedule for export and import.
+
+Snapshot keeps only specs needed to recreate tasks (see
+`SNAPSHOT_FIELDS`) and checksums of every task and of the whole list, so
+a corrupted or hand-edited file is detected before any task is created
+and tasks already present in the schedule are recognized by checksum."""
+
+import hashlib
+import json
+from datetime import datetime
+
+from pythonanywhere.task import Task
+from pythonanywhere.utils import run_concurrently
+
+SNAPSHOT_VERSION = 1
+SNAPSHOT_FIELDS = ("command", "interval", "hour", "minute", "enabled")
+
+
+def _digest(data):
+    return hashlib.sha256(json.dumps(data, sort_keys=True).encode()).hexdigest()
+
+
+def task_record(task):
+    """Returns snapshot record (dictionary of `SNAPSHOT_FIELDS`) of `task`."""
+
+    record = {field: getattr(task, field) for field in SNAPSHOT_FIELDS}
+    if record["interval"] == "hourly":
+        record["hour"] = None
+    return record
+
+
+def task_checksum(record):
+    """Returns checksum of task `record` (it doesn't depend on task id or
+    any other account specific specs)."""
+
+    return _digest({field: record.get(field) for field in SNAPSHOT_FIELDS})
+
+
+def make_snapshot(tasks):
+    """Returns snapshot dictionary of `tasks`."""
+
+    records = [{**task_record(task), "checksum": task_checksum(task_record(task))} for task in tasks]
+    return {
+        "version": SNAPSHOT_VERSION,
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "checksum": _digest(records),
+        "tasks": records,
+    }
+
+
+def load_snapshot(data):
+    """Validates snapshot dictionary `data` and returns its task records.
+
+    :raises ValueError: when snapshot has unsupported version or any of
+        its checksums doesn't match the content"""
+
+    if data.get("version") != SNAPSHOT_VERSION:
+        raise ValueError(f"Unsupported snapshot version: {data.get('version')}")
+    records = data.get("tasks", [])
+    if data.get("checksum") != _digest(records):
+        raise ValueError("Snapshot checksum doesn't match its content")
+    for record in records:
+        if record.get("checksum") != task_checksum(record):
+            raise ValueError(f"Checksum of task '{record.get('command')}' doesn't match its content")
+    return records
+
+
+def restore(records, existing_tasks, max_workers=4):
+    """Creates tasks from snapshot `records` concurrently, skipping records
+    matching (by checksum) any of `existing_tasks` -- so restoring the same
+    snapshot again doesn't create duplicates.
+
+    :returns: tuple of list of (record, `Task` or None, exception or None)
+        tuples for created tasks and list of skipped records"""
+
+    existing = {task_checksum(task_record(task)) for task in existing_tasks}
+    skipped = [record for record in records if record["checksum"] in existing]
+    pending = [record for record in records if record["checksum"] not in existing]
+
+    def create(record):
+        task = Task.to_be_created(
+            command=record["command"],
+            hour=record["hour"] if record["interval"] == "daily" else None,
+            minute=record["minute"],
+            disabled=not record["enabled"],
+        )
+        task.create_schedule()
+        return task
+
+    return run_concurrently(create, pending, max_workers=max_workers), skipped
@@ -0,0 +1,15 @@
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from pythonanywhere.task import Task
+
+SNAPSHOT_VERSION: int = ...
+SNAPSHOT_FIELDS: Tuple[str, ...] = ...
+
+def _digest(data: Any) -> str: ...
+def task_record(task: Task) -> Dict[str, Any]: ...
+def task_checksum(record: Dict[str, Any]) -> str: ...
+def make_snapshot(tasks: Iterable[Task]) -> Dict[str, Any]: ...
+def load_snapshot(data: Dict[str, Any]) -> List[Dict[str, Any]]: ...
+def restore(
+    records: List[Dict[str, Any]], existing_tasks: Iterable[Task], max_workers: int = ...
+) -> Tuple[List[Tuple[Dict[str, Any], Optional[Task], Optional[Exception]]], List[Dict[str, Any]]]: ...
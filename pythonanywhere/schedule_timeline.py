@@ -0,0 +1,80 @@
+"""Next-run computation and load forecast for scheduled tasks.
+
+Scheduled tasks run on UTC time.  Run times are computed arithmetically
+as minute offsets from the start of the window (first run offset plus
+multiples of the task's period), so forecasting doesn't iterate over
+every minute of the window for every task."""
+
+from collections import Counter
+from datetime import date, datetime, timedelta, timezone
+
+PERIODS = {"hourly": 60, "daily": 24 * 60}
+
+
+def window_start(now=None):
+    """Returns the first full minute not earlier than `now` (UTC)."""
+
+    now = now or datetime.now(timezone.utc)
+    start = now.replace(second=0, microsecond=0)
+    return start if start == now else start + timedelta(minutes=1)
+
+
+def run_offsets(task, start, minutes):
+    """Returns `range` of minute offsets (from `start`) of `task` runs
+    within `minutes` long window."""
+
+    period = PERIODS[task.interval]
+    minute_of_day = start.hour * 60 + start.minute
+    scheduled = (task.hour or 0) * 60 + task.minute if task.interval == "daily" else task.minute
+    first = (scheduled - minute_of_day) % period
+    return range(first, minutes, period)
+
+
+def next_runs(task, start, count):
+    """Returns list of next `count` run datetimes of `task` from `start`."""
+
+    return [start + timedelta(minutes=offset) for offset in run_offsets(task, start, count * PERIODS[task.interval])]
+
+
+def concurrency(tasks, start, minutes):
+    """Returns `Counter` mapping minute offsets to number of enabled
+    tasks starting in that minute of the window."""
+
+    load = Counter()
+    for task in tasks:
+        if task.enabled:
+            load.update(run_offsets(task, start, minutes))
+    return load
+
+
+def expiry_date(task):
+    if not task.expiry:
+        return None
+    try:
+        return date.fromisoformat(str(task.expiry)[:10])
+    except ValueError:
+        return None
+
+
+def expiring(tasks, start, minutes):
+    """Returns list of tasks whose expiry date falls inside the window."""
+
+    end = (start + timedelta(minutes=minutes)).date()
+    return [task for task in tasks if expiry_date(task) is not None and expiry_date(task) <= end]
+
+
+def plot(load, start, minutes):
+    """Returns text plot of `load` -- one line per hour of the window and
+    one character per minute: '.' for no starts, digit for number of
+    starts or '+' for more than 9."""
+
+    def mark(count):
+        return "." if not count else str(count) if count < 10 else "+"
+
+    first_hour = start.replace(minute=0)
+    lines = []
+    for row in range((start.minute + minutes + 59) // 60):
+        offsets = [row * 60 + m - start.minute for m in range(60)]
+        marks = "".join(mark(load.get(offset, 0)) if 0 <= offset < minutes else " " for offset in offsets)
+        lines.append(f"{first_hour + timedelta(hours=row):%m-%d %H}h |{marks}|")
+    return "\n".join(lines)
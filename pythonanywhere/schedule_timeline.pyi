@@ -0,0 +1,15 @@
+from collections import Counter
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Optional
+
+from pythonanywhere.task import Task
+
+PERIODS: Dict[str, int] = ...
+
+def window_start(now: Optional[datetime] = ...) -> datetime: ...
+def run_offsets(task: Task, start: datetime, minutes: int) -> range: ...
+def next_runs(task: Task, start: datetime, count: int) -> List[datetime]: ...
+def concurrency(tasks: Iterable[Task], start: datetime, minutes: int) -> Counter: ...
+def expiry_date(task: Task) -> Optional[date]: ...
+def expiring(tasks: Iterable[Task], start: datetime, minutes: int) -> List[Task]: ...
+def plot(load: Counter, start: datetime, minutes: int) -> str: ...
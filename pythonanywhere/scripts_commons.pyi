@@ -21,5 +21,5 @@ class ScriptSchema(schema.Schema):
     def convert(self, string: str) -> str: ...
     def validate_user_input(self, arguments: dict, *, conversions: Optional[dict]) -> dict: ...
 
-def get_logger(set_info: bool) -> logging.Logger: ...
-def get_task_from_id(task_id: int, no_exit: bool) -> Task: ...
+def get_logger(set_info: bool = ...) -> logging.Logger: ...
+def get_task_from_id(task_id: int, no_exit: bool = ...) -> Task: ...
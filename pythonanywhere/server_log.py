@@ -0,0 +1,127 @@
+"""Worker health timeline from webapp server logs.
+
+Server log of PythonAnywhere webapp is uWSGI log, lines are prefixed
+with a timestamp, e.g.:
+
+    2024-03-01 16:00:05 *** HARAKIRI ON WORKER 2 (pid: 123, try: 1) ***
+    2024-03-01 16:00:06 DAMN ! worker 2 (pid: 123) died, killed by signal 9 :( trying respawn ...
+    2024-03-01 16:00:06 Respawned uWSGI worker 2 (new pid: 456)
+    2024-03-01 16:00:07 *** uWSGI listen queue of socket "127.0.0.1:8000" (fd: 3) full !!! (101/100) ***
+
+:class:`ServerHealth` recognizes worker timeouts (harakiri), deaths,
+respawns, full listen queue and reloads in such lines and counts them in
+fixed time buckets.  Buckets with harakiri or full listen queue mean all
+workers were busy -- consecutive ones are reported as saturation
+periods."""
+
+import re
+from collections import Counter
+from datetime import datetime, timedelta
+
+from pythonanywhere.webapp_logs import collect_logs
+
+TIMESTAMP_RE = re.compile(rb"^(\d{4}-\d\d-\d\d \d\d:\d\d:\d\d)")
+UWSGI_TIMESTAMP_RE = re.compile(rb"\w{3} (\w{3} +\d+ \d\d:\d\d:\d\d \d{4}) - ")
+EVENT_PATTERNS = [
+    ("harakiri", re.compile(rb"HARAKIRI ON WORKER")),
+    ("listen_queue", re.compile(rb"listen queue of socket .* full")),
+    ("died", re.compile(rb"DAMN ! worker \d+ .*died")),
+    ("respawn", re.compile(rb"Respawned uWSGI worker")),
+    ("reload", re.compile(rb"\*\*\* Starting uWSGI")),
+]
+EVENT_KINDS = [kind for kind, _ in EVENT_PATTERNS]
+SATURATION_EVENTS = ("harakiri", "listen_queue")
+
+
+def parse_server_line(line):
+    """Returns (timestamp, event kind) tuple of server log `line` (bytes),
+    (timestamp, None) when line has timestamp but no known event, or
+    (None, kind) / (None, None) when it has no timestamp."""
+
+    match = TIMESTAMP_RE.match(line)
+    if match:
+        timestamp = datetime.strptime(match[1].decode(), "%Y-%m-%d %H:%M:%S")
+    else:
+        match = UWSGI_TIMESTAMP_RE.search(line)
+        timestamp = datetime.strptime(" ".join(match[1].decode().split()), "%b %d %H:%M:%S %Y") if match else None
+    for kind, pattern in EVENT_PATTERNS:
+        if pattern.search(line):
+            return timestamp, kind
+    return timestamp, None
+
+
+class ServerHealth:
+    """Counts worker events from server log lines in `bucket` wide
+    buckets.
+
+    Use :method:`ServerHealth.add_line` on every log line, then
+    :method:`ServerHealth.timeline` and
+    :method:`ServerHealth.saturated_periods`.  Events without their own
+    timestamp are counted at the last seen one; events before any
+    timestamp are counted in `undated`."""
+
+    def __init__(self, bucket=timedelta(minutes=5)):
+        self.bucket = bucket
+        self.buckets = {}
+        self.undated = Counter()
+        self._last_seen = None
+
+    def _bucket_start(self, timestamp):
+        epoch = datetime(1970, 1, 1)
+        return epoch + (timestamp - epoch) // self.bucket * self.bucket
+
+    def add(self, timestamp, kind):
+        if timestamp is None:
+            self.undated[kind] += 1
+        else:
+            self.buckets.setdefault(self._bucket_start(timestamp), Counter())[kind] += 1
+
+    def add_line(self, line):
+        timestamp, kind = parse_server_line(line)
+        if timestamp is not None:
+            self._last_seen = timestamp
+        if kind is not None:
+            self.add(timestamp or self._last_seen, kind)
+
+    def merge(self, other):
+        for start, events in other.buckets.items():
+            self.buckets.setdefault(start, Counter()).update(events)
+        self.undated.update(other.undated)
+
+    @property
+    def totals(self):
+        totals = Counter(self.undated)
+        for events in self.buckets.values():
+            totals.update(events)
+        return totals
+
+    def is_saturated(self, events):
+        return any(events[kind] for kind in SATURATION_EVENTS)
+
+    def timeline(self):
+        """Returns list of (bucket start, `Counter` of events) tuples of
+        buckets with events, oldest first."""
+
+        return sorted(self.buckets.items())
+
+    def saturated_periods(self):
+        """Returns list of (start, end, `Counter` of events) tuples of
+        periods made of consecutive saturated buckets."""
+
+        periods = []
+        for start, events in self.timeline():
+            if not self.is_saturated(events):
+                continue
+            if periods and periods[-1][1] == start:
+                periods[-1][1] = start + self.bucket
+                periods[-1][2].update(events)
+            else:
+                periods.append([start, start + self.bucket, Counter(events)])
+        return [tuple(period) for period in periods]
+
+
+def collect_server_health(domain, indices, max_workers=4, bucket=timedelta(minutes=5)):
+    """Returns `ServerHealth` of server logs of `domain` with `indices`
+    and list of logs which could not be read (see `collect_logs`)."""
+
+    return collect_logs(domain, "server", indices, lambda: ServerHealth(bucket=bucket), max_workers=max_workers)
@@ -0,0 +1,31 @@
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Pattern, Tuple
+
+TIMESTAMP_RE: Pattern[bytes] = ...
+UWSGI_TIMESTAMP_RE: Pattern[bytes] = ...
+EVENT_PATTERNS: List[Tuple[str, Pattern[bytes]]] = ...
+EVENT_KINDS: List[str] = ...
+SATURATION_EVENTS: Tuple[str, ...] = ...
+
+def parse_server_line(line: bytes) -> Tuple[Optional[datetime], Optional[str]]: ...
+
+class ServerHealth:
+    bucket: timedelta = ...
+    buckets: Dict[datetime, Counter] = ...
+    undated: Counter = ...
+    _last_seen: Optional[datetime] = ...
+    def __init__(self, bucket: timedelta = ...) -> None: ...
+    def _bucket_start(self, timestamp: datetime) -> datetime: ...
+    def add(self, timestamp: Optional[datetime], kind: str) -> None: ...
+    def add_line(self, line: bytes) -> None: ...
+    def merge(self, other: ServerHealth) -> None: ...
+    @property
+    def totals(self) -> Counter: ...
+    def is_saturated(self, events: Counter) -> bool: ...
+    def timeline(self) -> List[Tuple[datetime, Counter]]: ...
+    def saturated_periods(self) -> List[Tuple[datetime, datetime, Counter]]: ...
+
+def collect_server_health(
+    domain: str, indices: Iterable[int], max_workers: int = ..., bucket: timedelta = ...
+) -> Tuple[ServerHealth, List[Tuple[str, Exception]]]: ...
@@ -0,0 +1,129 @@
+"""Audit of static assets served by webapp workers.
+
+Access log doesn't say whether a request was handled by a static file
+mapping or by the webapp, so requests for asset-like files (css, js,
+images, fonts...) which are not under any of existing static file
+mappings are assumed to be served by Python workers.
+:class:`StaticAudit` groups such requests by their URL prefix (first
+path segment) and :func:`locate_directory` finds local directory
+holding the files, so the prefix can be mapped to it."""
+
+from pathlib import Path
+
+from pythonanywhere_core.base import call_api
+from pythonanywhere_core.exceptions import PythonAnywhereApiException
+
+from pythonanywhere.access_log import ACCESS_LINE_RE
+from pythonanywhere.webapp_logs import collect_logs
+
+ASSET_EXTENSIONS = set(
+    ".css .js .map .json .png .jpg .jpeg .gif .svg .ico .webp .avif "
+    ".woff .woff2 .ttf .eot .otf .mp3 .mp4 .webm .pdf .txt .xml".split()
+)
+MAX_SAMPLES = 5
+
+
+def get_static_file_mappings(webapp):
+    """Returns list of static file mappings (dictionaries with `url` and
+    `path`) of `webapp`.
+
+    :raises PythonAnywhereApiException: if API call fails"""
+
+    result = call_api(f"{webapp.domain_url}static_files/", "get")
+    if not result.ok:
+        raise PythonAnywhereApiException(
+            f"GET static files for {webapp.domain} via API failed, got {result}:{result.text}"
+        )
+    return result.json()
+
+
+def url_prefix(path):
+    """Returns prefix a static file mapping would use for `path` -- its
+    first segment, e.g. `/assets/` for `/assets/css/site.css`, or the path
+    itself for files in the root, e.g. `/favicon.ico`."""
+
+    segment, slash, _ = path.lstrip("/").partition("/")
+    return f"/{segment}{slash}"
+
+
+def is_asset(path):
+    return Path(path).suffix.lower() in ASSET_EXTENSIONS
+
+
+class PrefixStats:
+    """Requests for assets under one URL prefix."""
+
+    def __init__(self):
+        self.requests = 0
+        self.worker_time = 0.0
+        self.samples = []
+
+    def add(self, path, response_time):
+        self.requests += 1
+        self.worker_time += response_time
+        if len(self.samples) < MAX_SAMPLES and path not in self.samples:
+            self.samples.append(path)
+
+    def merge(self, other):
+        self.requests += other.requests
+        self.worker_time += other.worker_time
+        for path in other.samples:
+            if len(self.samples) < MAX_SAMPLES and path not in self.samples:
+                self.samples.append(path)
+
+
+class StaticAudit:
+    """Accumulates successful asset requests not covered by
+    `mapped_urls` (URLs of existing static file mappings) per URL
+    prefix.  Use :method:`StaticAudit.add_line` on every access log
+    line."""
+
+    def __init__(self, mapped_urls=()):
+        self.mapped_urls = tuple(mapped_urls)
+        self.prefixes = {}
+
+    def add_line(self, line):
+        match = ACCESS_LINE_RE.search(line)
+        if match is None or int(match["status"]) >= 400:
+            return
+        path = match["path"].decode(errors="replace").split("?", 1)[0]
+        if not is_asset(path) or path.startswith(self.mapped_urls):
+            return
+        self.prefixes.setdefault(url_prefix(path), PrefixStats()).add(path, float(match["response_time"]))
+
+    def merge(self, other):
+        for prefix, stats in other.prefixes.items():
+            self.prefixes.setdefault(prefix, PrefixStats()).merge(stats)
+
+    def top(self):
+        """Returns list of (prefix, `PrefixStats`) tuples, prefixes taking
+        the most worker time first."""
+
+        return sorted(self.prefixes.items(), key=lambda item: item[1].worker_time, reverse=True)
+
+
+def locate_directory(prefix, samples, root):
+    """Returns local path to map `prefix` to -- `root/<prefix>` or
+    `root/<subdirectory>/<prefix>` holding the most of `samples` (request
+    paths) -- or None when none of them is found."""
+
+    root = Path(root)
+    name = prefix.strip("/")
+    candidates = [root / name]
+    if root.is_dir():
+        candidates.extend(child / name for child in sorted(root.iterdir()) if child.is_dir())
+
+    def found(candidate):
+        if not prefix.endswith("/"):
+            return int(candidate.is_file())
+        return sum((candidate / sample[len(prefix):]).is_file() for sample in samples)
+
+    best = max(candidates, key=found)
+    return best if found(best) else None
+
+
+def collect_static_audit(domain, indices, mapped_urls=(), max_workers=4):
+    """Returns `StaticAudit` of access logs of `domain` with `indices`
+    and list of logs which could not be read (see `collect_logs`)."""
+
+    return collect_logs(domain, "access", indices, lambda: StaticAudit(mapped_urls), max_workers=max_workers)
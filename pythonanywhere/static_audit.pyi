@@ -0,0 +1,32 @@
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Union
+
+from pythonanywhere_core.webapp import Webapp
+
+ASSET_EXTENSIONS: Set[str] = ...
+MAX_SAMPLES: int = ...
+
+def get_static_file_mappings(webapp: Webapp) -> List[Dict[str, Any]]: ...
+def url_prefix(path: str) -> str: ...
+def is_asset(path: str) -> bool: ...
+
+class PrefixStats:
+    requests: int = ...
+    worker_time: float = ...
+    samples: List[str] = ...
+    def __init__(self) -> None: ...
+    def add(self, path: str, response_time: float) -> None: ...
+    def merge(self, other: PrefixStats) -> None: ...
+
+class StaticAudit:
+    mapped_urls: Tuple[str, ...] = ...
+    prefixes: Dict[str, PrefixStats] = ...
+    def __init__(self, mapped_urls: Iterable[str] = ...) -> None: ...
+    def add_line(self, line: bytes) -> None: ...
+    def merge(self, other: StaticAudit) -> None: ...
+    def top(self) -> List[Tuple[str, PrefixStats]]: ...
+
+def locate_directory(prefix: str, samples: List[str], root: Union[Path, str]) -> Optional[Path]: ...
+def collect_static_audit(
+    domain: str, indices: Iterable[int], mapped_urls: Iterable[str] = ..., max_workers: int = ...
+) -> Tuple[StaticAudit, List[Tuple[str, Exception]]]: ...
@@ -6,10 +6,16 @@ import logging
 
 from snakesay import snakesay
 
+from pythonanywhere_core.base import call_api
+from pythonanywhere_core.exceptions import PythonAnywhereApiException
 from pythonanywhere_core.schedule import Schedule
 
+from pythonanywhere.schedule_cache import ScheduleCache
+
 logger = logging.getLogger(name=__name__)
 
+UPDATABLE_SPECS = ("command", "enabled", "interval", "hour", "minute")
+
 
 class Task:
     """Class representing PythonAnywhere scheduled task.
@@ -24,18 +30,45 @@ class Task:
     :method:`Task.create_schedule` on it.
 
     To get an object representing existing task its id is needed. Having a
-    valid id call :classmethod:`Task.from_id` and then execute other
-    actions on the task:
+    valid id call :classmethod:`Task.from_id` (or
+    :classmethod:`Task.to_be_updated` to update the task without fetching
+    its specs) and then execute other actions on the task:
     - to delete the task use :method:`Task.delete_schedule`,
-    - to update the task use :method:`Task.update_schedule`.
+    - to update the task use :method:`Task.update_schedule`,
+    - to extend the task's expiry use :method:`Task.extend_schedule`.
 
     :classmethod:`Task.from_api_specs` is intended to to be called with
     specs returned by API and should not be used with arbitrary specs
     defined by user.
 
     `Task` class is API agnostic meaning all API calls are made using the
-    `pythonanywhere.api.schedule.Schedule` interface via `Task.schedule`
-    attribute."""
+    `pythonanywhere_core.schedule.Schedule` interface via `Task.schedule`
+    class attribute, which is a single client shared by all tasks (and
+    by `TaskList`).  Reads may be served from the opt-in local snapshot
+    kept in `Task.cache` (see `pythonanywhere.schedule_cache`), which is
+    updated by create, update and delete calls.
+
+    Instances are slotted to keep them compact -- specs returned by API
+    which are not listed in `Task.__slots__` are ignored."""
+
+    __slots__ = (
+        "command",
+        "hour",
+        "minute",
+        "interval",
+        "enabled",
+        "task_id",
+        "can_enable",
+        "expiry",
+        "extend_url",
+        "logfile",
+        "printable_time",
+        "url",
+        "user",
+    )
+
+    schedule = Schedule()
+    cache = ScheduleCache()
 
     def __init__(self):
         self.command = None
@@ -51,7 +84,6 @@ class Task:
         self.printable_time = None
         self.url = None
         self.user = None
-        self.schedule = Schedule()
 
     def __repr__(self):
         enabled = "enabled" if self.enabled else "disabled"
@@ -64,15 +96,36 @@ class Task:
 
         return f"{self.interval.title()} task{num} '{self.command}' {status}"
 
+    @property
+    def logfile_path(self):
+        """Path of the current logfile as seen in user's filesystem
+        (`logfile` spec returned by API is a web UI url path)."""
+
+        if self.logfile is None:
+            return None
+        return self.logfile.replace(f"/user/{self.user}/files", "")
+
     @classmethod
     def from_id(cls, task_id):
         """Creates representation of existing scheduled task by id.
 
+        When local schedule cache is enabled specs are taken from the
+        cached tasks list (fetching and caching the whole list when
+        snapshot is stale), so many consecutive calls cost one API call.
+
         :param task_id: existing task id as integer
         :returns: `Task` instance with actual specs."""
 
         task = cls()
-        specs = task.schedule.get_specs(task_id)
+        specs = None
+        if cls.cache.enabled:
+            specs = cls.cache.get_specs(task_id)
+            if specs is None:
+                specs_list = cls.schedule.get_list()
+                cls.cache.store(specs_list)
+                specs = next((s for s in specs_list if s.get("id") == task_id), None)
+        if specs is None:
+            specs = task.schedule.get_specs(task_id)
         task.update_specs(specs)
         return task
 
@@ -102,6 +155,21 @@ class Task:
         task.enabled = not disabled
         return task
 
+    @classmethod
+    def to_be_updated(cls, task_id):
+        """Creates representation of existing scheduled task knowing only
+        its id, so it can be updated without fetching its specs first.
+
+        To update the task call :method:`Task.update_schedule` on it --
+        task's specs are set from the update response.
+
+        :param task_id: existing task id as integer
+        :returns: `Task` instance ready to be updated"""
+
+        task = cls()
+        task.task_id = task_id
+        return task
+
     @classmethod
     def from_api_specs(cls, specs):
         """Create object representing scheduled task with specs returned by API.
@@ -126,7 +194,8 @@ class Task:
         for attr, value in specs.items():
             if attr == "id":
                 attr = "task_id"
-            setattr(self, attr, value)
+            if attr in self.__slots__:
+                setattr(self, attr, value)
 
     def create_schedule(self):
         """Creates new scheduled task.
@@ -142,7 +211,9 @@ class Task:
         if self.hour is not None:
             params["hour"] = self.hour
 
-        self.update_specs(self.schedule.create(params))
+        new_specs = self.schedule.create(params)
+        self.cache.patch(new_specs)
+        self.update_specs(new_specs)
 
         mode = "will" if self.enabled else "may be enabled to"
         msg = (
@@ -163,65 +234,91 @@ class Task:
         *Note*: use this method on `Task.from_id` instance."""
 
         if self.schedule.delete(self.task_id):
+            self.cache.remove(self.task_id)
             logger.info(snakesay(f"Task {self.task_id} deleted!"))
 
+    def extend_schedule(self):
+        """Extends expiry of existing task using its `extend_url`.
+
+        *Note*: use this method on `Task.from_id` or `TaskList` instance.
+
+        :returns: new expiry date"""
+
+        site = self.schedule.base_url.split("/api/")[0]
+        result = call_api(f"{site}{self.extend_url}", "POST")
+        if not result.ok:
+            raise PythonAnywhereApiException(
+                f"Could not extend task {self.task_id}. Got {result}: {result.text}"
+            )
+
+        new_specs = self.schedule.get_specs(self.task_id)
+        self.cache.patch(new_specs)
+        old_expiry = self.expiry
+        self.update_specs(new_specs)
+        logger.info(f"Task {self.task_id} extended: expiry from '{old_expiry}' to '{self.expiry}'")
+        return self.expiry
+
     def update_schedule(self, params, *, porcelain=False):
         """Updates existing task using `params`.
 
-        *Note*: use this method on `Task.from_id` instance.
+        *Note*: use this method on `Task.from_id` or `Task.to_be_updated`
+        instance.
 
         `params` should be one at least one of: command, enabled, interval,
-        hour, minute. `interval` takes precedence over `hour` meaning that
-        `hour` param will be ignored if `interval` is set to 'hourly'.
+        hour, minute. `hour` param will be ignored if `interval` is (or
+        is set to) 'hourly'.
+
+        When current specs of the task are known (`Task.from_id`) only
+        params which differ from them are sent and nothing is sent when
+        there is nothing to change.  Otherwise (`Task.to_be_updated`) all
+        params are sent.  Reported changes are computed from the specs
+        returned by API, so the update takes a single request.
 
         :param params: dictionary of specs to update
         :param porcelain: when True don't use `snakesay` in stdout messages
             (defaults to False)"""
 
-        specs = {
-            "command": self.command,
-            "enabled": self.enabled,
-            "interval": self.interval,
-            "hour": self.hour,
-            "minute": self.minute,
+        specs_known = self.interval is not None
+        interval = params.get("interval", self.interval)
+        patch = {
+            key: value
+            for key, value in params.items()
+            if key in UPDATABLE_SPECS
+            and not (key == "hour" and interval == "hourly")
+            and not (specs_known and getattr(self, key) == value)
         }
 
-        specs.update(params)
-
-        if (
-            (specs["interval"] != "daily")
-            or (params.get("interval") == "daily" and self.hour)
-            or (params.get("hour") == self.hour)
-        ):
-            specs.pop("hour")
+        if not patch:
+            msg = "Nothing to update!"
+            logger.warning(msg if porcelain else snakesay(msg))
+            return
 
-        if params.get("minute") == self.minute:
-            specs.pop("minute")
-
-        new_specs = self.schedule.update(self.task_id, specs)
-
-        diff = {
-            key: (getattr(self, key), new_specs[key])
-            for key in specs
-            if getattr(self, key) != new_specs[key]
-        }
+        new_specs = self.schedule.update(self.task_id, patch)
+        self.cache.patch(new_specs)
 
         def make_spec_str(key, old_spec, new_spec):
+            if not specs_known:
+                return f"<{key}> to '{new_spec}'"
             return f"<{key}> from '{old_spec}' to '{new_spec}'"
 
-        updated = [make_spec_str(key, val[0], val[1]) for key, val in diff.items()]
+        keys = UPDATABLE_SPECS if specs_known else [key for key in UPDATABLE_SPECS if key in patch]
+        updated = [
+            make_spec_str(key, getattr(self, key), new_specs.get(key))
+            for key in keys
+            if not specs_known or getattr(self, key) != new_specs.get(key)
+        ]
 
         def make_msg(join_with):
             fill = " " if join_with == ", " else join_with
             intro = f"Task {self.task_id} updated:{fill}"
             return f"{intro}{join_with.join(updated)}"
 
+        self.update_specs(new_specs)
         if updated:
             if porcelain:
                 logger.info(make_msg(join_with="\n"))
             else:
                 logger.info(snakesay(make_msg(join_with=", ")))
-            self.update_specs(new_specs)
         else:
             logger.warning(snakesay("Nothing to update!"))
 
@@ -230,7 +327,26 @@ class TaskList:
     """Creates user's tasks representation using `Task` class and specs
     returned by API.
 
-    Tasks are stored in `TaskList.tasks` variable."""
+    Specs are fetched once with the client shared with `Task` (or taken
+    from a fresh local snapshot when schedule cache is enabled); `Task`
+    instances are built from them on first access to `TaskList.tasks`."""
 
     def __init__(self):
-        self.tasks = [Task.from_api_specs(specs) for specs in Schedule().get_list()]
+        specs = Task.cache.load()
+        if specs is None:
+            specs = Task.schedule.get_list()
+            Task.cache.store(specs)
+        self.specs = specs
+        self._tasks = None
+
+    @property
+    def tasks(self):
+        if self._tasks is None:
+            self._tasks = [Task.from_api_specs(specs) for specs in self.specs]
+        return self._tasks
+
+    def __iter__(self):
+        return iter(self.tasks)
+
+    def __len__(self):
+        return len(self.specs)
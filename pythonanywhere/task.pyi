@@ -1,12 +1,17 @@
-from typing import List, Optional, Type, TypeVar, Union
+from typing import ClassVar, Iterator, List, Optional, Tuple, Type, TypeVar, Union
 
 from typing_extensions import Literal
 
-from pythonanywhere.api.schedule import Schedule
+from pythonanywhere_core.schedule import Schedule
+
+from pythonanywhere.schedule_cache import ScheduleCache
 
 T = TypeVar("T", bound="Task")
 
+UPDATABLE_SPECS: Tuple[str, ...] = ...
+
 class Task:
+    __slots__: Tuple[str, ...]
     command: Optional[str] = ...
     hour: Optional[int] = ...
     minute: Optional[int] = ...
@@ -20,19 +25,25 @@ class Task:
     printable_time: Optional[str] = ...
     url: Optional[str] = ...
     user: Optional[str] = ...
-    schedule: Schedule = ...
+    schedule: ClassVar[Schedule] = ...
+    cache: ClassVar[ScheduleCache] = ...
     def __init__(self) -> None: ...
     def __repr__(self) -> str: ...
+    @property
+    def logfile_path(self) -> Optional[str]: ...
     @classmethod
     def from_id(cls: Type[T], task_id: int) -> T: ...
     @classmethod
     def to_be_created(
-        cls: Type[T], *, command: str, minute: int, hour: Optional[int], disabled: bool,
+        cls: Type[T], *, command: str, minute: int, hour: Optional[int] = ..., disabled: bool = ...,
     ) -> T: ...
     @classmethod
+    def to_be_updated(cls: Type[T], task_id: int) -> T: ...
+    @classmethod
     def from_api_specs(cls: Type[T], specs: dict) -> T: ...
     def create_schedule(self) -> None: ...
     def delete_schedule(self) -> None: ...
+    def extend_schedule(self) -> Optional[str]: ...
     def update_specs(self, specs: dict) -> None: ...
     def update_schedule(self, params: dict, *, porcelain: bool) -> None:
         def make_spec_str(
@@ -42,5 +53,10 @@ class Task:
         ...
 
 class TaskList:
-    tasks = List[Task]
+    specs: List[dict] = ...
+    _tasks: Optional[List[Task]] = ...
     def __init__(self) -> None: ...
+    @property
+    def tasks(self) -> List[Task]: ...
+    def __iter__(self) -> Iterator[Task]: ...
+    def __len__(self) -> int: ...
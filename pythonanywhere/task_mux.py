@@ -0,0 +1,135 @@
+"""Runs many sub-jobs from a single scheduled task.
+
+Jobs are kept in a JSON job table in PythonAnywhere storage (see
+`JobTable`) and dispatched by one hourly scheduled task running this
+module, e.g.:
+
+    python3.10 -m pythonanywhere.task_mux /home/username/pa_mux.json --workers=4
+
+Usage:
+  task_mux.py <table> [--workers=<n>]
+
+Options:
+  --workers=<n>     Maximum number of sub-jobs run concurrently [default: 4]
+
+Every due job (a job with no hours defined or with current hour among its
+hours) is run in a shell and its output goes to a separate log file in the
+table's log directory, ending with a completion line in the same format as
+scheduled tasks logs."""
+
+import json
+import os
+import re
+import shlex
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+from docopt import docopt
+
+from pythonanywhere.utils import run_concurrently, server_python
+
+DEFAULT_LOG_DIR = "/var/log"
+DISPATCHER_MODULE = "pythonanywhere.task_mux"
+
+
+class JobTable:
+    """Class representing JSON job table of the task multiplexer.
+
+    Table is a json file with "jobs" list (every job has "name",
+    "command" and optional "hours" list) and optional "log_dir"."""
+
+    def __init__(self, path):
+        self.path = Path(path).expanduser()
+        self.jobs = []
+        self.log_dir = DEFAULT_LOG_DIR
+        if self.path.exists():
+            data = json.loads(self.path.read_text())
+            self.jobs = data.get("jobs", [])
+            self.log_dir = data.get("log_dir", DEFAULT_LOG_DIR)
+
+    def save(self):
+        self.path.write_text(json.dumps({"log_dir": self.log_dir, "jobs": self.jobs}, indent=2))
+
+    def add(self, name, command, hours=None):
+        """Adds job (replacing existing job with the same `name`)."""
+
+        for hour in hours or []:
+            if not 0 <= hour <= 23:
+                raise ValueError("Hour has to be in 0..23")
+        self.remove(name)
+        job = {"name": name, "command": command}
+        if hours:
+            job["hours"] = sorted(set(hours))
+        self.jobs.append(job)
+
+    def remove(self, name):
+        """Removes job by `name`, returns True when it existed."""
+
+        jobs = [job for job in self.jobs if job["name"] != name]
+        removed = len(jobs) != len(self.jobs)
+        self.jobs = jobs
+        return removed
+
+    def due(self, now=None):
+        """Returns jobs which should be run at `now` (defaults to current time)."""
+
+        hour = (now or datetime.now()).hour
+        return [job for job in self.jobs if not job.get("hours") or hour in job["hours"]]
+
+    def log_path(self, job):
+        slug = re.sub(r"[^A-Za-z0-9_.-]+", "_", job["name"])
+        return Path(self.log_dir).expanduser() / f"mux-{slug}.log"
+
+
+def dispatcher_command(table_path, workers=4, python=None):
+    """Returns command of the scheduled task running jobs from table at
+    `table_path` with `python` interpreter on PythonAnywhere (see
+    `server_python`).  Table is read by the task, so `table_path` has to
+    be a path on PythonAnywhere."""
+
+    table_path = str(Path(table_path).expanduser().absolute())
+    return (
+        f"{shlex.quote(server_python(python))} -m {DISPATCHER_MODULE} "
+        f"{shlex.quote(table_path)} --workers={workers}"
+    )
+
+
+def run_job(job, log_path):
+    """Runs `job` appending its output and completion line to `log_path`,
+    returns its return code."""
+
+    with open(log_path, "ab") as log:
+        started = time.perf_counter()
+        returncode = subprocess.call(job["command"], shell=True, stdout=log, stderr=subprocess.STDOUT)
+        took = time.perf_counter() - started
+        log.write(
+            f"\n{datetime.now():%Y-%m-%d %H:%M:%S} -- Completed task, took {took:.2f} seconds, "
+            f"return code was {returncode}.\n".encode()
+        )
+    return returncode
+
+
+def dispatch(table, workers=4, now=None):
+    """Runs due jobs of `table` concurrently (at most `workers` at once).
+
+    :returns: list of (job name, return code or exception) tuples"""
+
+    os.makedirs(Path(table.log_dir).expanduser(), exist_ok=True)
+    results = run_concurrently(lambda job: run_job(job, table.log_path(job)), table.due(now), max_workers=workers)
+    return [(job["name"], returncode if error is None else error) for job, returncode, error in results]
+
+
+def main(argv=None):
+    arguments = docopt(__doc__, argv=argv)
+    results = dispatch(JobTable(arguments["<table>"]), workers=int(arguments["--workers"]))
+    for name, result in results:
+        status = f"return code was {result}" if isinstance(result, int) else f"could not be run: {result}"
+        print(f"{datetime.now():%Y-%m-%d %H:%M:%S} -- Job {name} {status}.")
+    return 0 if all(result == 0 for _, result in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
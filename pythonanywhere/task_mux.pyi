@@ -0,0 +1,24 @@
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional, Tuple, Union
+
+DEFAULT_LOG_DIR: str = ...
+DISPATCHER_MODULE: str = ...
+
+class JobTable:
+    path: Path = ...
+    jobs: List[dict] = ...
+    log_dir: str = ...
+    def __init__(self, path: Union[str, Path]) -> None: ...
+    def save(self) -> None: ...
+    def add(self, name: str, command: str, hours: Optional[List[int]] = ...) -> None: ...
+    def remove(self, name: str) -> bool: ...
+    def due(self, now: Optional[datetime] = ...) -> List[dict]: ...
+    def log_path(self, job: dict) -> Path: ...
+
+def dispatcher_command(table_path: Union[str, Path], workers: int = ..., python: Optional[str] = ...) -> str: ...
+def run_job(job: dict, log_path: Union[str, Path]) -> int: ...
+def dispatch(
+    table: JobTable, workers: int = ..., now: Optional[datetime] = ...
+) -> List[Tuple[str, Union[int, Exception]]]: ...
+def main(argv: Optional[List[str]] = ...) -> int: ...
@@ -0,0 +1,219 @@
+"""Runs scheduled task's command recording its resource usage and/or
+guarding it against overlapping runs.
+
+Scheduled task's command wrapped with `wrap_command` is executed by this
+module, e.g.:
+
+    python3.10 -m pythonanywhere.task_runner --metrics=/var/log/tasklog-metrics-1a2b.jsonl -- 'echo foo'
+
+Usage:
+  task_runner.py [--metrics=<path>] [--lock=<path>] [--on-overlap=<policy>] [--] <command>
+
+Options:
+  --metrics=<path>      Appends JSON line with wall time, CPU user/system time,
+                        peak RSS, I/O counters and exit code of the run to <path>
+  --lock=<path>         Lock file preventing overlapping runs of the command
+  --on-overlap=<policy> What to do when previous run holds the lock: skip this
+                        run or queue it (at most one run waits) [default: skip]
+
+Command output is passed through (so it ends up in the task's log) and the
+runner exits with the command's return code (0 when the run is skipped)."""
+
+import fcntl
+import hashlib
+import json
+import os
+import shlex
+import subprocess
+import sys
+from contextlib import contextmanager
+from datetime import datetime
+
+from docopt import DocoptExit, docopt
+
+from pythonanywhere.resource_profile import RunProfile, profile_command, summarize
+from pythonanywhere.utils import server_python
+
+RUNNER_MODULE = "pythonanywhere.task_runner"
+METRICS_DIR = "/var/log"
+LOCKS_DIR = "~/.cache/pythonanywhere"
+SAMPLING_INTERVAL = 0.5
+OVERLAP_POLICIES = ("skip", "queue")
+
+
+def _digest(command):
+    return hashlib.sha1(command.encode()).hexdigest()[:10]
+
+
+def default_metrics_path(command):
+    """Returns path of metrics file for `command` next to task logs."""
+
+    return f"{METRICS_DIR}/tasklog-metrics-{_digest(command)}.jsonl"
+
+
+def default_lock_path(command):
+    """Returns path of lock file for `command` (`~` is expanded by the
+    runner, so it's the home directory of the task's owner)."""
+
+    return f"{LOCKS_DIR}/tasklock-{_digest(command)}.lock"
+
+
+def unwrap_command(command):
+    """Returns tuple of original command and runner options dictionary
+    (e.g. {"--metrics": "/var/log/..."}) for `command` wrapped with
+    `wrap_command` or (`command`, {}) for any other command."""
+
+    try:
+        tokens = shlex.split(command)
+    except ValueError:
+        return command, {}
+    if tokens[1:3] != ["-m", RUNNER_MODULE]:
+        return command, {}
+    try:
+        arguments = docopt(__doc__, argv=tokens[3:])
+    except DocoptExit:
+        return command, {}
+    options = {
+        key: value for key, value in arguments.items() if key.startswith("--") and key != "--" and value
+    }
+    if "--lock" not in options:
+        options.pop("--on-overlap", None)
+    return arguments["<command>"], options
+
+
+def wrap_command(command, *, metrics=None, lock=None, on_overlap=None, python=None):
+    """Returns `command` wrapped to be run by the task runner with
+    `python` interpreter on PythonAnywhere (see `server_python`).  Already
+    wrapped commands are re-wrapped keeping their options unless they're
+    overridden.  Command which would be run without any runner options is
+    returned unwrapped.
+
+    :param command: shell command of the task
+    :param metrics: path of metrics file; True for `default_metrics_path`
+    :param lock: path of lock file; True for `default_lock_path`
+    :param on_overlap: overlap policy, one of `OVERLAP_POLICIES`
+    :param python: interpreter on PythonAnywhere, e.g. `python3.10`"""
+
+    command, options = unwrap_command(command)
+    if metrics is True:
+        metrics = default_metrics_path(command)
+    if metrics:
+        options["--metrics"] = metrics
+    if lock is True:
+        lock = default_lock_path(command)
+    if lock:
+        options["--lock"] = lock
+    if on_overlap:
+        if on_overlap not in OVERLAP_POLICIES:
+            raise ValueError(f"Overlap policy has to be one of: {', '.join(OVERLAP_POLICIES)}")
+        options["--on-overlap"] = on_overlap
+    if "--lock" not in options:
+        options.pop("--on-overlap", None)
+    if not options:
+        return command
+
+    args = [shlex.quote(server_python(python)), "-m", RUNNER_MODULE]
+    args.extend(f"{key}={shlex.quote(value)}" for key, value in sorted(options.items()))
+    args.extend(["--", shlex.quote(command)])
+    return " ".join(args)
+
+
+def read_metrics(lines):
+    """Returns list of `RunProfile` instances parsed from metrics `lines`
+    (str or bytes), skipping lines which are not valid records."""
+
+    profiles = []
+    for line in lines:
+        try:
+            record = json.loads(line)
+            profiles.append(RunProfile(**{field: record[field] for field in RunProfile._fields}))
+        except (ValueError, TypeError, KeyError):
+            continue
+    return profiles
+
+
+def aggregate_metrics(profiles):
+    """Returns summary of `profiles` as returned by
+    `resource_profile.summarize` extended with number of runs and
+    failures, or None when there are no profiles."""
+
+    if not profiles:
+        return None
+    summary = summarize(profiles)
+    summary["runs"] = len(profiles)
+    summary["failures"] = sum(1 for profile in profiles if profile.returncode != 0)
+    return summary
+
+
+def _log(message):
+    print(f"{datetime.now():%Y-%m-%d %H:%M:%S} -- {message}", flush=True)
+
+
+def _try_lock(f, blocking=False):
+    try:
+        fcntl.flock(f, fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+        return True
+    except BlockingIOError:
+        return False
+
+
+@contextmanager
+def overlap_guard(lock_path, policy="skip"):
+    """Context manager yielding True when the run may proceed (lock is
+    held until the context exits) or False when it should be skipped.
+
+    With "skip" policy run is skipped when lock is held by another run,
+    with "queue" policy run waits for the lock unless another run is
+    already waiting (then it's skipped)."""
+
+    path = os.path.expanduser(lock_path)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "a+") as lock, open(f"{path}.queue", "a+") as queue:
+        if not _try_lock(lock):
+            lock.seek(0)
+            holder = lock.read().strip() or "unknown"
+            if policy != "queue" or not _try_lock(queue):
+                _log(f"Skipped run, previous run (pid {holder}) is still active.")
+                yield False
+                return
+            _log(f"Waiting for previous run (pid {holder}) to finish.")
+            _try_lock(lock, blocking=True)
+            fcntl.flock(queue, fcntl.LOCK_UN)
+        lock.seek(0)
+        lock.truncate()
+        lock.write(str(os.getpid()))
+        lock.flush()
+        yield True
+
+
+def run(command, metrics=None, lock=None, on_overlap="skip"):
+    if lock:
+        with overlap_guard(lock, on_overlap) as may_run:
+            return run(command, metrics=metrics) if may_run else 0
+
+    if not metrics:
+        return subprocess.call(command, shell=True)
+
+    started = datetime.now()
+    profile = profile_command(command, interval=SAMPLING_INTERVAL)
+    record = {"started": started.isoformat(timespec="seconds"), **profile._asdict()}
+    try:
+        with open(metrics, "a") as f:
+            f.write(json.dumps(record) + "\n")
+    except OSError as e:
+        print(f"Could not write metrics to {metrics}: {e}", file=sys.stderr)
+    return profile.returncode
+
+
+def main(argv=None):
+    arguments = docopt(__doc__, argv=argv)
+    return run(
+        arguments["<command>"],
+        metrics=arguments["--metrics"],
+        lock=arguments["--lock"],
+        on_overlap=arguments["--on-overlap"],
+    )
+
+
+if __name__ == "__main__":
+    sys.exit(main())
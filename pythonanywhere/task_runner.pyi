@@ -0,0 +1,32 @@
+from typing import IO, ContextManager, Dict, Iterable, List, Optional, Tuple, Union
+
+from pythonanywhere.resource_profile import RunProfile
+
+RUNNER_MODULE: str = ...
+METRICS_DIR: str = ...
+LOCKS_DIR: str = ...
+SAMPLING_INTERVAL: float = ...
+OVERLAP_POLICIES: Tuple[str, ...] = ...
+
+def _digest(command: str) -> str: ...
+
+def default_metrics_path(command: str) -> str: ...
+def default_lock_path(command: str) -> str: ...
+def unwrap_command(command: str) -> Tuple[str, Dict[str, str]]: ...
+def wrap_command(
+    command: str,
+    *,
+    metrics: Optional[Union[str, bool]] = ...,
+    lock: Optional[Union[str, bool]] = ...,
+    on_overlap: Optional[str] = ...,
+    python: Optional[str] = ...,
+) -> str: ...
+def read_metrics(lines: Iterable[Union[str, bytes]]) -> List[RunProfile]: ...
+def aggregate_metrics(profiles: List[RunProfile]) -> Optional[dict]: ...
+def _log(message: str) -> None: ...
+def _try_lock(f: IO, blocking: bool = ...) -> bool: ...
+def overlap_guard(lock_path: str, policy: str = ...) -> ContextManager[bool]: ...
+def run(
+    command: str, metrics: Optional[str] = ..., lock: Optional[str] = ..., on_overlap: str = ...
+) -> int: ...
+def main(argv: Optional[List[str]] = ...) -> int: ...
@@ -0,0 +1,123 @@
+"""Run statistics of scheduled tasks collected from their logfiles.
+
+Every run of a scheduled task ends with a completion record in the task's
+logfile, e.g.:
+
+    2024-03-01 16:00:05 -- Completed task, took 4.00 seconds, return code was 0.
+
+`TaskRunStats` accumulates such records (parsed with
+:func:`parse_completion`) and :func:`collect_task_stats` builds them for
+many tasks concurrently, streaming their logfiles line by line."""
+
+import math
+import re
+from datetime import datetime
+
+from pythonanywhere.logs import RemoteLog
+from pythonanywhere.utils import run_concurrently
+
+COMPLETION_RE = re.compile(
+    rb"^(?P<timestamp>\d{4}-\d\d-\d\d \d\d:\d\d:\d\d) -- Completed task, "
+    rb"took (?P<duration>[\d.]+) seconds, return code was (?P<code>-?\d+)\."
+)
+
+
+def parse_completion(line):
+    """Returns (timestamp, duration, return code) tuple parsed from log
+    `line` (bytes) or None when line is not a completion record."""
+
+    match = COMPLETION_RE.match(line)
+    if match is None:
+        return None
+    timestamp = datetime.strptime(match["timestamp"].decode(), "%Y-%m-%d %H:%M:%S")
+    return timestamp, float(match["duration"]), int(match["code"])
+
+
+def percentile(sorted_values, fraction):
+    """Returns nearest-rank percentile of already sorted values."""
+
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(fraction * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+class TaskRunStats:
+    """Accumulates completion records of a single task.
+
+    Use :method:`TaskRunStats.add_line` on every log line and read
+    results from properties afterwards."""
+
+    def __init__(self, task):
+        self.task = task
+        self.durations = []
+        self.failures = 0
+        self.first_run = None
+        self.last_run = None
+
+    def add_line(self, line):
+        record = parse_completion(line)
+        if record is None:
+            return
+        timestamp, duration, code = record
+        self.durations.append(duration)
+        if code != 0:
+            self.failures += 1
+        self.first_run = self.first_run or timestamp
+        self.last_run = timestamp
+
+    @property
+    def runs(self):
+        return len(self.durations)
+
+    @property
+    def failure_rate(self):
+        return self.failures / self.runs if self.runs else None
+
+    @property
+    def total(self):
+        return sum(self.durations)
+
+    @property
+    def p50(self):
+        return percentile(sorted(self.durations), 0.5)
+
+    @property
+    def p95(self):
+        return percentile(sorted(self.durations), 0.95)
+
+    @property
+    def max(self):
+        return max(self.durations, default=None)
+
+    @property
+    def trend(self):
+        """Relative change of mean duration between the older and the
+        newer half of runs (e.g. 0.25 means runs got 25% slower), None
+        when there are fewer than 4 runs."""
+
+        if self.runs < 4:
+            return None
+        half = self.runs // 2
+        older = sum(self.durations[:half]) / half
+        newer = sum(self.durations[-half:]) / half
+        if not older:
+            return None
+        return newer / older - 1
+
+
+def collect_task_stats(tasks, max_workers=8):
+    """Streams logfiles of `tasks` concurrently and returns list of
+    (`TaskRunStats`, exception) tuples in the order of `tasks`."""
+
+    def collect(task):
+        stats = TaskRunStats(task)
+        if task.logfile_path:
+            for line in RemoteLog(task.logfile_path).iter_lines():
+                stats.add_line(line)
+        return stats
+
+    return [
+        (stats if error is None else TaskRunStats(task), error)
+        for task, stats, error in run_concurrently(collect, tasks, max_workers=max_workers)
+    ]
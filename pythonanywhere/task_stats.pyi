@@ -0,0 +1,36 @@
+from datetime import datetime
+from typing import Iterable, List, Optional, Pattern, Sequence, Tuple
+
+from pythonanywhere.task import Task
+
+COMPLETION_RE: Pattern[bytes] = ...
+
+def parse_completion(line: bytes) -> Optional[Tuple[datetime, float, int]]: ...
+def percentile(sorted_values: Sequence[float], fraction: float) -> Optional[float]: ...
+
+class TaskRunStats:
+    task: Task = ...
+    durations: List[float] = ...
+    failures: int = ...
+    first_run: Optional[datetime] = ...
+    last_run: Optional[datetime] = ...
+    def __init__(self, task: Task) -> None: ...
+    def add_line(self, line: bytes) -> None: ...
+    @property
+    def runs(self) -> int: ...
+    @property
+    def failure_rate(self) -> Optional[float]: ...
+    @property
+    def total(self) -> float: ...
+    @property
+    def p50(self) -> Optional[float]: ...
+    @property
+    def p95(self) -> Optional[float]: ...
+    @property
+    def max(self) -> Optional[float]: ...
+    @property
+    def trend(self) -> Optional[float]: ...
+
+def collect_task_stats(
+    tasks: Iterable[Task], max_workers: int = ...
+) -> List[Tuple[TaskRunStats, Optional[Exception]]]: ...
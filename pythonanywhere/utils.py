@@ -1,5 +1,8 @@
 import getpass
 import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 
 
 def ensure_domain(domain):
@@ -11,17 +14,52 @@ def ensure_domain(domain):
         return domain
 
 
-def format_log_deletion_message(domain, log_type, log_index):
-    """Generate message describing log deletion.
+def on_pythonanywhere():
+    """Returns True when running on PythonAnywhere (in a console, task or
+    webapp), where `PYTHONANYWHERE_SITE` environment variable is set."""
 
-    Args:
-        domain: Domain name (e.g., 'www.example.com')
-        log_type: Log type string ('access', 'error', or 'server')
-        log_index: 0 for current log, >0 for archived log
+    return "PYTHONANYWHERE_SITE" in os.environ
 
-    Returns:
-        Formatted message string
-    """
-    if log_index:
-        return f"Deleting old (archive number {log_index}) {log_type} log file for {domain} via API"
-    return f"Deleting current {log_type} log file for {domain} via API"
+
+def server_python(python=None):
+    """Returns interpreter to be put in commands of scheduled tasks, which
+    run on PythonAnywhere, not on the machine running `pa`: `python` when
+    given (e.g. python of a virtualenv on PythonAnywhere), otherwise
+    `python3.X` command matching local Python version, as provided by
+    PythonAnywhere system images."""
+
+    return python or f"python{sys.version_info.major}.{sys.version_info.minor}"
+
+
+def get_cache_dir():
+    """Returns directory for local state kept by `pa` (created if needed).
+
+    Honours `XDG_CACHE_HOME`, defaults to `~/.cache/pythonanywhere`."""
+    cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    cache_dir = Path(cache_home) / "pythonanywhere"
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    return cache_dir
+
+
+def run_concurrently(func, items, max_workers=8):
+    """Calls `func` on every item of `items` using a bounded thread pool.
+
+    Returns list of (item, result, exception) tuples in the order of
+    `items`; `exception` is None when call succeeded, otherwise
+    `result` is None.
+
+    :param func: callable taking single item
+    :param items: iterable of items
+    :param max_workers: maximum number of concurrent calls"""
+
+    def call(item):
+        try:
+            return item, func(item), None
+        except Exception as e:
+            return item, None, e
+
+    items = list(items)
+    if not items:
+        return []
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(items)))) as executor:
+        return list(executor.map(call, items))
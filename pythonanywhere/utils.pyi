@@ -1,3 +1,17 @@
+from pathlib import Path
+from typing import Any, Callable, Iterable, List, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
 def ensure_domain(domain: str) -> str: ...
 
-def format_log_deletion_message(domain: str, log_type: str, log_index: int) -> str: ...
+def on_pythonanywhere() -> bool: ...
+
+def server_python(python: Optional[str] = ...) -> str: ...
+
+def get_cache_dir() -> Path: ...
+
+def run_concurrently(
+    func: Callable[[T], R], items: Iterable[T], max_workers: int = ...
+) -> List[Tuple[T, Optional[R], Optional[Exception]]]: ...
@@ -0,0 +1,82 @@
+"""Warm-up requests sent to a webapp right after reload.
+
+First requests after reload hit cold workers (imports, connections...).
+:func:`warm_up` requests every URL concurrently, retrying until it gets a
+response which isn't a server error or `timeout` runs out, and records
+how long the webapp took to get ready and how long the successful
+request took.  Requests are made by `client` -- a callable taking URL and
+request timeout and returning status code -- so a local stand-in server
+or a fake can be used instead of :func:`requests_client`."""
+
+import time
+from collections import namedtuple
+
+import requests
+
+from pythonanywhere.utils import run_concurrently
+
+MIN_REQUEST_TIMEOUT = 0.1
+
+WarmupResult = namedtuple("WarmupResult", ["url", "status", "attempts", "latency", "ready_after", "error"])
+
+
+def requests_client(url, timeout):
+    return requests.get(url, timeout=timeout, allow_redirects=False).status_code
+
+
+def read_urls(path, domain):
+    """Returns URLs listed in `path` file, one per line (blank lines and
+    lines starting with # are skipped); paths starting with / are
+    prefixed with https://`domain`."""
+
+    urls = []
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            urls.append(f"https://{domain}{line}" if line.startswith("/") else line)
+    return urls
+
+
+def warm_up(urls, client=requests_client, timeout=60, interval=1, request_timeout=30, max_workers=8):
+    """Requests `urls` concurrently until each of them responds with
+    status below 500 or `timeout` seconds pass, waiting `interval`
+    seconds between attempts.  Every request times out after
+    `request_timeout` seconds or when `timeout` runs out, whichever comes
+    first.
+
+    :returns: list of `WarmupResult` in the order of `urls`, with
+        `latency` of the successful request and `ready_after` seconds
+        since warm up started (both None when URL didn't get ready)"""
+
+    started = time.monotonic()
+    deadline = started + timeout
+
+    def warm(url):
+        attempts = 0
+        status = error = None
+        while True:
+            attempts += 1
+            sent = time.monotonic()
+            try:
+                status = client(url, min(request_timeout, max(deadline - sent, MIN_REQUEST_TIMEOUT)))
+                error = None
+            except Exception as e:
+                status, error = None, e
+            received = time.monotonic()
+            if status is not None and status < 500:
+                return WarmupResult(url, status, attempts, received - sent, received - started, None)
+            if received + interval > deadline:
+                return WarmupResult(url, status, attempts, None, None, error)
+            time.sleep(interval)
+
+    return [result for _, result, _ in run_concurrently(warm, urls, max_workers=max_workers)]
+
+
+def time_to_first_success(results):
+    """Returns seconds to the first successful warm up request of
+    `results` or None when none of them succeeded."""
+
+    ready = [result.ready_after for result in results if result.ready_after is not None]
+    return min(ready) if ready else None
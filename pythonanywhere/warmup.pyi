@@ -0,0 +1,24 @@
+from pathlib import Path
+from typing import Callable, Iterable, List, NamedTuple, Optional, Union
+
+MIN_REQUEST_TIMEOUT: float = ...
+
+class WarmupResult(NamedTuple):
+    url: str
+    status: Optional[int]
+    attempts: int
+    latency: Optional[float]
+    ready_after: Optional[float]
+    error: Optional[Exception]
+
+def requests_client(url: str, timeout: float) -> int: ...
+def read_urls(path: Union[str, Path], domain: str) -> List[str]: ...
+def warm_up(
+    urls: Iterable[str],
+    client: Callable[[str, float], int] = ...,
+    timeout: float = ...,
+    interval: float = ...,
+    request_timeout: float = ...,
+    max_workers: int = ...,
+) -> List[WarmupResult]: ...
+def time_to_first_success(results: Iterable[WarmupResult]) -> Optional[float]: ...
@@ -0,0 +1,157 @@
+"""Helpers for PythonAnywhere webapp log files (access, error and server
+logs, current and archived ones).
+
+Current log of a webapp is `/var/log/<domain>.<type>.log`, when it's
+rotated it becomes archive number 1 (`<domain>.<type>.log.1`) and older
+archives are gzipped (`<domain>.<type>.log.<index>.gz`)."""
+
+from pythonanywhere_core.webapp import Webapp
+
+from pythonanywhere.logs import RemoteLog
+from pythonanywhere.utils import run_concurrently
+
+LOG_TYPES = ("access", "error", "server")
+LOG_DIR = "/var/log"
+
+
+def log_path(domain, log_type, index=0):
+    """Returns path of `domain`'s log of `log_type` with `index` (0 for
+    current log, 1-9 for archived ones)."""
+
+    path = f"{LOG_DIR}/{domain}.{log_type}.log"
+    if index == 0:
+        return path
+    if index == 1:
+        return f"{path}.1"
+    return f"{path}.{index}.gz"
+
+
+class WebappLog(RemoteLog):
+    """Current log of a webapp read incrementally (see `RemoteLog`).
+
+    When the log is rotated, bytes appended to it after the previous read
+    and before rotation are recovered from archive number 1, so following
+    the log doesn't lose entries around rotation.  Rotation which can't be
+    told from the size of the file (e.g. it happened between invocations
+    and the new log is already bigger than `offset`) is passed as
+    `rotated`.  When `archives` (indices of archived logs, as listed by
+    `Webapp.get_log_info`) are given, they're checked again every time a
+    read finds nothing new, and rotation is assumed when they change."""
+
+    def __init__(self, domain, log_type, offset=0, rotated=False, archives=None):
+        super().__init__(log_path(domain, log_type), offset=offset)
+        self.domain = domain
+        self.log_type = log_type
+        self.archive_path = log_path(domain, log_type, 1)
+        self.pending_rotation = rotated
+        self.archives = None if archives is None else list(archives)
+
+    def current_archives(self):
+        return [index for index in Webapp(self.domain).get_log_info().get(self.log_type, []) if index]
+
+    def _read_rotated(self, max_bytes):
+        previous_offset = self.offset
+        if self.pending_rotation:
+            self.offset = 0
+        chunk = super().read_new(max_bytes)
+        if self.pending_rotation:
+            self.rotated = True
+            self.pending_rotation = False
+        if self.rotated and previous_offset:
+            archive = RemoteLog(self.archive_path, offset=previous_offset)
+            missed = archive.read_new()
+            if not archive.rotated:
+                chunk = missed + chunk
+        return chunk
+
+    def read_new(self, max_bytes=None):
+        chunk = self._read_rotated(max_bytes)
+        if self.archives is None:
+            return chunk
+        if self.rotated:
+            self.archives = self.current_archives()
+        elif not chunk:
+            archives = self.current_archives()
+            if archives != self.archives:
+                self.archives = archives
+                self.pending_rotation = True
+                chunk = self._read_rotated(max_bytes)
+        return chunk
+
+
+def collect_logs(domain, log_type, indices, make_accumulator, max_workers=4):
+    """Streams `domain`'s logs of `log_type` with `indices` (as listed by
+    `Webapp.get_log_info`) concurrently, feeding every line once to an
+    accumulator made by `make_accumulator` -- object with `add_line` and
+    `merge` methods -- one per log.
+
+    :returns: tuple of accumulator with all logs merged and list of
+        (path, exception) tuples of logs which could not be read"""
+
+    def collect(index):
+        accumulator = make_accumulator()
+        for line in RemoteLog(log_path(domain, log_type, index)).iter_lines():
+            accumulator.add_line(line)
+        return accumulator
+
+    total = make_accumulator()
+    errors = []
+    for index, accumulator, error in run_concurrently(collect, indices, max_workers=max_workers):
+        if error is None:
+            total.merge(accumulator)
+        else:
+            errors.append((log_path(domain, log_type, index), error))
+    return total, errors
+
+
+def log_targets(log_info, log_type="all", log_index="all"):
+    """Returns list of (log type, log index) tuples to act on.
+
+    :param log_info: dictionary returned by `Webapp.get_log_info`
+    :param log_type: one of `LOG_TYPES` or "all"
+    :param log_index: 0 for current log, 1-9 for archived one (as int or
+        str) or "all" for every log listed in `log_info`"""
+
+    log_types = LOG_TYPES if log_type == "all" else (log_type,)
+    if log_index == "all":
+        return [(key, int(index)) for key in log_types for index in log_info.get(key, [])]
+    return [(key, int(log_index)) for key in log_types]
+
+
+def delete_webapp_logs(webapp, targets, max_workers=4):
+    """Deletes logs of `webapp` listed in `targets` (see `log_targets`)
+    using a bounded pool of `max_workers` concurrent API calls.
+
+    :returns: dictionary mapping log type to tuple of list of deleted
+        indices and list of (index, exception) tuples of failed ones"""
+
+    results = run_concurrently(lambda target: webapp.delete_log(*target), targets, max_workers=max_workers)
+    summary = {}
+    for (log_type, index), _, error in results:
+        deleted, failed = summary.setdefault(log_type, ([], []))
+        if error is None:
+            deleted.append(index)
+        else:
+            failed.append((index, error))
+    return summary
+
+
+def format_deletion_summary(domain, summary):
+    """Returns one line per log type describing deleted and failed logs of
+    `domain` from `summary` returned by `delete_webapp_logs`."""
+
+    def describe(index):
+        return "current" if index == 0 else str(index)
+
+    lines = []
+    for log_type in sorted(summary, key=lambda key: LOG_TYPES.index(key) if key in LOG_TYPES else 99):
+        deleted, failed = summary[log_type]
+        line = f"{domain} {log_type} logs: deleted {len(deleted)}"
+        if deleted:
+            line += f" ({', '.join(describe(index) for index in sorted(deleted))})"
+        if failed:
+            failed = sorted(failed, key=lambda item: item[0])
+            errors = "; ".join(f"{describe(index)}: {error}" for index, error in failed)
+            line += f", failed {len(failed)} ({errors})"
+        lines.append(line)
+    return "\n".join(lines)
@@ -0,0 +1,43 @@
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, TypeVar, Union
+
+from pythonanywhere_core.webapp import Webapp
+
+from pythonanywhere.logs import RemoteLog
+
+LOG_TYPES: Tuple[str, ...] = ...
+LOG_DIR: str = ...
+
+def log_path(domain: str, log_type: str, index: int = ...) -> str: ...
+
+class WebappLog(RemoteLog):
+    domain: str = ...
+    log_type: str = ...
+    archive_path: str = ...
+    pending_rotation: bool = ...
+    archives: Optional[List[int]] = ...
+    def __init__(
+        self,
+        domain: str,
+        log_type: str,
+        offset: int = ...,
+        rotated: bool = ...,
+        archives: Optional[Sequence[int]] = ...,
+    ) -> None: ...
+    def current_archives(self) -> List[int]: ...
+    def _read_rotated(self, max_bytes: Optional[int]) -> bytes: ...
+    def read_new(self, max_bytes: Optional[int] = ...) -> bytes: ...
+
+DeletionSummary = Dict[str, Tuple[List[int], List[Tuple[int, Exception]]]]
+
+A = TypeVar("A")
+
+def collect_logs(
+    domain: str, log_type: str, indices: Iterable[int], make_accumulator: Callable[[], A], max_workers: int = ...
+) -> Tuple[A, List[Tuple[str, Exception]]]: ...
+def log_targets(
+    log_info: Dict[str, List[int]], log_type: str = ..., log_index: Union[int, str] = ...
+) -> List[Tuple[str, int]]: ...
+def delete_webapp_logs(
+    webapp: Webapp, targets: Sequence[Tuple[str, int]], max_workers: int = ...
+) -> DeletionSummary: ...
+def format_deletion_summary(domain: str, summary: DeletionSummary) -> str: ...
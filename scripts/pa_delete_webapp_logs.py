@@ -5,15 +5,21 @@
 - deletes logs via api
 
 Usage:
-  pa_delete_webapp_logs.py [--domain=<domain>] [--log_type=<log_type>] [--log_index=<log_index>]
+  pa_delete_webapp_logs.py [--domain=<domain>] [--log_type=<log_type>] [--log_index=<log_index>] [--workers=<n>]
 
 Options:
   --domain=<domain>         Domain name, eg www.mydomain.com   [default: your-username.pythonanywhere.com]
   --log_type=<log_type>     Log type, could be access, error, server or all   [default: all]
   --log_index=<log_index>   Log index, 0 for current log, 1-9 for one of archive logs or all [default: all]
+  --workers=<n>             Number of logs deleted concurrently [default: 4]
+
+Logs are deleted concurrently and a summary per log type is printed.
+Exits with status 1 when any of the logs could not be deleted.
 """
 
 import os
+import sys
+
 from docopt import docopt
 from pythonanywhere import __version__
 from pythonanywhere_core.webapp import Webapp
@@ -21,33 +27,32 @@ from pythonanywhere_core.webapp import Webapp
 os.environ["PYTHONANYWHERE_CLIENT"] = f"helper-scripts/{__version__}"
 from snakesay import snakesay
 
-from pythonanywhere.utils import ensure_domain, format_log_deletion_message
+from pythonanywhere.utils import ensure_domain
+from pythonanywhere.webapp_logs import delete_webapp_logs, format_deletion_summary, log_targets
 
 
-def main(domain, log_type, log_index):
+def main(domain, log_type, log_index, workers=4):
     domain = ensure_domain(domain)
     webapp = Webapp(domain)
-    log_types = ["access", "error", "server"]
-    logs = webapp.get_log_info()
-    if log_type == "all" and log_index == "all":
-        for key in log_types:
-            for log in logs[key]:
-                print(snakesay(format_log_deletion_message(domain, key, log)))
-                webapp.delete_log(key, log)
-    elif log_type == "all":
-        for key in log_types:
-            print(snakesay(format_log_deletion_message(domain, key, int(log_index))))
-            webapp.delete_log(key, int(log_index))
-    elif log_index == "all":
-        for i in logs[log_type]:
-            print(snakesay(format_log_deletion_message(domain, log_type, i)))
-            webapp.delete_log(log_type, int(i))
-    else:
-        print(snakesay(format_log_deletion_message(domain, log_type, int(log_index))))
-        webapp.delete_log(log_type, int(log_index))
+    logs = webapp.get_log_info() if log_index == "all" else {}
+    targets = log_targets(logs, log_type, log_index)
+    print(snakesay(f"Deleting {len(targets)} log files for {domain} via API"))
+    summary = delete_webapp_logs(webapp, targets, max_workers=workers)
+    print(format_deletion_summary(domain, summary))
+    if any(failed for _, failed in summary.values()):
+        print(snakesay("Some logs could not be deleted"))
+        return 1
     print(snakesay('All Done!'))
+    return 0
 
 
 if __name__ == '__main__':
     arguments = docopt(__doc__)
-    main(arguments['--domain'], arguments['--log_type'], arguments['--log_index'])
+    sys.exit(
+        main(
+            arguments['--domain'],
+            arguments['--log_type'],
+            arguments['--log_index'],
+            workers=int(arguments['--workers']),
+        )
+    )
@@ -60,11 +60,10 @@ os.environ["PYTHONANYWHERE_CLIENT"] = f"helper-scripts/{__version__}"
 def main(*, task_id, **kwargs):
     logger = get_logger()
 
+    daily = kwargs.pop("daily")
     if kwargs.pop("hourly"):
         kwargs["interval"] = "hourly"
-    if kwargs.pop("daily"):
-        kwargs["hour"] = kwargs["hour"] if kwargs["hour"] else datetime.now().hour
-        kwargs["interval"] = "daily"
+        kwargs["hour"] = None
 
     def parse_opts(*opts):
         candidates = [key for key in opts if kwargs.pop(key, None)]
@@ -78,6 +77,11 @@ def main(*, task_id, **kwargs):
 
     task = get_task_from_id(task_id)
 
+    if daily:
+        if not kwargs["hour"]:
+            kwargs["hour"] = task.hour if task.interval == "daily" else datetime.now().hour
+        kwargs["interval"] = "daily"
+
     params = {key: val for key, val in kwargs.items() if val}
     if enable_opt:
         enabled = {"toggle_enabled": not task.enabled, "disable": False, "enable": True}[
@@ -35,6 +35,7 @@ setup(
     install_requires=[
         "docopt",
         "packaging",
+        "psutil",
         "python-dateutil",
         "pythonanywhere_core==0.2.9",
         "requests",
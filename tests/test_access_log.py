@@ -0,0 +1,143 @@
+import gzip
+import random
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from pythonanywhere.access_log import (
+    OTHER_ENDPOINTS,
+    AccessLogStats,
+    QuantileSketch,
+    collect_access_stats,
+    normalize_endpoint,
+    parse_access_line,
+    parse_timestamp,
+)
+
+
+def access_line(path="/", status=200, response_time=0.1, method="GET"):
+    return (
+        f'1.2.3.4 - - [01/Mar/2024:16:00:05 +0000] "{method} {path} HTTP/1.1" {status} 1234 '
+        f'"https://example.com/" "Mozilla/5.0 (X11)" "1.2.3.4" response-time={response_time}'
+    ).encode()
+
+
+class TestParseAccessLine:
+    def test_parses_request(self):
+        record = parse_access_line(access_line("/items/42?page=2", 404, 0.25, "POST"))
+
+        assert record.timestamp == "01/Mar/2024:16:00:05 +0000"
+        assert record.method == "POST"
+        assert record.endpoint == "/items/:id"
+        assert record.status == 404
+        assert record.response_time == 0.25
+
+    def test_accepts_colon_separated_response_time(self):
+        line = access_line(response_time=0.5).replace(b"response-time=", b"response-time: ")
+
+        assert parse_access_line(line).response_time == 0.5
+
+    def test_returns_none_for_other_lines(self):
+        assert parse_access_line(b"garbage") is None
+
+    def test_parses_timestamp(self):
+        assert parse_timestamp("01/Mar/2024:16:00:05 +0000") == datetime(2024, 3, 1, 16, 0, 5, tzinfo=timezone.utc)
+
+
+@pytest.mark.parametrize(
+    "path, expected",
+    [
+        ("/", "/"),
+        ("/items/42/edit", "/items/:id/edit"),
+        ("/files/deadbeefcafe", "/files/:id"),
+        ("/u/0b7c4a3e-1f2a-4bde-9a7c-2f1e3d4c5b6a", "/u/:id"),
+        ("/static/v2/app.js?x=1", "/static/v2/app.js"),
+    ],
+)
+def test_normalize_endpoint(path, expected):
+    assert normalize_endpoint(path) == expected
+
+
+class TestQuantileSketch:
+    def test_estimates_quantiles_within_accuracy(self):
+        values = [random.uniform(0.001, 5) for _ in range(20000)]
+        sketch = QuantileSketch(accuracy=0.01)
+        for value in values:
+            sketch.add(value)
+
+        values.sort()
+        for fraction in (0.5, 0.95, 0.99):
+            exact = values[int(fraction * (len(values) - 1))]
+            assert sketch.quantile(fraction) == pytest.approx(exact, rel=0.03)
+
+    def test_memory_is_bounded_by_value_range(self):
+        sketch = QuantileSketch()
+        for i in range(100000):
+            sketch.add(0.001 + (i % 1000) / 100)
+
+        assert sketch.count == 100000
+        assert len(sketch.buckets) < 600
+
+    def test_merges_and_handles_zeros_and_empty(self):
+        first, second = QuantileSketch(), QuantileSketch()
+        assert first.quantile(0.5) is None
+        first.add(0)
+        second.add(1.0)
+        second.add(1.0)
+
+        first.merge(second)
+
+        assert first.count == 3
+        assert first.quantile(0) == 0.0
+        assert first.quantile(1) == pytest.approx(1.0, rel=0.01)
+
+
+class TestAccessLogStats:
+    def test_counts_endpoints_statuses_and_skipped_lines(self):
+        stats = AccessLogStats()
+        for line in [
+            access_line("/a", 200, 0.1),
+            access_line("/a", 500, 0.3),
+            access_line("/b/1", 302, 0.2),
+            b"not an access line",
+        ]:
+            stats.add_line(line)
+
+        assert stats.requests == 3
+        assert stats.skipped == 1
+        assert [(endpoint, s.requests, s.errors) for endpoint, s in stats.top()] == [
+            ("/a", 2, 1),
+            ("/b/:id", 1, 0),
+        ]
+        assert stats.status_mix() == {"2xx": 1, "3xx": 1, "5xx": 1}
+
+    def test_caps_number_of_endpoints(self):
+        stats = AccessLogStats(max_endpoints=2)
+        for path in ["/a", "/b", "/c", "/d", "/a"]:
+            stats.add_line(access_line(path))
+
+        assert set(stats.endpoints) == {"/a", "/b", OTHER_ENDPOINTS}
+        assert stats.endpoints[OTHER_ENDPOINTS].requests == 2
+
+
+class TestCollectAccessStats:
+    def test_streams_current_and_gzipped_archived_logs(self, tmp_path, mocker):
+        mocker.patch("pythonanywhere.webapp_logs.LOG_DIR", str(tmp_path))
+        (tmp_path / "foo.com.access.log").write_bytes(access_line("/a") + b"\n")
+        (tmp_path / "foo.com.access.log.1").write_bytes(access_line("/a") + b"\n")
+        with gzip.open(tmp_path / "foo.com.access.log.2.gz", "wb") as f:
+            f.write(access_line("/b") + b"\n" + access_line("/b", 500) + b"\n")
+
+        stats, errors = collect_access_stats("foo.com", [0, 1, 2])
+
+        assert errors == []
+        assert stats.requests == 4
+        assert {endpoint: s.requests for endpoint, s in stats.endpoints.items()} == {"/a": 2, "/b": 2}
+
+    def test_reports_unreadable_logs(self, mocker):
+        mocker.patch("pythonanywhere.webapp_logs.RemoteLog").return_value.iter_lines.side_effect = Exception("nope")
+
+        stats, errors = collect_access_stats("foo.com", [0])
+
+        assert stats.requests == 0
+        assert [(path, str(error)) for path, error in errors] == [("/var/log/foo.com.access.log", "nope")]
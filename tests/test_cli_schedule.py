@@ -1,10 +1,17 @@
 import getpass
+import json
+import subprocess
+from datetime import datetime, timedelta
 from unittest.mock import call, Mock
 
 import pytest
 from typer.testing import CliRunner
 
-from cli.schedule import app, delete_app
+from cli.schedule import app, delete_app, mux_app
+from pythonanywhere.resource_profile import RunProfile
+from pythonanywhere.schedule_snapshot import make_snapshot
+from pythonanywhere.task_mux import dispatcher_command
+from pythonanywhere.task_runner import unwrap_command, wrap_command
 from pythonanywhere.scripts_commons import tabulate_formats
 
 runner = CliRunner()
@@ -75,6 +82,39 @@ class TestSet:
             call.create_schedule()
         ]
 
+    def test_wraps_command_with_profiling_runner(self, mocker):
+        mocker.patch("cli.schedule.get_logger")
+        mock_task_to_be_created = mocker.patch("cli.schedule.Task.to_be_created")
+        mock_wrap = mocker.patch("cli.schedule.wrap_command")
+
+        runner.invoke(app, ["set", "--command", "echo foo", "--minute", "10", "--profile"])
+
+        assert mock_wrap.call_args == call("echo foo", metrics=True, lock=None, on_overlap="skip", python=None)
+        assert mock_task_to_be_created.call_args == call(
+            command=mock_wrap.return_value, hour=None, minute=10, disabled=False
+        )
+
+    def test_wraps_command_with_overlap_guard(self, mocker):
+        mocker.patch("cli.schedule.get_logger")
+        mock_task_to_be_created = mocker.patch("cli.schedule.Task.to_be_created")
+        mock_wrap = mocker.patch("cli.schedule.wrap_command")
+
+        runner.invoke(
+            app, ["set", "-c", "echo foo", "-m", "10", "--no-overlap", "--on-overlap", "queue"]
+        )
+
+        assert mock_wrap.call_args == call("echo foo", metrics=None, lock=True, on_overlap="queue", python=None)
+        assert mock_task_to_be_created.call_args.kwargs["command"] == mock_wrap.return_value
+
+    def test_does_not_wrap_command_by_default(self, mocker):
+        mocker.patch("cli.schedule.get_logger")
+        mocker.patch("cli.schedule.Task.to_be_created")
+        mock_wrap = mocker.patch("cli.schedule.wrap_command")
+
+        runner.invoke(app, ["set", "-c", "echo foo", "-m", "10"])
+
+        assert mock_wrap.call_count == 0
+
     def test_validates_minutes(self):
         result = runner.invoke(app, ["set", "-c", "echo foo", "-h", "8", "-m", "66"])
 
@@ -86,6 +126,49 @@ class TestSet:
         assert "Invalid value" in result.stderr
         assert "66 is not in the range 0<=x<=23" in result.stderr
 
+    def test_creates_tasks_compiled_from_cron_expression(self, mocker):
+        mock_logger = mocker.patch("cli.schedule.get_logger").return_value
+        mock_snakesay = mocker.patch("cli.schedule.snakesay")
+        mock_task_to_be_created = mocker.patch("cli.schedule.Task.to_be_created")
+
+        runner.invoke(app, ["set", "--command", "echo foo", "--cron", "0,30 9 * * *"])
+
+        assert mock_task_to_be_created.call_args_list == [
+            call(command="echo foo", hour=9, minute=0, disabled=False),
+            call(command="echo foo", hour=9, minute=30, disabled=False),
+        ]
+        assert mock_snakesay.call_args_list[0] == call("Cron '0,30 9 * * *' compiled to 2 task(s)")
+        assert mock_logger.info.call_args_list[0] == call(mock_snakesay.return_value)
+
+    def test_reports_dispatcher_fallback_for_cron_expression(self, mocker):
+        mocker.patch("cli.schedule.get_logger")
+        mock_snakesay = mocker.patch("cli.schedule.snakesay")
+        mock_task_to_be_created = mocker.patch("cli.schedule.Task.to_be_created")
+
+        runner.invoke(app, ["set", "-c", "echo foo", "--cron", "*/15 2-5 * * *", "--max-tasks", "3"])
+
+        assert mock_task_to_be_created.call_count == 1
+        assert "-m pythonanywhere.cron" in mock_task_to_be_created.call_args[1]["command"]
+        assert mock_snakesay.call_args_list[0] == call("Cron '*/15 2-5 * * *' compiled to 1 dispatcher task")
+
+    def test_rejects_invalid_cron_expression(self, mocker):
+        mocker.patch("cli.schedule.get_logger")
+        mock_task_to_be_created = mocker.patch("cli.schedule.Task.to_be_created")
+
+        result = runner.invoke(app, ["set", "-c", "echo foo", "--cron", "61 * * * *"])
+
+        assert result.exit_code == 2
+        assert "Invalid cron field '61'" in result.stderr
+        assert mock_task_to_be_created.call_count == 0
+
+    def test_requires_minute_or_cron(self, mocker):
+        mocker.patch("cli.schedule.get_logger")
+
+        result = runner.invoke(app, ["set", "-c", "echo foo", "--hour", "3"])
+
+        assert result.exit_code == 2
+        assert "--minute" in result.stderr
+
     def test_logs_warning_when_create_schedule_raises(self, mocker):
         mock_logger = mocker.patch("cli.schedule.get_logger").return_value
         mock_snakesay = mocker.patch("cli.schedule.snakesay")
@@ -257,6 +340,22 @@ class TestGet:
         assert mock_logger.call_args == call(set_info=True)
         assert mock_logger.return_value.info.call_args == call("10:23")
 
+    def test_prints_json_without_tabulate(self, mocker, task_from_id):
+        mock_tabulate = mocker.patch("cli.schedule.tabulate")
+        mocker.patch("cli.schedule.get_logger")
+
+        result = runner.invoke(app, ["get", "42", "--command", "--hour", "--format", "json"])
+
+        assert json.loads(result.stdout) == {"command": "echo foo", "hour": 10}
+        assert mock_tabulate.call_count == 0
+
+    def test_prints_csv(self, mocker, task_from_id):
+        mocker.patch("cli.schedule.get_logger")
+
+        result = runner.invoke(app, ["get", "42", "-c", "-m", "-f", "csv"])
+
+        assert result.stdout == "command,minute\necho foo,23\n"
+
     def test_complains_when_no_id_provided(self):
         result = runner.invoke(app, ["get", "--command"])
         assert "Missing argument 'id'" in result.stderr
@@ -294,6 +393,36 @@ class TestList:
         assert mock_snakesay.call_args == call("No scheduled tasks")
         assert mock_logger.info.call_args == call(mock_snakesay.return_value)
 
+    @pytest.mark.parametrize("fmt", ["json", "ndjson", "csv"])
+    def test_prints_machine_readable_formats_without_tabulate(self, mocker, task_list, fmt):
+        mock_tabulate = mocker.patch("cli.schedule.tabulate")
+        mock_logger = mocker.patch("cli.schedule.get_logger")
+        for task in task_list.return_value.tasks:
+            task.logfile_path = "/var/log/foo.log"
+
+        result = runner.invoke(app, ["list", "--format", fmt])
+
+        lines = result.stdout.splitlines()
+        if fmt == "json":
+            records = json.loads(result.stdout)
+        elif fmt == "ndjson":
+            records = [json.loads(line) for line in lines]
+        else:
+            assert lines[0] == "task_id,interval,hour,minute,printable_time,enabled,command,expiry,logfile"
+            records = [dict(zip(lines[0].split(","), line.split(","))) for line in lines[1:]]
+        assert [str(record["task_id"]) for record in records] == ["42", "43"]
+        assert [str(record["enabled"]) for record in records] == ["True", "False"]
+        assert records[0]["logfile"] == "/var/log/foo.log"
+        assert mock_tabulate.call_count == 0
+        assert mock_logger.call_count == 0
+
+    def test_prints_empty_json_list_when_no_scheduled_tasks(self, mocker):
+        mocker.patch("cli.schedule.TaskList").return_value.tasks = []
+
+        result = runner.invoke(app, ["list", "--format", "json"])
+
+        assert json.loads(result.stdout) == []
+
     def test_warns_when_wrong_format_provided(self, mocker, task_list):
         mock_tabulate = mocker.patch("cli.schedule.tabulate")
         wrong_format = "excel"
@@ -306,16 +435,104 @@ class TestList:
 
 
 class TestUpdate:
-    def test_enables_task_and_sets_porcelain(self, mocker):
+    def test_enables_task_and_sets_porcelain_without_fetching_specs(self, mocker):
         mock_task_from_id = mocker.patch("cli.schedule.get_task_from_id")
+        mock_to_be_updated = mocker.patch("cli.schedule.Task.to_be_updated")
 
         runner.invoke(app, ["update", "42", "--enable", "--porcelain"])
 
-        assert mock_task_from_id.call_args == call(42)
-        assert mock_task_from_id.return_value.method_calls == [
+        assert mock_task_from_id.call_count == 0
+        assert mock_to_be_updated.call_args == call(42)
+        assert mock_to_be_updated.return_value.method_calls == [
             call.update_schedule({"enabled": True}, porcelain=True)
         ]
 
+    def test_fetches_specs_to_toggle_enabled(self, mocker):
+        mock_task_from_id = mocker.patch("cli.schedule.get_task_from_id")
+        mock_task_from_id.return_value.enabled = True
+
+        runner.invoke(app, ["update", "42", "--toggle-enabled"])
+
+        assert mock_task_from_id.call_args == call(42)
+        assert mock_task_from_id.return_value.update_schedule.call_args == call(
+            {"enabled": False}, porcelain=False
+        )
+
+    def test_keeps_hour_of_daily_task_when_daily_without_hour(self, mocker):
+        mock_task_from_id = mocker.patch("cli.schedule.get_task_from_id")
+        mock_task_from_id.return_value.interval = "daily"
+        mock_task_from_id.return_value.hour = 7
+
+        runner.invoke(app, ["update", "42", "--daily", "--minute", "3"])
+
+        assert mock_task_from_id.return_value.update_schedule.call_args == call(
+            {"minute": 3, "interval": "daily", "hour": 7}, porcelain=False
+        )
+
+    def test_wraps_current_command_with_profiling_runner(self, mocker):
+        mock_task_from_id = mocker.patch("cli.schedule.get_task_from_id")
+        mock_task_from_id.return_value.command = "echo foo"
+        mock_wrap = mocker.patch("cli.schedule.wrap_command")
+
+        runner.invoke(app, ["update", "42", "--profile"])
+
+        assert mock_wrap.call_args == call("echo foo", metrics=True, lock=None, on_overlap=None, python=None)
+        assert mock_task_from_id.return_value.update_schedule.call_args == call(
+            {"command": mock_wrap.return_value}, porcelain=False
+        )
+
+    def test_wraps_new_command_with_overlap_guard(self, mocker):
+        mock_task_from_id = mocker.patch("cli.schedule.get_task_from_id")
+        mock_task_from_id.return_value.command = "echo foo"
+        mock_wrap = mocker.patch("cli.schedule.wrap_command")
+
+        runner.invoke(app, ["update", "42", "--command", "echo bar", "--no-overlap", "--python", "python3.11"])
+
+        assert mock_wrap.call_args == call("echo bar", metrics=None, lock=True, on_overlap=None, python="python3.11")
+        assert mock_task_from_id.return_value.update_schedule.call_args == call(
+            {"command": mock_wrap.return_value}, porcelain=False
+        )
+
+    def test_new_command_keeps_current_wrapper_options(self, mocker):
+        mock_task_from_id = mocker.patch("cli.schedule.get_task_from_id")
+        current = wrap_command("echo foo", metrics=True, lock=True, on_overlap="queue")
+        mock_task_from_id.return_value.command = current
+
+        runner.invoke(app, ["update", "42", "--command", "echo bar"])
+
+        params = mock_task_from_id.return_value.update_schedule.call_args[0][0]
+        assert unwrap_command(params["command"]) == ("echo bar", unwrap_command(current)[1])
+
+    def test_new_command_of_unwrapped_task_is_not_wrapped(self, mocker):
+        mock_task_from_id = mocker.patch("cli.schedule.get_task_from_id")
+        mock_task_from_id.return_value.command = "echo foo"
+
+        runner.invoke(app, ["update", "42", "--command", "echo bar"])
+
+        assert mock_task_from_id.return_value.update_schedule.call_args == call(
+            {"command": "echo bar"}, porcelain=False
+        )
+
+    def test_rejects_on_overlap_without_overlap_guard(self, mocker):
+        mock_task_from_id = mocker.patch("cli.schedule.get_task_from_id")
+        mock_task_from_id.return_value.command = "echo foo"
+
+        result = runner.invoke(app, ["update", "42", "--on-overlap", "queue"])
+
+        assert result.exit_code == 2
+        assert "--no-overlap" in result.output
+        assert mock_task_from_id.return_value.update_schedule.call_count == 0
+
+    def test_changes_on_overlap_of_guarded_task(self, mocker):
+        mock_task_from_id = mocker.patch("cli.schedule.get_task_from_id")
+        current = wrap_command("echo foo", lock=True)
+        mock_task_from_id.return_value.command = current
+
+        runner.invoke(app, ["update", "42", "--on-overlap", "queue"])
+
+        params = mock_task_from_id.return_value.update_schedule.call_args[0][0]
+        assert unwrap_command(params["command"]) == ("echo foo", {**unwrap_command(current)[1], "--on-overlap": "queue"})
+
     def test_turns_off_snakesay(self, mocker):
         mock_logger = mocker.patch("cli.schedule.get_logger")
 
@@ -325,7 +542,7 @@ class TestUpdate:
 
     def test_warns_when_task_update_schedule_raises(self, mocker):
         mock_logger = mocker.patch("cli.schedule.get_logger")
-        mock_task_from_id = mocker.patch("cli.schedule.get_task_from_id")
+        mock_task_from_id = mocker.patch("cli.schedule.Task.to_be_updated")
         mock_task_from_id.return_value.update_schedule.side_effect = Exception("error")
         mock_snake = mocker.patch("cli.schedule.snakesay")
 
@@ -335,7 +552,7 @@ class TestUpdate:
         assert mock_logger.return_value.warning.call_args == call(mock_snake.return_value)
 
     def test_ensures_proper_daily_params(self, mocker):
-        mock_task_from_id = mocker.patch("cli.schedule.get_task_from_id")
+        mock_task_from_id = mocker.patch("cli.schedule.Task.to_be_updated")
 
         result = runner.invoke(app, ["update", "42", "--hourly"])
 
@@ -343,6 +560,24 @@ class TestUpdate:
             {"interval": "hourly"}, porcelain=False
         )
 
+    def test_drops_hour_when_switching_to_hourly(self, mocker):
+        mock_to_be_updated = mocker.patch("cli.schedule.Task.to_be_updated")
+
+        runner.invoke(app, ["update", "42", "--hourly", "--hour", "5", "--minute", "3"])
+
+        assert mock_to_be_updated.return_value.update_schedule.call_args == call(
+            {"minute": 3, "interval": "hourly"}, porcelain=False
+        )
+
+    def test_fetches_current_specs_when_only_hour_given(self, mocker):
+        mock_task_from_id = mocker.patch("cli.schedule.get_task_from_id")
+        mock_to_be_updated = mocker.patch("cli.schedule.Task.to_be_updated")
+
+        runner.invoke(app, ["update", "42", "--hour", "5"])
+
+        assert mock_to_be_updated.call_count == 0
+        assert mock_task_from_id.return_value.update_schedule.call_args == call({"hour": 5}, porcelain=False)
+
     def test_ensures_proper_hourly_params(self, mocker):
         mock_task_from_id = mocker.patch("cli.schedule.get_task_from_id")
         mock_datetime = mocker.patch("cli.schedule.datetime")
@@ -375,3 +610,416 @@ class TestUpdate:
         assert mock_snakesay.call_args == call("Nothing to update!")
         assert mock_logger.warning.call_args == call(mock_snakesay.return_value)
         assert result.exit_code == 1
+
+
+class TestBalance:
+    def make_tasks(self):
+        def task(task_id, minute, hour):
+            return Mock(
+                task_id=task_id,
+                minute=minute,
+                hour=hour,
+                interval="daily",
+                enabled=True,
+                command=f"echo {task_id}",
+            )
+
+        return [task(1, 0, 2), task(2, 0, 2), task(3, 30, 4)]
+
+    def test_reports_hotspots_and_proposal_without_applying(self, mocker):
+        tasks = self.make_tasks()
+        mocker.patch("cli.schedule.TaskList").return_value.tasks = tasks
+        mock_logger = mocker.patch("cli.schedule.get_logger").return_value
+
+        result = runner.invoke(app, ["balance", "--pin", "1"])
+
+        output = "\n".join(str(c.args[0]) for c in mock_logger.info.call_args_list)
+        assert result.exit_code == 0
+        assert "Current peak: 2" in output
+        assert "02:00" in output
+        assert "Proposed peak: 1" in output
+        assert "--apply" in output
+        for task in tasks:
+            assert task.update_schedule.call_count == 0
+
+    def test_applies_proposed_minutes(self, mocker):
+        tasks = self.make_tasks()
+        mocker.patch("cli.schedule.TaskList").return_value.tasks = tasks
+
+        runner.invoke(app, ["balance", "--pin", "1", "--apply"])
+
+        assert tasks[0].update_schedule.call_count == 0
+        assert tasks[1].update_schedule.call_args == call({"minute": 1}, porcelain=True)
+        assert tasks[2].update_schedule.call_count == 0
+
+    def test_says_when_nothing_to_balance(self, mocker):
+        tasks = self.make_tasks()[1:]
+        mocker.patch("cli.schedule.TaskList").return_value.tasks = tasks
+        mock_snakesay = mocker.patch("cli.schedule.snakesay")
+
+        runner.invoke(app, ["balance"])
+
+        assert mock_snakesay.call_args == call("No two tasks start at the same time, nothing to balance")
+
+
+class TestLogs:
+    def test_prints_log_contents(self, mocker, task_from_id):
+        mock_remote_log = mocker.patch("cli.schedule.RemoteLog")
+        mock_remote_log.return_value.read_new.return_value = b"task output\n"
+
+        result = runner.invoke(app, ["logs", "42"])
+
+        assert task_from_id.call_args == call(42)
+        assert mock_remote_log.call_args == call(task_from_id.return_value.logfile_path, offset=0)
+        assert result.stdout == "task output\n"
+
+    def test_resumes_from_and_stores_offset_with_new(self, mocker, task_from_id):
+        mock_remote_log = mocker.patch("cli.schedule.RemoteLog")
+        mock_remote_log.return_value.read_new.return_value = b""
+        mock_offsets = mocker.patch("cli.schedule.LogOffsets").return_value
+        mock_offsets.get.return_value = 100
+        path = task_from_id.return_value.logfile_path
+
+        runner.invoke(app, ["logs", "42", "--new"])
+
+        assert mock_remote_log.call_args == call(path, offset=100)
+        assert mock_offsets.set.call_args == call(path, mock_remote_log.return_value.offset)
+
+    def test_exits_when_task_has_no_logfile(self, mocker, task_from_id):
+        mock_logger = mocker.patch("cli.schedule.get_logger").return_value
+        mock_remote_log = mocker.patch("cli.schedule.RemoteLog")
+        mock_offsets = mocker.patch("cli.schedule.LogOffsets")
+        task_from_id.return_value.logfile_path = None
+
+        result = runner.invoke(app, ["logs", "42", "--new"])
+
+        assert result.exit_code == 1
+        assert "Task 42 has no logfile" in mock_logger.warning.call_args[0][0]
+        assert mock_remote_log.call_count == 0
+        assert mock_offsets.return_value.set.call_count == 0
+
+    def test_follows_log(self, mocker, task_from_id):
+        mock_remote_log = mocker.patch("cli.schedule.RemoteLog").return_value
+        mock_remote_log.read_new.return_value = b"a"
+        mock_remote_log.follow.return_value = iter([b"b", b"c"])
+
+        result = runner.invoke(app, ["logs", "42", "--follow", "--interval", "2", "--max-interval", "8"])
+
+        assert mock_remote_log.follow.call_args == call(min_interval=2, max_interval=8)
+        assert result.stdout == "abc"
+
+
+class TestStats:
+    @pytest.mark.parametrize("fmt", ["json", "ndjson", "csv"])
+    def test_rejects_machine_readable_formats(self, mocker, task_list, fmt):
+        mock_collect = mocker.patch("cli.schedule.collect_task_stats")
+
+        result = runner.invoke(app, ["stats", "-f", fmt])
+
+        assert result.exit_code == 2
+        assert mock_collect.call_count == 0
+
+    def test_logs_table_sorted_by_total_time(self, mocker, task_list):
+        mock_logger = mocker.patch("cli.schedule.get_logger").return_value
+        mock_tabulate = mocker.patch("cli.schedule.tabulate")
+        mock_collect = mocker.patch("cli.schedule.collect_task_stats")
+        light, heavy = [
+            Mock(task=task, runs=2, failure_rate=0.5, total=total, p50=1.0, p95=2.0, max=3.0, trend=None)
+            for task, total in zip(task_list.return_value.tasks, (3.0, 30.0))
+        ]
+        mock_collect.return_value = [(light, None), (heavy, None)]
+
+        runner.invoke(app, ["stats", "--workers", "4"])
+
+        assert mock_collect.call_args == call(task_list.return_value.tasks, max_workers=4)
+        table = mock_tabulate.call_args.args[0]
+        assert [row[0] for row in table] == [43, 42]
+        assert table[0][1:8] == [2, "50%", "30.00", "1.00", "2.00", "3.00", "-"]
+        assert mock_logger.info.call_args == call(mock_tabulate.return_value)
+
+    def test_warns_about_unreadable_logfiles(self, mocker, task_list):
+        mock_logger = mocker.patch("cli.schedule.get_logger").return_value
+        mocker.patch("cli.schedule.tabulate")
+        task = task_list.return_value.tasks[0]
+        stats = Mock(task=task, total=0.0)
+        mocker.patch("cli.schedule.collect_task_stats").return_value = [(stats, Exception("nope"))]
+
+        runner.invoke(app, ["stats"])
+
+        assert mock_logger.warning.call_args == call("Could not read logfile of task 42: nope")
+
+
+class TestRunLocal:
+    def test_profiles_command_of_task(self, mocker, task_from_id):
+        mock_logger = mocker.patch("cli.schedule.get_logger").return_value
+        mock_profile = mocker.patch("cli.schedule.profile_command")
+        mock_profile.return_value = RunProfile(2.0, 1.5, 0.25, 2 ** 21, 0, 2 ** 20, 0)
+
+        runner.invoke(app, ["run-local", "42", "--hide-output"])
+
+        assert task_from_id.call_args == call(42)
+        assert mock_profile.call_args == call(
+            "echo foo", interval=0.05, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        report = mock_logger.info.call_args.args[0]
+        assert "cpu_user" in report
+        assert "1.50 s" in report
+        assert "2.0 MiB" in report
+
+    def test_repeats_command_and_shows_distribution(self, mocker):
+        mock_logger = mocker.patch("cli.schedule.get_logger").return_value
+        mock_profile = mocker.patch("cli.schedule.profile_command")
+        mock_profile.side_effect = [
+            RunProfile(1.0, 1.0, 0.0, 0, 0, 0, 0),
+            RunProfile(3.0, 1.0, 0.0, 0, 0, 0, 2),
+        ]
+
+        runner.invoke(app, ["run-local", "--command", "sleep 1", "--repeat", "2"])
+
+        assert mock_profile.call_count == 2
+        assert mock_profile.call_args.args == ("sleep 1",)
+        assert mock_logger.warning.call_args == call("1 of 2 runs failed (return codes: 2)")
+        report = mock_logger.info.call_args.args[0]
+        assert "median" in report
+        assert "2.00 s" in report
+
+    def test_requires_either_id_or_command(self, mocker):
+        mock_snakesay = mocker.patch("cli.schedule.snakesay")
+
+        result = runner.invoke(app, ["run-local", "42", "--command", "echo foo"])
+
+        assert mock_snakesay.call_args == call("Provide either task id or --command")
+        assert result.exit_code == 1
+
+
+class TestMetrics:
+    def test_rejects_machine_readable_formats(self, mocker, task_from_id):
+        result = runner.invoke(app, ["metrics", "42", "-f", "json"])
+
+        assert result.exit_code == 2
+        assert task_from_id.call_count == 0
+
+    def test_shows_summary_of_recorded_runs(self, mocker, task_from_id):
+        mock_logger = mocker.patch("cli.schedule.get_logger").return_value
+        task_from_id.return_value.command = "python -m pythonanywhere.task_runner --metrics=/var/log/m.jsonl -- 'echo foo'"
+        mock_remote_log = mocker.patch("cli.schedule.RemoteLog")
+        mock_remote_log.return_value.iter_lines.return_value = [
+            b'{"wall": 2.0, "cpu_user": 1.0, "cpu_system": 0.5, "peak_rss": 1048576, '
+            b'"read_bytes": 0, "write_bytes": 0, "returncode": 0}'
+        ]
+
+        runner.invoke(app, ["metrics", "42"])
+
+        assert mock_remote_log.call_args == call("/var/log/m.jsonl")
+        assert mock_logger.info.call_args_list[0] == call("Task 42: 1 runs, 0 failed")
+        assert "1.0 MiB" in mock_logger.info.call_args.args[0]
+
+    def test_complains_when_task_not_profiled(self, mocker, task_from_id):
+        mock_snakesay = mocker.patch("cli.schedule.snakesay")
+
+        result = runner.invoke(app, ["metrics", "42"])
+
+        assert mock_snakesay.call_args == call("Task 42 is not profiled, update it with --profile first")
+        assert result.exit_code == 1
+
+
+class TestMux:
+    def test_adds_and_lists_jobs(self, mocker, tmp_path):
+        mock_logger = mocker.patch("cli.schedule.get_logger").return_value
+        table = str(tmp_path / "mux.json")
+
+        runner.invoke(mux_app, ["add", "backup", "-c", "echo backup", "--hour", "2", "--hour", "14", "-t", table])
+        runner.invoke(mux_app, ["list", "--table", table])
+
+        listing = mock_logger.info.call_args.args[0]
+        assert "backup" in listing
+        assert "2, 14" in listing
+        assert "echo backup" in listing
+
+    def test_removes_job(self, mocker, tmp_path):
+        mocker.patch("cli.schedule.get_logger")
+        table = str(tmp_path / "mux.json")
+        runner.invoke(mux_app, ["add", "backup", "-c", "echo backup", "-t", table])
+
+        result = runner.invoke(mux_app, ["remove", "backup", "-t", table])
+        missing = runner.invoke(mux_app, ["remove", "backup", "-t", table])
+
+        assert result.exit_code == 0
+        assert missing.exit_code == 1
+
+    def test_installs_dispatcher_task(self, mocker, monkeypatch, tmp_path):
+        monkeypatch.setenv("PYTHONANYWHERE_SITE", "www.pythonanywhere.com")
+        mocker.patch("cli.schedule.get_logger")
+        mock_to_be_created = mocker.patch("cli.schedule.Task.to_be_created")
+        table = tmp_path / "mux.json"
+
+        runner.invoke(
+            mux_app, ["install", "--minute", "5", "--workers", "2", "-t", str(table), "--python", "python3.11"]
+        )
+
+        assert table.exists()
+        assert mock_to_be_created.call_args == call(
+            command=dispatcher_command(table, workers=2, python="python3.11"), minute=5
+        )
+        assert mock_to_be_created.return_value.method_calls == [call.create_schedule()]
+
+    def test_refuses_to_install_off_pythonanywhere(self, mocker, monkeypatch, tmp_path):
+        monkeypatch.delenv("PYTHONANYWHERE_SITE", raising=False)
+        mock_logger = mocker.patch("cli.schedule.get_logger")
+        mock_to_be_created = mocker.patch("cli.schedule.Task.to_be_created")
+
+        result = runner.invoke(mux_app, ["install", "--minute", "5", "-t", str(tmp_path / "mux.json")])
+
+        assert result.exit_code == 1
+        assert mock_to_be_created.call_count == 0
+        assert "PythonAnywhere console" in mock_logger.return_value.warning.call_args[0][0]
+
+
+class TestTimeline:
+    def test_logs_next_runs_plot_and_expiring_tasks(self, mocker, task_list):
+        mock_logger = mocker.patch("cli.schedule.get_logger").return_value
+        mock_snakesay = mocker.patch("cli.schedule.snakesay")
+        mocker.patch("cli.schedule.window_start").return_value = datetime(2999, 1, 12, 15, 0)
+        task_list.return_value.tasks[0].expiry = "2999-01-13"
+
+        runner.invoke(app, ["timeline", "--hours", "10", "--runs", "2"])
+
+        logged = "\n".join(str(c.args[0]) for c in mock_logger.info.call_args_list)
+        assert "01-12 16:00, 01-13 16:00" in logged
+        assert "01-12 16h |1" in logged
+        assert mock_snakesay.call_args == call(
+            "Task 42 'echo foo' expires on 2999-01-13 -- extend it to keep it running"
+        )
+        assert mock_logger.warning.call_count == 1
+
+
+class TestExtend:
+    def test_extends_tasks_expiring_within_days(self, mocker, task_list):
+        mock_logger = mocker.patch("cli.schedule.get_logger").return_value
+        first, second = task_list.return_value.tasks
+        first.expiry = (datetime.now() + timedelta(days=3)).date().isoformat()
+        second.expiry = (datetime.now() + timedelta(days=30)).date().isoformat()
+
+        result = runner.invoke(app, ["extend", "--expiring-within", "7"])
+
+        assert result.exit_code == 0
+        assert first.extend_schedule.call_count == 1
+        assert second.extend_schedule.call_count == 0
+        assert "Extended 1 of 1 tasks" in mock_logger.info.call_args[0][0]
+
+    def test_extends_all_tasks_with_expiry(self, mocker, task_list):
+        mocker.patch("cli.schedule.get_logger")
+        first, second = task_list.return_value.tasks
+        second.expiry = "2999-01-01"
+
+        runner.invoke(app, ["extend", "--all"])
+
+        assert first.extend_schedule.call_count == 0
+        assert second.extend_schedule.call_count == 1
+
+    def test_exits_with_error_when_some_extensions_fail(self, mocker, task_list):
+        mock_logger = mocker.patch("cli.schedule.get_logger").return_value
+        first, second = task_list.return_value.tasks
+        first.expiry = second.expiry = "2999-01-01"
+        second.extend_schedule.side_effect = Exception("boom")
+
+        result = runner.invoke(app, ["extend", "42", "43"])
+
+        assert result.exit_code == 1
+        assert first.extend_schedule.call_count == 1
+        assert mock_logger.warning.call_args == call("Task 43 not extended: boom")
+        assert "Extended 1 of 2 tasks" in mock_logger.info.call_args[0][0]
+
+    def test_warns_about_requested_tasks_not_extended(self, mocker, task_list):
+        mock_logger = mocker.patch("cli.schedule.get_logger").return_value
+        first, second = task_list.return_value.tasks
+        second.expiry = "2999-01-01"
+
+        result = runner.invoke(app, ["extend", "42", "43", "44"])
+
+        assert result.exit_code == 0
+        assert mock_logger.warning.call_args_list == [
+            call("Task 42 not extended: it has no expiry date"),
+            call("Task 44 not extended: no such task"),
+        ]
+        assert second.extend_schedule.call_count == 1
+        assert "Extended 1 of 1 tasks" in mock_logger.info.call_args[0][0]
+
+    def test_warns_about_requested_tasks_not_expiring_soon(self, mocker, task_list):
+        mock_logger = mocker.patch("cli.schedule.get_logger").return_value
+        first, second = task_list.return_value.tasks
+        first.expiry = second.expiry = "2999-01-01"
+
+        runner.invoke(app, ["extend", "42", "--expiring-within", "7"])
+
+        assert mock_logger.warning.call_args == call("Task 42 not extended: it doesn't expire within 7 days")
+        assert "No tasks to extend" in mock_logger.info.call_args[0][0]
+
+    def test_requires_selection(self, mocker, task_list):
+        mocker.patch("cli.schedule.get_logger")
+
+        result = runner.invoke(app, ["extend"])
+
+        assert result.exit_code == 1
+        assert task_list.call_count == 0
+
+
+class TestExport:
+    def test_writes_snapshot_to_stdout(self, task_list):
+        task_list.return_value = task_list.return_value.tasks
+
+        result = runner.invoke(app, ["export"])
+
+        snapshot = json.loads(result.stdout)
+        assert [record["checksum"] for record in snapshot["tasks"]] == [
+            record["checksum"] for record in make_snapshot(task_list.return_value)["tasks"]
+        ]
+
+    def test_writes_snapshot_to_file(self, mocker, task_list, tmp_path):
+        mocker.patch("cli.schedule.get_logger")
+        task_list.return_value = task_list.return_value.tasks
+        output = tmp_path / "schedule.json"
+
+        runner.invoke(app, ["export", "-o", str(output)])
+
+        assert len(json.loads(output.read_text())["tasks"]) == 2
+
+
+class TestImport:
+    def test_restores_tasks_from_snapshot(self, mocker, task_list, tmp_path):
+        mock_logger = mocker.patch("cli.schedule.get_logger").return_value
+        mock_restore = mocker.patch("cli.schedule.restore")
+        mock_restore.return_value = ([({"command": "a"}, Mock(), None)], [{"command": "b"}])
+        snapshot = make_snapshot(task_list.return_value.tasks)
+        snapshot_file = tmp_path / "schedule.json"
+        snapshot_file.write_text(json.dumps(snapshot))
+
+        result = runner.invoke(app, ["import", str(snapshot_file), "--workers", "2"])
+
+        assert result.exit_code == 0
+        assert mock_restore.call_args == call(snapshot["tasks"], task_list.return_value, max_workers=2)
+        assert "Created 1 tasks, skipped 1 already existing, failed 0" in mock_logger.info.call_args[0][0]
+
+    def test_exits_on_invalid_snapshot(self, mocker, task_list, tmp_path):
+        mocker.patch("cli.schedule.get_logger")
+        mock_restore = mocker.patch("cli.schedule.restore")
+        snapshot = make_snapshot(task_list.return_value.tasks)
+        snapshot["checksum"] = "bad"
+        snapshot_file = tmp_path / "schedule.json"
+        snapshot_file.write_text(json.dumps(snapshot))
+
+        result = runner.invoke(app, ["import", str(snapshot_file)])
+
+        assert result.exit_code == 1
+        assert mock_restore.call_count == 0
+
+    def test_exits_with_error_when_creation_fails(self, mocker, task_list, tmp_path):
+        mock_logger = mocker.patch("cli.schedule.get_logger").return_value
+        mocker.patch("cli.schedule.restore").return_value = ([({"command": "a"}, None, Exception("boom"))], [])
+        snapshot_file = tmp_path / "schedule.json"
+        snapshot_file.write_text(json.dumps(make_snapshot([])))
+
+        result = runner.invoke(app, ["import", str(snapshot_file)])
+
+        assert result.exit_code == 1
+        assert mock_logger.warning.call_args == call("Task 'a' not created: boom")
@@ -1,6 +1,7 @@
 import getpass
+import json
 import tempfile
-from datetime import datetime
+from datetime import datetime, timedelta
 from unittest.mock import call
 
 import pytest
@@ -8,6 +9,12 @@ from dateutil.tz import tzutc
 from typer.testing import CliRunner
 
 from cli.webapp import app
+from pythonanywhere.access_log import AccessLogStats
+from pythonanywhere.error_log import ErrorClusters
+from pythonanywhere.server_log import ServerHealth
+from pythonanywhere.static_audit import StaticAudit
+from pythonanywhere.utils import run_concurrently
+from pythonanywhere.warmup import WarmupResult
 
 runner = CliRunner()
 
@@ -190,7 +197,7 @@ def test_delete_all_logs(mock_webapp, domain_name):
     )
 
     mock_webapp.assert_called_once_with(domain_name)
-    assert mock_webapp.return_value.delete_log.call_args_list == [
+    assert sorted(mock_webapp.return_value.delete_log.call_args_list) == [
         call("access", 0),
         call("access", 1),
         call("access", 2),
@@ -217,7 +224,7 @@ def test_delete_all_server_logs(mock_webapp, domain_name):
     )
 
     mock_webapp.assert_called_once_with(domain_name)
-    assert mock_webapp.return_value.delete_log.call_args_list == [
+    assert sorted(mock_webapp.return_value.delete_log.call_args_list) == [
         call("server", 0),
         call("server", 1),
         call("server", 2),
@@ -239,7 +246,7 @@ def test_delete_all_current_logs(mock_webapp, domain_name):
     result = runner.invoke(app, ["delete-logs", "-d", "foo.bar.baz", "-i", "0"])
 
     mock_webapp.assert_called_once_with(domain_name)
-    assert mock_webapp.return_value.delete_log.call_args_list == [
+    assert sorted(mock_webapp.return_value.delete_log.call_args_list) == [
         call("access", 0),
         call("error", 0),
         call("server", 0),
@@ -247,7 +254,7 @@ def test_delete_all_current_logs(mock_webapp, domain_name):
     assert "All done!" in result.stdout
 
 
-def test_delete_all_logs_shows_per_file_messages(mock_webapp, domain_name):
+def test_delete_all_logs_shows_per_type_summary(mock_webapp, domain_name):
     result = runner.invoke(
         app,
         [
@@ -257,10 +264,11 @@ def test_delete_all_logs_shows_per_file_messages(mock_webapp, domain_name):
         ],
     )
 
-    assert "Deleting current access log file" in result.stdout
-    assert "Deleting old (archive number 1) access log file" in result.stdout
-    assert "Deleting old (archive number 2) error log file" in result.stdout
-    assert "foo.bar.baz" in result.stdout
+    assert result.exit_code == 0
+    assert "Deleting 9 log files for foo.bar.baz" in result.stdout
+    assert "foo.bar.baz access logs: deleted 3 (current, 1, 2)" in result.stdout
+    assert "foo.bar.baz error logs: deleted 3 (current, 1, 2)" in result.stdout
+    assert "foo.bar.baz server logs: deleted 3 (current, 1, 2)" in result.stdout
     assert "All done!" in result.stdout
 
 
@@ -269,11 +277,24 @@ def test_delete_one_log_shows_message(mock_webapp, domain_name):
         app, ["delete-logs", "-d", domain_name, "-t", "server", "-i", "2"]
     )
 
-    assert "Deleting old (archive number 2) server log file" in result.stdout
-    assert "foo.bar.baz" in result.stdout
+    assert "foo.bar.baz server logs: deleted 1 (2)" in result.stdout
+    assert mock_webapp.return_value.get_log_info.call_count == 0
     assert "All done!" in result.stdout
 
 
+def test_delete_logs_exits_with_error_on_partial_failure(mock_webapp, domain_name):
+    def delete_log(log_type, index):
+        if (log_type, index) == ("error", 1):
+            raise Exception("boom")
+
+    mock_webapp.return_value.delete_log.side_effect = delete_log
+
+    result = runner.invoke(app, ["delete-logs", "-d", domain_name, "-w", "2"])
+
+    assert result.exit_code == 1
+    assert "foo.bar.baz error logs: deleted 2 (current, 2), failed 1 (1: boom)" in result.stdout
+    assert "All done!" not in result.stdout
+
 
 def test_validates_log_number(mock_webapp):
     result = runner.invoke(
@@ -290,3 +311,433 @@ def test_delete_webapp(mock_webapp, domain_name):
     mock_webapp.assert_called_once_with(domain_name)
     mock_webapp.return_value.delete.assert_called_once()
     assert f"{domain_name} has been deleted" in result.stdout
+
+
+def test_logs_prints_current_log(mocker, mock_webapp, domain_name):
+    mock_log = mocker.patch("cli.webapp.WebappLog")
+    mock_log.return_value.read_new.return_value = b"error line\n"
+
+    result = runner.invoke(app, ["logs", "-d", domain_name, "-t", "error"])
+
+    assert mock_log.call_args == call(domain_name, "error", offset=0, rotated=False, archives=None)
+    assert result.stdout == "error line\n"
+
+
+def test_logs_resumes_from_and_stores_offset_with_new(mocker, mock_webapp, domain_name):
+    mock_log = mocker.patch("cli.webapp.WebappLog")
+    mock_log.return_value.read_new.return_value = b""
+    mock_offsets = mocker.patch("cli.webapp.LogOffsets").return_value
+    mock_offsets.get_state.return_value = {"offset": 100, "size": 100, "archives": [1, 2]}
+    path = f"/var/log/{domain_name}.access.log"
+
+    runner.invoke(app, ["logs", "-d", domain_name, "-t", "access", "--new"])
+
+    assert mock_offsets.get_state.call_args == call(path)
+    assert mock_log.call_args == call(domain_name, "access", offset=100, rotated=False, archives=None)
+    assert mock_offsets.set.call_args == call(
+        path, mock_log.return_value.offset, size=mock_log.return_value.size, archives=[1, 2]
+    )
+
+
+def test_logs_treats_changed_archives_as_rotation(mocker, mock_webapp, domain_name):
+    mock_log = mocker.patch("cli.webapp.WebappLog")
+    mock_log.return_value.read_new.return_value = b""
+    mock_offsets = mocker.patch("cli.webapp.LogOffsets").return_value
+    mock_offsets.get_state.return_value = {"offset": 100, "size": 100, "archives": [1]}
+
+    runner.invoke(app, ["logs", "-d", domain_name, "-t", "access", "--new"])
+
+    assert mock_log.call_args == call(domain_name, "access", offset=100, rotated=True, archives=None)
+
+
+def test_logs_follows_log_with_backoff(mocker, mock_webapp, domain_name):
+    mock_log = mocker.patch("cli.webapp.WebappLog").return_value
+    mock_log.read_new.return_value = b"a"
+    mock_log.follow.return_value = iter([b"b", b"c"])
+
+    result = runner.invoke(app, ["logs", "-d", domain_name, "--follow", "-i", "2", "-x", "8"])
+
+    assert mock_log.follow.call_args == call(min_interval=2, max_interval=8)
+    assert result.stdout == "abc"
+
+
+def test_logs_follow_checks_archives_and_stores_the_last_seen(mocker, mock_webapp, domain_name):
+    mock_log = mocker.patch("cli.webapp.WebappLog")
+    mock_log.return_value.read_new.return_value = b""
+    mock_log.return_value.follow.return_value = iter([])
+    mock_log.return_value.archives = [1, 2, 3]
+    mock_offsets = mocker.patch("cli.webapp.LogOffsets").return_value
+    mock_offsets.get_state.return_value = {"offset": 100, "size": 100, "archives": [1, 2]}
+
+    runner.invoke(app, ["logs", "-d", domain_name, "--new", "--follow"])
+
+    assert mock_log.call_args == call(domain_name, "error", offset=100, rotated=False, archives=[1, 2])
+    assert mock_offsets.set.call_args.kwargs["archives"] == [1, 2, 3]
+
+
+def test_logs_reports_missing_current_log(mocker, mock_webapp, domain_name):
+    mock_webapp.return_value.get_log_info.return_value = {"access": [], "error": [1], "server": []}
+    mock_log = mocker.patch("cli.webapp.WebappLog")
+
+    result = runner.invoke(app, ["logs", "-d", domain_name])
+
+    assert "There is no current error log for foo.bar.baz" in result.stdout
+    assert mock_log.call_count == 0
+
+
+def test_logs_rejects_all_log_type(mock_webapp, domain_name):
+    result = runner.invoke(app, ["logs", "-d", domain_name, "-t", "all"])
+
+    assert result.exit_code == 2
+    assert "log type has to be one of" in result.stderr
+
+
+def test_log_stats_reports_endpoints_and_percentiles(mocker, mock_webapp, domain_name):
+    stats = AccessLogStats()
+    for path, status, response_time in [("/a", 200, 0.1), ("/a", 500, 0.1), ("/b", 200, 0.2)]:
+        stats.add_line(
+            f'1.2.3.4 - - [01/Mar/2024:16:00:05 +0000] "GET {path} HTTP/1.1" {status} 12 "-" "-" "1.2.3.4" '
+            f"response-time={response_time}".encode()
+        )
+    mock_collect = mocker.patch("cli.webapp.collect_access_stats")
+    mock_collect.return_value = (stats, [])
+
+    result = runner.invoke(app, ["log-stats", "-d", domain_name, "--top", "1", "-w", "2"])
+
+    assert result.exit_code == 0
+    assert mock_collect.call_args == call(domain_name, [0, 1, 2], max_workers=2)
+    assert "3 requests in 3 log(s), p50 99ms" in result.stdout
+    assert "Status mix: 2xx 66.7%, 5xx 33.3%" in result.stdout
+    assert "/a" in result.stdout
+    assert "/b" not in result.stdout
+
+
+def test_log_stats_reads_only_current_log(mocker, mock_webapp, domain_name):
+    mock_collect = mocker.patch("cli.webapp.collect_access_stats")
+    mock_collect.return_value = (mocker.Mock(requests=0), [])
+
+    runner.invoke(app, ["log-stats", "-d", domain_name, "--current-only"])
+
+    assert mock_collect.call_args == call(domain_name, [0], max_workers=4)
+
+
+def test_log_stats_exits_with_error_when_log_unreadable(mocker, mock_webapp, domain_name):
+    mock_collect = mocker.patch("cli.webapp.collect_access_stats")
+    mock_collect.return_value = (mocker.Mock(requests=0), [("/var/log/x", Exception("nope"))])
+
+    result = runner.invoke(app, ["log-stats", "-d", domain_name])
+
+    assert result.exit_code == 1
+    assert "Could not read /var/log/x: nope" in result.stdout
+
+
+def test_logs_import_imports_current_and_archived_logs(mocker, mock_webapp, domain_name):
+    mock_store = mocker.patch("cli.webapp.LogStore").return_value
+    mock_store.import_current.return_value = 2
+    mock_store.import_archives.return_value = 5
+    mock_log = mocker.patch("cli.webapp.WebappLog")
+
+    result = runner.invoke(app, ["logs", "import", "-d", domain_name, "--archives"])
+
+    assert result.exit_code == 0
+    assert mock_store.import_current.call_args == call(domain_name, archives=[1, 2])
+    assert mock_store.import_archives.call_args == call(domain_name, [0, 1, 2])
+    assert "Imported 7 requests to foo.bar.baz" in result.stdout
+    assert mock_store.close.call_count == 1
+    assert mock_log.call_count == 0
+
+
+def test_log_stats_queries_local_store(mocker, mock_webapp, domain_name):
+    mock_store = mocker.patch("cli.webapp.LogStore").return_value
+    mock_store.summary.return_value = {
+        "requests": 4,
+        "quantiles": [0.1, 0.2, 0.3],
+        "status_mix": {"2xx": 3, "5xx": 1},
+        "endpoints": [("/a", 4, 1, [0.1, 0.2, 0.3])],
+    }
+    mock_collect = mocker.patch("cli.webapp.collect_access_stats")
+
+    result = runner.invoke(app, ["log-stats", "-d", domain_name, "--store", "--top", "5"])
+
+    assert mock_store.summary.call_args == call(domain_name, since=None, top=5)
+    assert "4 requests in the local store, p50 100ms, p95 200ms, p99 300ms" in result.stdout
+    assert "Status mix: 2xx 75.0%, 5xx 25.0%" in result.stdout
+    assert mock_collect.call_count == 0
+
+
+def test_errors_reports_top_clusters_with_samples(mocker, mock_webapp, domain_name):
+    clusters = ErrorClusters()
+    for exception in ["ValueError: a", "ValueError: b", "KeyError: 'c'"]:
+        for line in [
+            "2024-03-01 16:00:05,123: Traceback (most recent call last):",
+            '2024-03-01 16:00:05,123:   File "/home/me/app/views.py", line 10, in detail',
+            f"2024-03-01 16:00:05,124: {exception}",
+        ]:
+            clusters.add_line(line.encode())
+    mock_collect = mocker.patch("cli.webapp.collect_error_clusters")
+    mock_collect.return_value = (clusters, [])
+
+    result = runner.invoke(app, ["errors", "-d", domain_name, "--top", "1", "--depth", "2"])
+
+    assert result.exit_code == 0
+    assert mock_collect.call_args == call(domain_name, [0, 1, 2], max_workers=4, depth=2)
+    assert "3 tracebacks in 2 group(s) in 3 log(s)" in result.stdout
+    assert "views.py:detail" in result.stdout
+    assert "#1 sample:\n    Traceback (most recent call last):" in result.stdout
+    assert "KeyError" not in result.stdout
+
+
+def test_errors_exits_with_error_when_log_unreadable(mocker, mock_webapp, domain_name):
+    mock_collect = mocker.patch("cli.webapp.collect_error_clusters")
+    mock_collect.return_value = (ErrorClusters(), [("/var/log/x", Exception("nope"))])
+
+    result = runner.invoke(app, ["errors", "-d", domain_name, "--current-only"])
+
+    assert result.exit_code == 1
+    assert mock_collect.call_args == call(domain_name, [0], max_workers=4, depth=3)
+    assert "Could not read /var/log/x: nope" in result.stdout
+
+
+def test_server_health_reports_timeline_and_saturation(mocker, mock_webapp, domain_name):
+    health = ServerHealth()
+    for line in [
+        b"2024-03-01 16:02:00 *** HARAKIRI ON WORKER 1 (pid: 1, try: 1) ***",
+        b"2024-03-01 16:02:01 Respawned uWSGI worker 1 (new pid: 2)",
+        b"2024-03-01 17:00:00 *** Starting uWSGI 2.0.20 ***",
+    ]:
+        health.add_line(line)
+    mock_collect = mocker.patch("cli.webapp.collect_server_health")
+    mock_collect.return_value = (health, [])
+
+    result = runner.invoke(app, ["server-health", "-d", domain_name, "--bucket", "10", "-c"])
+
+    assert result.exit_code == 0
+    assert mock_collect.call_args == call(domain_name, [0], max_workers=4, bucket=timedelta(minutes=10))
+    assert "Totals: harakiri 1, listen_queue 0, died 0, respawn 1, reload 1" in result.stdout
+    assert "2024-03-01 16:00:00 - 2024-03-01 16:05:00: 1 harakiri, 0 listen queue full" in result.stdout
+
+
+def test_server_health_reports_no_saturation(mocker, mock_webapp, domain_name):
+    health = ServerHealth()
+    health.add_line(b"2024-03-01 17:00:00 *** Starting uWSGI 2.0.20 ***")
+    mocker.patch("cli.webapp.collect_server_health").return_value = (health, [])
+
+    result = runner.invoke(app, ["server-health", "-d", domain_name])
+
+    assert result.exit_code == 0
+    assert "No saturation found" in result.stdout
+
+
+@pytest.fixture
+def static_audit(mocker, tmp_path):
+    mocker.patch("cli.webapp.get_static_file_mappings").return_value = [{"url": "/static/", "path": "/x"}]
+    (tmp_path / "assets").mkdir()
+    (tmp_path / "assets" / "site.css").touch()
+    audit = StaticAudit()
+    for path in ["/assets/site.css", "/vendor/lib.js"]:
+        audit.add_line(
+            f'1.2.3.4 - - [01/Mar/2024:16:00:05 +0000] "GET {path} HTTP/1.1" 200 12 "-" "-" "1.2.3.4" '
+            "response-time=0.5".encode()
+        )
+    mock_collect = mocker.patch("cli.webapp.collect_static_audit")
+    mock_collect.return_value = (audit, [])
+    return mock_collect
+
+
+def test_static_audit_reports_prefixes(static_audit, mock_webapp, domain_name, tmp_path):
+    mock_webapp.return_value.get.return_value = {"source_directory": str(tmp_path)}
+
+    result = runner.invoke(app, ["static-audit", "-d", domain_name])
+
+    assert result.exit_code == 0
+    assert static_audit.call_args == call(domain_name, [0, 1, 2], ["/static/"], max_workers=4)
+    assert str(tmp_path / "assets") in result.stdout
+    assert "not found" in result.stdout
+    assert "Run with --apply to create 1 static file mapping(s)" in result.stdout
+    assert mock_webapp.return_value.create_static_file_mapping.call_count == 0
+
+
+def test_static_audit_creates_mappings_with_apply(static_audit, mock_webapp, domain_name, tmp_path):
+    result = runner.invoke(app, ["static-audit", "-d", domain_name, "-p", str(tmp_path), "--apply"])
+
+    assert result.exit_code == 0
+    assert mock_webapp.return_value.get.call_count == 0
+    assert mock_webapp.return_value.create_static_file_mapping.call_args_list == [
+        call("/assets/", tmp_path / "assets")
+    ]
+    assert "1 static file mapping(s) created, reload foo.bar.baz" in result.stdout
+    assert mock_webapp.return_value.reload.call_count == 0
+
+
+def test_static_audit_reloads_webapp_after_apply_with_reload(static_audit, mock_webapp, domain_name, tmp_path):
+    result = runner.invoke(app, ["static-audit", "-d", domain_name, "-p", str(tmp_path), "--apply", "--reload"])
+
+    assert result.exit_code == 0
+    assert mock_webapp.return_value.reload.call_count == 1
+    assert "1 static file mapping(s) created, foo.bar.baz has been reloaded" in result.stdout
+
+
+def test_static_audit_explains_unmatched_prefixes_off_pythonanywhere(
+    static_audit, mock_webapp, domain_name, tmp_path, monkeypatch
+):
+    monkeypatch.delenv("PYTHONANYWHERE_SITE", raising=False)
+
+    result = runner.invoke(app, ["static-audit", "-d", domain_name, "-p", str(tmp_path / "missing"), "--apply"])
+
+    assert result.exit_code == 0
+    assert "run this command on PythonAnywhere" in result.stdout
+    assert mock_webapp.return_value.create_static_file_mapping.call_count == 0
+
+
+@pytest.fixture
+def many_webapps(mocker):
+    mock_webapp = mocker.patch("cli.webapp.Webapp")
+    mock_webapp.list_webapps.return_value = [{"domain_name": "a.com"}, {"domain_name": "b.com"}]
+    webapps = {domain: mocker.Mock(name=domain) for domain in ["a.com", "b.com", "c.com"]}
+    mock_webapp.side_effect = lambda domain: webapps[domain]
+    return webapps
+
+
+def test_reload_all_reloads_every_webapp_and_tolerates_missing_cname(many_webapps):
+    from pythonanywhere_core.exceptions import MissingCNAMEException
+    many_webapps["b.com"].reload.side_effect = MissingCNAMEException()
+
+    result = runner.invoke(app, ["reload", "--all"])
+
+    assert result.exit_code == 0
+    assert many_webapps["a.com"].reload.call_count == 1
+    assert many_webapps["b.com"].reload.call_count == 1
+    assert many_webapps["c.com"].reload.call_count == 0
+    assert "Could not find a CNAME" in result.stdout
+    assert result.stdout.count("reloaded") == 2
+
+
+def test_reload_domains_from_file_reports_failures(many_webapps, tmp_path):
+    domains_file = tmp_path / "domains.txt"
+    domains_file.write_text("# production\na.com\n\nc.com\n")
+    many_webapps["c.com"].reload.side_effect = Exception("boom")
+
+    result = runner.invoke(app, ["reload", "--domains-from", str(domains_file)])
+
+    assert result.exit_code == 1
+    assert many_webapps["a.com"].reload.call_count == 1
+    assert many_webapps["b.com"].reload.call_count == 0
+    assert "c.com     failed    boom" in result.stdout
+
+
+def test_reload_rejects_all_with_domains_from(many_webapps, tmp_path):
+    domains_file = tmp_path / "domains.txt"
+    domains_file.write_text("a.com\n")
+
+    result = runner.invoke(app, ["reload", "--all", "--domains-from", str(domains_file)])
+
+    assert result.exit_code == 2
+    assert many_webapps["a.com"].reload.call_count == 0
+
+
+def test_get_all_prints_table_of_webapps(many_webapps):
+    many_webapps["a.com"].get.return_value = {"domain_name": "a.com", "python_version": "3.10"}
+    many_webapps["b.com"].get.side_effect = Exception("nope")
+
+    result = runner.invoke(app, ["get", "--all"])
+
+    assert result.exit_code == 1
+    assert "a.com" in result.stdout
+    assert "3.10" in result.stdout
+    assert "Could not get b.com: nope" in result.stdout
+
+
+def test_delete_logs_all_deletes_logs_of_every_webapp(many_webapps):
+    for webapp in many_webapps.values():
+        webapp.get_log_info.return_value = {"access": [0, 1], "error": [0], "server": []}
+    many_webapps["b.com"].delete_log.side_effect = [None, Exception("nope"), None]
+
+    result = runner.invoke(app, ["delete-logs", "--all", "-i", "all"])
+
+    assert result.exit_code == 1
+    assert many_webapps["a.com"].delete_log.call_count == 3
+    assert "a.com     deleted   3 deleted" in result.stdout
+    assert "b.com     partial   2 deleted, 1 failed" in result.stdout
+
+
+def test_delete_logs_all_limits_api_calls_to_workers(mocker, many_webapps):
+    for webapp in many_webapps.values():
+        webapp.get_log_info.return_value = {"access": [0], "error": [], "server": []}
+    mock_delete = mocker.patch("cli.webapp.delete_webapp_logs", return_value={})
+    mock_run = mocker.patch("cli.webapp.run_concurrently", wraps=run_concurrently)
+
+    runner.invoke(app, ["delete-logs", "--all", "-i", "all", "-w", "8"])
+
+    assert mock_run.call_args.kwargs["max_workers"] == 8
+    assert {c.kwargs["max_workers"] for c in mock_delete.call_args_list} == {1}
+
+
+def test_list_details_prints_table_of_all_webapps(many_webapps):
+    many_webapps["a.com"].get.return_value = {"domain_name": "a.com", "python_version": "3.10", "enabled": True}
+    many_webapps["b.com"].get.return_value = {"domain_name": "b.com", "virtualenv_path": "/home/me/.venv"}
+
+    result = runner.invoke(app, ["list", "--details"])
+
+    assert result.exit_code == 0
+    assert many_webapps["c.com"].get.call_count == 0
+    lines = result.stdout.splitlines()
+    assert lines[0].split() == ["Domain", "Python", "version", "Source", "directory", "Virtualenv", "path", "Enabled"]
+    assert lines[2].split() == ["a.com", "3.10", "not", "set", "not", "set", "True"]
+    assert lines[3].split() == ["b.com", "unknown", "not", "set", "/home/me/.venv", "unknown"]
+
+
+def test_list_details_prints_json(many_webapps):
+    many_webapps["a.com"].get.return_value = {"domain_name": "a.com", "python_version": "3.10"}
+    many_webapps["b.com"].get.return_value = {"domain_name": "b.com", "python_version": "3.11"}
+
+    result = runner.invoke(app, ["list", "--details", "-f", "json"])
+
+    assert result.exit_code == 0
+    assert json.loads(result.stdout) == [
+        {"domain_name": "a.com", "python_version": "3.10"},
+        {"domain_name": "b.com", "python_version": "3.11"},
+    ]
+
+
+def test_reload_warms_up_urls_after_reload(mocker, mock_webapp, domain_name, tmp_path):
+    urls_file = tmp_path / "urls.txt"
+    urls_file.write_text("/\n/api/items\n")
+    mock_warm_up = mocker.patch("cli.webapp.warm_up")
+    mock_warm_up.return_value = [
+        WarmupResult(f"https://{domain_name}/", 200, 3, 0.25, 4.0, None),
+        WarmupResult(f"https://{domain_name}/api/items", 200, 1, 0.05, 2.5, None),
+    ]
+
+    result = runner.invoke(app, ["reload", "-d", domain_name, "--warm", str(urls_file), "--warm-timeout", "30"])
+
+    assert result.exit_code == 0
+    assert mock_webapp.return_value.method_calls == [call.reload()]
+    assert mock_warm_up.call_args == call(
+        [f"https://{domain_name}/", f"https://{domain_name}/api/items"], timeout=30, max_workers=8
+    )
+    assert "Time to first success: 2.5s" in result.stdout
+    assert "250ms" in result.stdout
+
+
+def test_reload_rejects_warm_up_of_many_webapps(many_webapps, tmp_path):
+    urls_file = tmp_path / "urls.txt"
+    urls_file.write_text("/\n")
+
+    result = runner.invoke(app, ["reload", "--all", "--warm", str(urls_file)])
+
+    assert result.exit_code == 2
+    assert "--warm can't be used with --all" in result.stderr
+    assert all(webapp.reload.call_count == 0 for webapp in many_webapps.values())
+
+
+def test_reload_warm_up_fails_when_urls_dont_respond(mocker, mock_webapp, domain_name, tmp_path):
+    urls_file = tmp_path / "urls.txt"
+    urls_file.write_text("/\n")
+    mocker.patch("cli.webapp.warm_up").return_value = [
+        WarmupResult(f"https://{domain_name}/", 502, 60, None, None, None)
+    ]
+
+    result = runner.invoke(app, ["reload", "-d", domain_name, "--warm", str(urls_file)])
+
+    assert result.exit_code == 1
+    assert "None of the URLs responded within 60 seconds" in result.stdout
@@ -0,0 +1,158 @@
+import sys
+from datetime import datetime, timezone
+from unittest.mock import call
+
+import pytest
+
+from pythonanywhere.cron import (
+    compile_expression,
+    dispatch,
+    due_minutes,
+    main,
+    matches_date,
+    parse_expression,
+    parse_field,
+)
+
+PYTHON = f"python{sys.version_info.major}.{sys.version_info.minor}"
+
+
+class TestParseField:
+    @pytest.mark.parametrize(
+        "text, expected",
+        [
+            ("*", list(range(0, 24))),
+            ("5", [5]),
+            ("2-5", [2, 3, 4, 5]),
+            ("*/6", [0, 6, 12, 18]),
+            ("10-20/5", [10, 15, 20]),
+            ("20/2", [20, 22]),
+            ("1,3,3,2", [1, 2, 3]),
+        ],
+    )
+    def test_parses_lists_ranges_and_steps(self, text, expected):
+        assert parse_field(text, 0, 23) == expected
+
+    @pytest.mark.parametrize("text", ["24", "5-2", "*/0", "x", ""])
+    def test_raises_on_invalid_field(self, text):
+        with pytest.raises(ValueError):
+            parse_field(text, 0, 23)
+
+
+class TestParseExpression:
+    def test_treats_weekday_7_as_sunday(self):
+        assert parse_expression("0 0 * * 5-7").weekdays == [0, 5, 6]
+
+    def test_raises_when_not_5_fields(self):
+        with pytest.raises(ValueError) as e:
+            parse_expression("* * * *")
+
+        assert "5 fields" in str(e.value)
+
+
+class TestMatchesDate:
+    def test_matches_either_day_field_when_both_restricted(self):
+        expression = parse_expression("0 0 1 * 1")
+
+        assert matches_date(expression, datetime(2024, 3, 1))  # Friday, 1st
+        assert matches_date(expression, datetime(2024, 3, 4))  # Monday
+        assert not matches_date(expression, datetime(2024, 3, 5))
+
+    def test_checks_month_and_weekday(self):
+        expression = parse_expression("0 0 * 6 0")
+
+        assert matches_date(expression, datetime(2024, 6, 2))
+        assert not matches_date(expression, datetime(2024, 6, 3))
+        assert not matches_date(expression, datetime(2024, 7, 7))
+
+
+class TestCompileExpression:
+    def test_uses_hourly_tasks_when_every_hour_matches(self):
+        plan = compile_expression("0,30 * * * *", "echo foo")
+
+        assert plan.slots == [(None, 0), (None, 30)]
+        assert plan.command == "echo foo"
+        assert not plan.dispatcher
+
+    def test_uses_daily_tasks_for_restricted_hours(self):
+        plan = compile_expression("15 2,14 * * *", "echo foo")
+
+        assert plan.slots == [(2, 15), (14, 15)]
+        assert not plan.dispatcher
+
+    def test_wraps_command_with_date_check_when_days_restricted(self):
+        plan = compile_expression("0 3 * * 1", "echo foo")
+
+        assert plan.slots == [(3, 0)]
+        assert plan.command == (
+            f"{PYTHON} -m pythonanywhere.cron '0 3 * * 1' --date-only -- 'echo foo'"
+        )
+
+    def test_falls_back_to_dispatcher_when_too_many_tasks_needed(self):
+        plan = compile_expression("*/15 2-5 * * *", "echo foo", max_tasks=4)
+
+        assert plan.dispatcher
+        assert plan.slots == [(None, 0)]
+        assert plan.command == f"{PYTHON} -m pythonanywhere.cron '*/15 2-5 * * *' -- 'echo foo'"
+        assert sys.executable not in plan.command
+
+    def test_wraps_command_with_given_interpreter(self):
+        plan = compile_expression("*/15 2-5 * * *", "echo foo", python="python3.11")
+
+        assert plan.command.startswith("python3.11 -m pythonanywhere.cron ")
+
+    def test_dispatcher_is_daily_when_one_hour_matches(self):
+        plan = compile_expression("*/10 7 * * *", "echo foo", max_tasks=4)
+
+        assert plan.slots == [(7, 0)]
+
+    def test_respects_max_tasks(self):
+        plan = compile_expression("*/15 2-5 * * *", "echo foo", max_tasks=16)
+
+        assert len(plan.slots) == 16
+        assert not plan.dispatcher
+
+
+class TestDueMinutes:
+    def test_returns_last_passed_and_upcoming_minutes(self):
+        expression = parse_expression("*/15 2-5 * * *")
+
+        assert due_minutes(expression, datetime(2024, 3, 1, 3, 20)) == [15, 30, 45]
+        assert due_minutes(expression, datetime(2024, 3, 1, 3, 0)) == [0, 15, 30, 45]
+
+    def test_returns_nothing_outside_hours(self):
+        expression = parse_expression("*/15 2-5 * * *")
+
+        assert due_minutes(expression, datetime(2024, 3, 1, 6, 0)) == []
+
+
+class TestDispatch:
+    def test_sleeps_until_due_minutes_and_runs_command(self, mocker):
+        now = datetime(2024, 3, 1, 3, 0, 30, tzinfo=timezone.utc)
+        mocker.patch("pythonanywhere.cron._now").return_value = now
+        mock_sleep = mocker.patch("pythonanywhere.cron.time.sleep")
+        mock_call = mocker.patch("pythonanywhere.cron.subprocess.call")
+        mock_call.side_effect = [0, 3]
+
+        returncode = dispatch(parse_expression("0,30 3 * * *"), "echo foo")
+
+        assert returncode == 3
+        assert mock_sleep.call_args_list == [call(1770.0)]
+        assert mock_call.call_args_list == [call("echo foo", shell=True)] * 2
+
+
+class TestMain:
+    def test_date_only_skips_command_on_other_days(self, mocker):
+        mocker.patch("pythonanywhere.cron._now").return_value = datetime(2024, 3, 5)
+        mock_call = mocker.patch("pythonanywhere.cron.subprocess.call")
+
+        assert main(["0 3 * * 1", "--date-only", "--", "echo foo"]) == 0
+        assert mock_call.call_count == 0
+
+    def test_date_only_runs_command_on_matching_day(self, mocker):
+        mocker.patch("pythonanywhere.cron._now").return_value = datetime(2024, 3, 4)
+        mock_call = mocker.patch("pythonanywhere.cron.subprocess.call")
+        mock_call.return_value = 2
+
+        assert main(["0 3 * * 1", "--date-only", "--", "echo foo"]) == 2
+        assert mock_call.call_args == call("echo foo", shell=True)
@@ -0,0 +1,121 @@
+from datetime import datetime
+
+from pythonanywhere.error_log import OTHER_ERRORS, ErrorClusters, collect_error_clusters, parse_error_line
+
+
+def traceback_lines(exception="ValueError: bad value 42", line=10, timestamp="2024-03-01 16:00:05", view="detail"):
+    return [
+        f"{timestamp},123: Traceback (most recent call last):",
+        f'{timestamp},123:   File "/usr/lib/python3.10/site-packages/django/handler.py", line 47, in inner',
+        f"{timestamp},123:     response = get_response(request)",
+        f'{timestamp},123:   File "/home/me/app/views.py", line {line}, in {view}',
+        f"{timestamp},123:     item = int(pk)",
+        f"{timestamp},124: {exception}",
+    ]
+
+
+def add_lines(clusters, lines):
+    for line in lines:
+        clusters.add_line(line.encode())
+
+
+def test_parses_error_line():
+    assert parse_error_line(b"2024-03-01 16:00:05,123: Error running WSGI application") == (
+        datetime(2024, 3, 1, 16, 0, 5),
+        "Error running WSGI application",
+    )
+    assert parse_error_line(b"no prefix") == (None, "no prefix")
+
+
+class TestErrorClusters:
+    def test_groups_tracebacks_ignoring_line_numbers_and_values(self):
+        clusters = ErrorClusters()
+        add_lines(clusters, ["2024-03-01 16:00:00,000: Error running WSGI application"])
+        add_lines(clusters, traceback_lines("ValueError: bad value 42", 10, "2024-03-01 16:00:05"))
+        add_lines(clusters, traceback_lines("ValueError: bad value 7", 12, "2024-03-02 09:30:00"))
+        add_lines(clusters, traceback_lines("KeyError: 'pk'", 10, "2024-03-01 17:00:00"))
+
+        assert clusters.total == 3
+        (key, cluster), (other_key, other) = clusters.top()
+        assert key == (
+            "ValueError",
+            ("/usr/lib/python3.10/site-packages/django/handler.py", "inner"),
+            ("/home/me/app/views.py", "detail"),
+        )
+        assert cluster.count == 2
+        assert cluster.first_seen == datetime(2024, 3, 1, 16, 0, 5)
+        assert cluster.last_seen == datetime(2024, 3, 2, 9, 30)
+        assert "ValueError: bad value 42" in cluster.sample
+        assert other_key[0] == "KeyError"
+        assert other.count == 1
+
+    def test_uses_innermost_frames_only(self):
+        clusters = ErrorClusters(depth=1)
+        add_lines(clusters, traceback_lines())
+
+        assert list(clusters.clusters) == [("ValueError", ("/home/me/app/views.py", "detail"))]
+
+    def test_keeps_only_innermost_frames_of_deep_traceback(self):
+        clusters = ErrorClusters(depth=2)
+        frames = [f'2024-03-01 16:00:05,123:   File "/home/me/app/rec.py", line 1, in f{i}' for i in range(1000)]
+        add_lines(clusters, traceback_lines()[:1] + frames)
+
+        assert list(clusters._frames) == [("/home/me/app/rec.py", "f998"), ("/home/me/app/rec.py", "f999")]
+
+        add_lines(clusters, ["2024-03-01 16:00:05,124: RecursionError: maximum recursion depth exceeded"])
+
+        assert list(clusters.clusters) == [
+            ("RecursionError", ("/home/me/app/rec.py", "f998"), ("/home/me/app/rec.py", "f999"))
+        ]
+
+    def test_counts_chained_exceptions_separately(self):
+        clusters = ErrorClusters()
+        lines = traceback_lines("KeyError: 'pk'")
+        lines.append("2024-03-01 16:00:05,124: ")
+        lines.append("2024-03-01 16:00:05,124: During handling of the above exception, another exception occurred:")
+        lines.extend(traceback_lines("app.models.DoesNotExist: Item matching query does not exist."))
+        add_lines(clusters, lines)
+
+        assert sorted(key[0] for key in clusters.clusters) == ["KeyError", "app.models.DoesNotExist"]
+
+    def test_caps_number_of_clusters_and_sample_length(self):
+        clusters = ErrorClusters(max_clusters=2, max_sample_lines=3)
+        for view in ["a", "b", "c", "d"]:
+            add_lines(clusters, traceback_lines(view=view))
+
+        assert len(clusters.clusters) == 3
+        assert clusters.clusters[OTHER_ERRORS].count == 2
+        assert all(len(cluster.sample.splitlines()) == 3 for cluster in clusters.clusters.values())
+
+    def test_merge_keeps_earliest_sample(self):
+        first, second = ErrorClusters(), ErrorClusters()
+        add_lines(first, traceback_lines("ValueError: late", timestamp="2024-03-02 10:00:00"))
+        add_lines(second, traceback_lines("ValueError: early", timestamp="2024-03-01 10:00:00"))
+
+        first.merge(second)
+
+        (_, cluster), = first.top()
+        assert cluster.count == 2
+        assert "ValueError: early" in cluster.sample
+        assert (cluster.first_seen, cluster.last_seen) == (datetime(2024, 3, 1, 10), datetime(2024, 3, 2, 10))
+
+
+class TestCollectErrorClusters:
+    def test_streams_logs(self, tmp_path, mocker):
+        mocker.patch("pythonanywhere.webapp_logs.LOG_DIR", str(tmp_path))
+        (tmp_path / "foo.com.error.log").write_text("\n".join(traceback_lines()) + "\n")
+        (tmp_path / "foo.com.error.log.1").write_text("\n".join(traceback_lines() * 2) + "\n")
+
+        clusters, errors = collect_error_clusters("foo.com", [0, 1])
+
+        assert errors == []
+        assert clusters.total == 3
+        assert len(clusters.clusters) == 1
+
+    def test_reports_unreadable_logs(self, mocker):
+        mocker.patch("pythonanywhere.webapp_logs.RemoteLog").return_value.iter_lines.side_effect = Exception("nope")
+
+        clusters, errors = collect_error_clusters("foo.com", [0])
+
+        assert clusters.total == 0
+        assert [(path, str(error)) for path, error in errors] == [("/var/log/foo.com.error.log", "nope")]
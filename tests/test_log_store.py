@@ -0,0 +1,161 @@
+import gzip
+import sqlite3
+from datetime import datetime, timezone
+
+import pytest
+
+import pythonanywhere.log_store as store_module
+from pythonanywhere.log_store import LogStore
+
+
+def access_line(path="/", status=200, response_time=0.1, timestamp="01/Mar/2024:16:00:05 +0000"):
+    return (
+        f'1.2.3.4 - - [{timestamp}] "GET {path} HTTP/1.1" {status} 12 "-" "-" "1.2.3.4" '
+        f"response-time={response_time}\n"
+    ).encode()
+
+
+@pytest.fixture
+def log_dir(tmp_path, mocker):
+    mocker.patch("pythonanywhere.webapp_logs.LOG_DIR", str(tmp_path))
+    return tmp_path
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = LogStore(tmp_path / "store.sqlite")
+    yield store
+    store.close()
+
+
+class TestImportCurrent:
+    def test_imports_only_appended_complete_lines(self, log_dir, store):
+        current = log_dir / "foo.com.access.log"
+        current.write_bytes(access_line("/a") + access_line("/b")[:20])
+
+        assert store.import_current("foo.com") == 1
+        assert store.import_current("foo.com") == 0
+
+        with current.open("ab") as f:
+            f.write(access_line("/b")[20:] + access_line("/c"))
+
+        assert store.import_current("foo.com") == 2
+        assert store.get_offset("foo.com", str(current)) == current.stat().st_size
+        assert [row[0] for row in store.connection.execute("SELECT endpoint FROM requests")] == ["/a", "/b", "/c"]
+
+    def test_reads_log_in_chunks_committing_offset_after_each(self, log_dir, store, mocker):
+        current = log_dir / "foo.com.access.log"
+        current.write_bytes(b"".join(access_line(f"/{name}") for name in "abcde"))
+        read_new = mocker.spy(store_module.WebappLog, "read_new")
+        set_offset = mocker.spy(store, "_set_offset")
+
+        assert store.import_current("foo.com", chunk_size=100) == 5
+        assert all(call.kwargs == {"max_bytes": 100} for call in read_new.call_args_list)
+        assert read_new.call_count > 3
+        assert set_offset.call_count > 3
+        assert store.get_offset("foo.com", str(current)) == current.stat().st_size
+        assert [row[0] for row in store.connection.execute("SELECT endpoint FROM requests")] == [
+            f"/{name}" for name in "abcde"
+        ]
+
+    def test_imports_log_rotated_and_grown_past_offset_since_previous_import(self, log_dir, store):
+        current = log_dir / "foo.com.access.log"
+        current.write_bytes(b"".join(access_line(f"/old{n}") for n in range(15)))
+        assert store.import_current("foo.com", archives=[]) == 15
+
+        with current.open("ab") as f:
+            f.write(b"".join(access_line(f"/tail{n}") for n in range(5)))
+        current.rename(log_dir / "foo.com.access.log.1")
+        current.write_bytes(b"".join(access_line(f"/new{n}") for n in range(25)))
+
+        assert store.import_current("foo.com", archives=[1]) == 30
+        assert store.get_state("foo.com", str(current)) == {
+            "offset": current.stat().st_size,
+            "size": current.stat().st_size,
+            "archives": [1],
+        }
+        assert store.import_archives("foo.com", [1]) == 0
+        assert store.connection.execute("SELECT COUNT(*) FROM requests").fetchone()[0] == 45
+
+    def test_adds_state_columns_to_store_created_by_older_version(self, tmp_path):
+        connection = sqlite3.connect(str(tmp_path / "old.sqlite"))
+        connection.execute("CREATE TABLE offsets (domain TEXT, path TEXT, offset INTEGER, PRIMARY KEY (domain, path))")
+        connection.execute("INSERT INTO offsets VALUES ('foo.com', '/var/log/foo.com.access.log', 42)")
+        connection.commit()
+        connection.close()
+
+        store = LogStore(tmp_path / "old.sqlite")
+
+        assert store.get_state("foo.com", "/var/log/foo.com.access.log") == {
+            "offset": 42,
+            "size": None,
+            "archives": None,
+        }
+        store.close()
+
+    def test_stores_timestamp_as_epoch(self, log_dir, store):
+        (log_dir / "foo.com.access.log").write_bytes(access_line(timestamp="01/Mar/2024:16:00:05 +0000"))
+
+        store.import_current("foo.com")
+
+        timestamp = store.connection.execute("SELECT timestamp FROM requests").fetchone()[0]
+        assert timestamp == int(datetime(2024, 3, 1, 16, 0, 5, tzinfo=timezone.utc).timestamp())
+
+
+class TestImportArchives:
+    def test_imports_plain_and_gzipped_archives_skipping_current(self, log_dir, store):
+        (log_dir / "foo.com.access.log").write_bytes(access_line("/current"))
+        (log_dir / "foo.com.access.log.1").write_bytes(access_line("/a"))
+        with gzip.open(log_dir / "foo.com.access.log.2.gz", "wb") as f:
+            f.write(access_line("/b") + access_line("/b"))
+
+        assert store.import_archives("foo.com", [0, 1, 2]) == 3
+
+    def test_skips_archives_imported_before(self, log_dir, store):
+        (log_dir / "foo.com.access.log.1").write_bytes(access_line("/a", timestamp="01/Mar/2024:16:00:05 +0000"))
+        store.import_archives("foo.com", [1])
+
+        (log_dir / "foo.com.access.log.1").rename(log_dir / "foo.com.access.log.2")
+        with gzip.open(log_dir / "foo.com.access.log.2.gz", "wb") as f:
+            f.write((log_dir / "foo.com.access.log.2").read_bytes())
+        (log_dir / "foo.com.access.log.1").write_bytes(access_line("/b", timestamp="02/Mar/2024:16:00:05 +0000"))
+
+        assert store.import_archives("foo.com", [1, 2]) == 1
+        assert store.import_archives("foo.com", [1, 2]) == 0
+        assert [row[0] for row in store.connection.execute("SELECT endpoint FROM requests")] == ["/a", "/b"]
+
+    def test_skips_archive_read_as_current_log_before_rotation(self, log_dir, store):
+        (log_dir / "foo.com.access.log").write_bytes(access_line("/a"))
+        store.import_current("foo.com")
+        (log_dir / "foo.com.access.log").rename(log_dir / "foo.com.access.log.1")
+
+        assert store.import_archives("foo.com", [1]) == 0
+
+
+class TestSummary:
+    def test_aggregates_requests_of_domain(self, store):
+        rows = [
+            ("foo.com", 100, "GET", "/a", 200, 0.1),
+            ("foo.com", 200, "GET", "/a", 500, 0.3),
+            ("foo.com", 300, "GET", "/b", 302, 0.2),
+            ("bar.com", 300, "GET", "/c", 200, 9.0),
+        ]
+        store._insert(rows)
+
+        summary = store.summary("foo.com", top=1)
+
+        assert summary["requests"] == 3
+        assert summary["quantiles"] == [0.2, 0.2, 0.2]
+        assert summary["status_mix"] == {"2xx": 1, "3xx": 1, "5xx": 1}
+        assert summary["endpoints"] == [("/a", 2, 1, [0.1, 0.1, 0.1])]
+
+    def test_filters_by_since(self, store):
+        store._insert([("foo.com", 100, "GET", "/a", 200, 0.1), ("foo.com", 300, "GET", "/b", 200, 0.2)])
+
+        summary = store.summary("foo.com", since=datetime.fromtimestamp(200, tz=timezone.utc))
+
+        assert summary["requests"] == 1
+        assert summary["endpoints"][0][0] == "/b"
+
+    def test_returns_empty_summary_without_requests(self, store):
+        assert store.summary("foo.com")["requests"] == 0
@@ -0,0 +1,171 @@
+import gzip
+from unittest.mock import call
+
+import pytest
+import responses
+from pythonanywhere_core.exceptions import PythonAnywhereApiException
+from pythonanywhere_core.files import Files
+
+from pythonanywhere.logs import LogOffsets, RemoteLog
+
+LOG_PATH = "/var/log/tasklog-42.log"
+LOG_URL = f"{Files.path_endpoint}{LOG_PATH}"
+
+
+class TestRemoteLogLocal:
+    def test_reads_only_new_bytes(self, tmp_path):
+        log_file = tmp_path / "task.log"
+        log_file.write_bytes(b"first\n")
+        log = RemoteLog(str(log_file))
+
+        assert log.read_new() == b"first\n"
+        assert log.read_new() == b""
+
+        with log_file.open("ab") as f:
+            f.write(b"second\n")
+
+        assert log.read_new() == b"second\n"
+        assert log.offset == 13
+
+    def test_starts_over_when_file_shrinks(self, tmp_path):
+        log_file = tmp_path / "task.log"
+        log_file.write_bytes(b"new\n")
+        log = RemoteLog(str(log_file), offset=100)
+
+        assert log.read_new() == b"new\n"
+        assert log.rotated is True
+
+
+    def test_starts_over_when_file_is_replaced_by_bigger_one(self, tmp_path):
+        log_file = tmp_path / "task.log"
+        log_file.write_bytes(b"old\n")
+        log = RemoteLog(str(log_file))
+        assert log.read_new() == b"old\n"
+
+        log_file.rename(tmp_path / "task.log.1")
+        log_file.write_bytes(b"new and longer\n")
+
+        assert log.read_new() == b"new and longer\n"
+        assert log.rotated is True
+
+
+class TestRemoteLogRemote:
+    def test_requests_range_past_offset(self, api_responses, api_token):
+        api_responses.add(responses.GET, LOG_URL, body=b"appended", status=206)
+        log = RemoteLog(LOG_PATH, offset=10)
+
+        assert log.read_new() == b"appended"
+        assert api_responses.calls[0].request.headers["Range"] == "bytes=10-"
+        assert log.offset == 18
+        assert log.size == 18
+
+    def test_requests_bounded_range_with_max_bytes(self, api_responses, api_token):
+        api_responses.add(
+            responses.GET, LOG_URL, body=b"0123", status=206, headers={"Content-Range": "bytes 0-3/10"}
+        )
+        log = RemoteLog(LOG_PATH)
+
+        assert log.read_new(max_bytes=4) == b"0123"
+        assert api_responses.calls[0].request.headers["Range"] == "bytes=0-3"
+        assert (log.offset, log.size) == (4, 10)
+
+    def test_slices_full_response_when_range_ignored(self, api_responses, api_token):
+        api_responses.add(responses.GET, LOG_URL, body=b"0123456789", status=200)
+        log = RemoteLog(LOG_PATH, offset=4)
+
+        assert log.read_new() == b"456789"
+        assert log.offset == 10
+
+    def test_returns_nothing_when_range_not_satisfiable(self, api_responses, api_token):
+        api_responses.add(
+            responses.GET, LOG_URL, status=416, headers={"Content-Range": "bytes */10"}
+        )
+        log = RemoteLog(LOG_PATH, offset=10)
+
+        assert log.read_new() == b""
+        assert log.offset == 10
+
+    def test_rereads_rotated_file(self, api_responses, api_token):
+        api_responses.add(
+            responses.GET, LOG_URL, status=416, headers={"Content-Range": "bytes */3"}
+        )
+        api_responses.add(responses.GET, LOG_URL, body=b"new", status=200)
+        log = RemoteLog(LOG_PATH, offset=10)
+
+        assert log.read_new() == b"new"
+        assert log.rotated is True
+        assert log.offset == 3
+
+    def test_treats_missing_file_as_empty(self, api_responses, api_token):
+        api_responses.add(responses.GET, LOG_URL, status=404)
+
+        assert RemoteLog(LOG_PATH).read_new() == b""
+
+    def test_raises_on_other_errors(self, api_responses, api_token):
+        api_responses.add(responses.GET, LOG_URL, status=500, body="oops")
+
+        with pytest.raises(PythonAnywhereApiException) as e:
+            RemoteLog(LOG_PATH).read_new()
+
+        assert "oops" in str(e.value)
+
+
+class TestRemoteLogIterLines:
+    def test_decompresses_local_gzipped_file(self, tmp_path):
+        log_file = tmp_path / "site.access.log.2.gz"
+        with gzip.open(log_file, "wb") as f:
+            f.write(b"first\nsecond\n")
+
+        assert list(RemoteLog(str(log_file)).iter_lines()) == [b"first", b"second"]
+
+    def test_streams_and_decompresses_remote_gzipped_file(self, api_responses, api_token):
+        path = "/var/log/site.access.log.2.gz"
+        api_responses.add(
+            responses.GET, f"{Files.path_endpoint}{path}", body=gzip.compress(b"first\nsecond\n"), status=200
+        )
+
+        assert list(RemoteLog(path).iter_lines()) == [b"first", b"second"]
+
+
+class TestRemoteLogFollow:
+    def test_backs_off_while_idle_and_resets_on_new_data(self, mocker):
+        mock_read_new = mocker.patch("pythonanywhere.logs.RemoteLog.read_new")
+        mock_read_new.side_effect = [b"", b"", b"", b"data", b"", b"more"]
+        mock_sleep = mocker.patch("pythonanywhere.logs.time.sleep")
+        follow = RemoteLog(LOG_PATH).follow(min_interval=1, max_interval=5)
+
+        assert next(follow) == b"data"
+        assert next(follow) == b"more"
+        assert mock_sleep.call_args_list == [call(2), call(4), call(5), call(1), call(2)]
+
+
+class TestLogOffsets:
+    def test_stores_offsets_per_path(self, tmp_path):
+        offsets = LogOffsets(tmp_path / "offsets.json")
+
+        assert offsets.get(LOG_PATH) == 0
+
+        offsets.set(LOG_PATH, 42)
+        offsets.set("/var/log/other.log", 7)
+
+        assert LogOffsets(tmp_path / "offsets.json").get(LOG_PATH) == 42
+
+    def test_stores_size_and_archives_with_offset(self, tmp_path):
+        offsets = LogOffsets(tmp_path / "offsets.json")
+
+        offsets.set(LOG_PATH, 42, size=50, archives=[1, 2])
+
+        assert LogOffsets(tmp_path / "offsets.json").get_state(LOG_PATH) == {
+            "offset": 42,
+            "size": 50,
+            "archives": [1, 2],
+        }
+
+    def test_reads_plain_offsets_stored_by_older_versions(self, tmp_path):
+        (tmp_path / "offsets.json").write_text(f'{{"{LOG_PATH}": 42}}')
+
+        assert LogOffsets(tmp_path / "offsets.json").get_state(LOG_PATH) == {
+            "offset": 42,
+            "size": 42,
+            "archives": None,
+        }
@@ -83,8 +83,18 @@ class TestUpdateScheduledTask:
             {"interval": "hourly"}, porcelain=None
         )
 
+    def test_drops_hour_when_switching_to_hourly(self, task_from_id, args):
+        args.update({"hourly": True, "hour": 5})
+
+        main(**args)
+
+        assert task_from_id.return_value.update_schedule.call_args == call(
+            {"interval": "hourly"}, porcelain=None
+        )
+
     def test_ensures_proper_hourly_params(self, task_from_id, args, mocker):
         mock_datetime = mocker.patch("scripts.pa_update_scheduled_task.datetime")
+        task_from_id.return_value.interval = "hourly"
         args.update({"daily": True})
 
         main(**args)
@@ -92,3 +102,12 @@ class TestUpdateScheduledTask:
         assert task_from_id.return_value.update_schedule.call_args == call(
             {"interval": "daily", "hour": mock_datetime.now.return_value.hour}, porcelain=None
         )
+
+    def test_keeps_hour_of_daily_task(self, task_from_id, args):
+        args.update({"daily": True})
+
+        main(**args)
+
+        assert task_from_id.return_value.update_schedule.call_args == call(
+            {"interval": "daily", "hour": 10}, porcelain=None
+        )
@@ -0,0 +1,39 @@
+import sys
+
+import pytest
+
+from pythonanywhere.resource_profile import METRICS, RunProfile, profile_command, summarize
+
+
+@pytest.mark.tasks
+class TestProfileCommand:
+    def test_measures_cpu_bound_command(self):
+        command = f"{sys.executable} -c 'sum(i * i for i in range(3 * 10 ** 6))'"
+
+        profile = profile_command(command, interval=0.01)
+
+        assert profile.returncode == 0
+        assert profile.cpu_user > 0
+        assert profile.wall >= profile.cpu_user * 0.5
+        assert profile.peak_rss > 0
+
+    def test_reports_return_code(self):
+        profile = profile_command("exit 3")
+
+        assert profile.returncode == 3
+
+
+@pytest.mark.tasks
+class TestSummarize:
+    def test_aggregates_every_metric(self):
+        profiles = [
+            RunProfile(1.0, 0.5, 0.1, 100, 0, 10, 0),
+            RunProfile(3.0, 1.5, 0.3, 300, 0, 30, 0),
+            RunProfile(2.0, 1.0, 0.2, 200, 0, 20, 1),
+        ]
+
+        summary = summarize(profiles)
+
+        assert set(summary) == set(METRICS)
+        assert summary["wall"] == {"min": 1.0, "median": 2.0, "mean": 2.0, "max": 3.0}
+        assert summary["peak_rss"]["max"] == 300
@@ -0,0 +1,82 @@
+import pytest
+
+from pythonanywhere.schedule_balance import (
+    hotspots,
+    peak,
+    propose_balance,
+    slot_histogram,
+    task_slots,
+)
+from pythonanywhere.task import Task
+
+
+def make_task(task_id, minute, hour=None, enabled=True):
+    return Task.from_api_specs(
+        {
+            "id": task_id,
+            "command": f"echo {task_id}",
+            "minute": minute,
+            "hour": hour,
+            "interval": "daily" if hour is not None else "hourly",
+            "enabled": enabled,
+        }
+    )
+
+
+@pytest.mark.tasks
+class TestSlotHistogram:
+    def test_hourly_task_occupies_every_hour(self):
+        assert task_slots(make_task(1, 5)) == [(hour, 5) for hour in range(24)]
+
+    def test_daily_task_occupies_one_slot(self):
+        assert task_slots(make_task(1, 5, hour=3)) == [(3, 5)]
+
+    def test_counts_enabled_tasks_only(self):
+        tasks = [make_task(1, 0), make_task(2, 0, hour=4), make_task(3, 0, hour=4, enabled=False)]
+
+        histogram = slot_histogram(tasks)
+
+        assert histogram[(4, 0)] == 2
+        assert histogram[(5, 0)] == 1
+        assert peak(histogram) == 2
+
+    def test_reports_crowded_slots_busiest_first(self):
+        tasks = [make_task(1, 0, hour=1), make_task(2, 0, hour=1), make_task(3, 0, hour=1), make_task(4, 7, hour=2),
+                 make_task(5, 7, hour=2), make_task(6, 9, hour=2)]
+
+        assert hotspots(slot_histogram(tasks)) == [((1, 0), 3), ((2, 7), 2)]
+
+
+@pytest.mark.tasks
+class TestProposeBalance:
+    def test_spreads_tasks_starting_together(self):
+        tasks = [make_task(task_id, 0, hour=2) for task_id in range(1, 5)]
+
+        histogram, moves = propose_balance(tasks)
+
+        assert peak(histogram) == 1
+        assert len(moves) == 3
+        assert sorted(move.new_minute for move in moves) == [1, 2, 59]
+
+    def test_does_not_move_pinned_tasks(self):
+        tasks = [make_task(1, 0), make_task(2, 0)]
+
+        histogram, moves = propose_balance(tasks, pinned={1, 2})
+
+        assert moves == []
+        assert peak(histogram) == 2
+
+    def test_moves_unpinned_task_away_from_pinned_one(self):
+        tasks = [make_task(1, 0, hour=3), make_task(2, 0)]
+
+        histogram, moves = propose_balance(tasks, pinned={2})
+
+        assert [(move.task.task_id, move.old_minute) for move in moves] == [(1, 0)]
+        assert peak(histogram) == 1
+
+    def test_keeps_already_balanced_schedule(self):
+        tasks = [make_task(1, 0), make_task(2, 30, hour=5)]
+
+        _, moves = propose_balance(tasks)
+
+        assert moves == []
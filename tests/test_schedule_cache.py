@@ -0,0 +1,124 @@
+import json
+import time
+
+import pytest
+
+from pythonanywhere.schedule_cache import TTL_ENV_VAR, ScheduleCache
+
+
+@pytest.fixture
+def specs_list():
+    return [
+        {"id": 42, "command": "echo foo", "minute": 0},
+        {"id": 43, "command": "echo bar", "minute": 15},
+    ]
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ScheduleCache(ttl=60, path=tmp_path / "schedule.json")
+
+
+@pytest.mark.tasks
+class TestScheduleCachePath:
+    def test_keeps_snapshots_per_api_host_and_user(self, monkeypatch, tmp_path, specs_list):
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+        alice = ScheduleCache(ttl=60, base_url="https://www.pythonanywhere.com/api/v0/user/alice/schedule/")
+        bob = ScheduleCache(ttl=60, base_url="https://www.pythonanywhere.com/api/v0/user/bob/schedule/")
+        bob_eu = ScheduleCache(ttl=60, base_url="https://eu.pythonanywhere.com/api/v0/user/bob/schedule/")
+
+        alice.store(specs_list)
+
+        assert alice.path == tmp_path / "pythonanywhere" / "schedule-www.pythonanywhere.com-alice.json"
+        assert bob_eu.path == tmp_path / "pythonanywhere" / "schedule-eu.pythonanywhere.com-bob.json"
+        assert alice.load() == specs_list
+        assert bob.load() is None
+        assert bob_eu.load() is None
+
+    def test_uses_schedule_base_url_by_default(self, mocker, monkeypatch, tmp_path):
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+        mocker.patch(
+            "pythonanywhere.schedule_cache.Schedule.base_url",
+            "https://www.pythonanywhere.com/api/v0/user/carol/schedule/",
+        )
+
+        assert ScheduleCache().path.name == "schedule-www.pythonanywhere.com-carol.json"
+
+
+@pytest.mark.tasks
+class TestScheduleCacheEnabled:
+    def test_is_disabled_by_default(self, monkeypatch):
+        monkeypatch.delenv(TTL_ENV_VAR, raising=False)
+
+        assert ScheduleCache().enabled is False
+
+    def test_reads_ttl_from_environment(self, monkeypatch):
+        monkeypatch.setenv(TTL_ENV_VAR, "30")
+
+        assert ScheduleCache().ttl == 30
+        assert ScheduleCache().enabled is True
+
+    def test_ignores_invalid_ttl(self, monkeypatch):
+        monkeypatch.setenv(TTL_ENV_VAR, "soon")
+
+        assert ScheduleCache().enabled is False
+
+    def test_disabled_cache_does_not_store(self, tmp_path, specs_list):
+        cache = ScheduleCache(ttl=0, path=tmp_path / "schedule.json")
+
+        cache.store(specs_list)
+
+        assert not (tmp_path / "schedule.json").exists()
+        assert cache.load() is None
+
+
+@pytest.mark.tasks
+class TestScheduleCacheSnapshot:
+    def test_stores_and_loads_fresh_snapshot(self, cache, specs_list):
+        cache.store(specs_list)
+
+        assert cache.load() == specs_list
+        assert cache.get_specs(43) == specs_list[1]
+        assert cache.get_specs(44) is None
+
+    def test_returns_none_for_stale_snapshot(self, cache, specs_list):
+        cache.path.write_text(json.dumps({"taken_at": time.time() - 61, "tasks": specs_list}))
+
+        assert cache.load() is None
+
+    def test_returns_none_for_corrupted_snapshot(self, cache):
+        cache.path.write_text("{not json")
+
+        assert cache.load() is None
+
+    def test_patches_snapshot_keeping_timestamp(self, cache, specs_list):
+        cache.store(specs_list)
+        taken_at = json.loads(cache.path.read_text())["taken_at"]
+
+        cache.patch({"id": 43, "command": "echo baz", "minute": 15})
+        cache.patch({"id": 44, "command": "echo qux", "minute": 30})
+
+        snapshot = json.loads(cache.path.read_text())
+        assert snapshot["taken_at"] == taken_at
+        assert cache.get_specs(43)["command"] == "echo baz"
+        assert cache.get_specs(44)["command"] == "echo qux"
+
+    def test_removes_task_from_snapshot(self, cache, specs_list):
+        cache.store(specs_list)
+
+        cache.remove(42)
+
+        assert cache.load() == [specs_list[1]]
+
+    def test_patch_does_not_create_snapshot(self, cache):
+        cache.patch({"id": 42})
+
+        assert not cache.path.exists()
+
+    def test_invalidates_snapshot(self, cache, specs_list):
+        cache.store(specs_list)
+
+        cache.invalidate()
+        cache.invalidate()
+
+        assert cache.load() is None
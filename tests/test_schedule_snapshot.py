@@ -0,0 +1,94 @@
+from unittest.mock import call
+
+import pytest
+
+from pythonanywhere.schedule_snapshot import (
+    SNAPSHOT_VERSION,
+    load_snapshot,
+    make_snapshot,
+    restore,
+    task_checksum,
+)
+from pythonanywhere.task import Task
+
+
+def make_task(command, hour=None, minute=0, enabled=True, task_id=None):
+    task = Task.to_be_created(command=command, hour=hour, minute=minute, disabled=not enabled)
+    task.task_id = task_id
+    return task
+
+
+@pytest.fixture
+def tasks():
+    return [make_task("echo foo", hour=16, task_id=42), make_task("echo bar", minute=5, enabled=False, task_id=43)]
+
+
+class TestMakeSnapshot:
+    def test_keeps_recreatable_specs_with_checksums(self, tasks):
+        snapshot = make_snapshot(tasks)
+
+        assert snapshot["version"] == SNAPSHOT_VERSION
+        assert [record["command"] for record in snapshot["tasks"]] == ["echo foo", "echo bar"]
+        assert snapshot["tasks"][1] == {
+            "command": "echo bar",
+            "interval": "hourly",
+            "hour": None,
+            "minute": 5,
+            "enabled": False,
+            "checksum": task_checksum(snapshot["tasks"][1]),
+        }
+        assert "task_id" not in snapshot["tasks"][0]
+
+    def test_task_checksum_ignores_task_id(self):
+        first = make_snapshot([make_task("echo foo", hour=1, task_id=1)])["tasks"][0]
+        second = make_snapshot([make_task("echo foo", hour=1, task_id=2)])["tasks"][0]
+
+        assert first["checksum"] == second["checksum"]
+
+
+class TestLoadSnapshot:
+    def test_returns_records_of_valid_snapshot(self, tasks):
+        snapshot = make_snapshot(tasks)
+
+        assert load_snapshot(snapshot) == snapshot["tasks"]
+
+    def test_raises_when_content_was_modified(self, tasks):
+        snapshot = make_snapshot(tasks)
+        snapshot["tasks"][0]["command"] = "rm -rf /"
+
+        with pytest.raises(ValueError) as e:
+            load_snapshot(snapshot)
+
+        assert "checksum" in str(e.value)
+
+    def test_raises_on_unsupported_version(self, tasks):
+        snapshot = make_snapshot(tasks)
+        snapshot["version"] = 999
+
+        with pytest.raises(ValueError) as e:
+            load_snapshot(snapshot)
+
+        assert "Unsupported snapshot version: 999" in str(e.value)
+
+
+class TestRestore:
+    def test_creates_missing_tasks_and_skips_existing(self, tasks, mocker):
+        mock_create = mocker.patch("pythonanywhere.schedule_snapshot.Task.create_schedule", autospec=True)
+        records = make_snapshot(tasks)["tasks"]
+
+        results, skipped = restore(records, [tasks[0]])
+
+        assert skipped == [records[0]]
+        assert len(results) == 1
+        record, task, error = results[0]
+        assert error is None
+        assert (task.command, task.interval, task.minute, task.enabled) == ("echo bar", "hourly", 5, False)
+        assert mock_create.call_args == call(task)
+
+    def test_reports_failed_creations(self, tasks, mocker):
+        mocker.patch("pythonanywhere.schedule_snapshot.Task.create_schedule").side_effect = Exception("boom")
+
+        results, skipped = restore(make_snapshot(tasks)["tasks"], [])
+
+        assert skipped == []
+        assert [str(error) for _, _, error in results] == ["boom", "boom"]
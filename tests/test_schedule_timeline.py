@@ -0,0 +1,82 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from pythonanywhere.schedule_timeline import (
+    concurrency,
+    expiring,
+    next_runs,
+    plot,
+    run_offsets,
+    window_start,
+)
+from pythonanywhere.task import Task
+
+
+def make_task(task_id, minute, hour=None, enabled=True, expiry=None):
+    return Task.from_api_specs(
+        {
+            "id": task_id,
+            "command": f"echo {task_id}",
+            "minute": minute,
+            "hour": hour,
+            "interval": "daily" if hour is not None else "hourly",
+            "enabled": enabled,
+            "expiry": expiry,
+        }
+    )
+
+
+@pytest.fixture
+def start():
+    return datetime(2024, 5, 1, 10, 30, tzinfo=timezone.utc)
+
+
+@pytest.mark.tasks
+class TestWindowStart:
+    def test_rounds_up_to_full_minute(self):
+        now = datetime(2024, 5, 1, 10, 29, 15, tzinfo=timezone.utc)
+
+        assert window_start(now) == datetime(2024, 5, 1, 10, 30, tzinfo=timezone.utc)
+
+    def test_keeps_full_minute(self, start):
+        assert window_start(start) == start
+
+
+@pytest.mark.tasks
+class TestRunOffsets:
+    def test_hourly_task(self, start):
+        assert list(run_offsets(make_task(1, 45), start, 180)) == [15, 75, 135]
+        assert list(run_offsets(make_task(1, 30), start, 61)) == [0, 60]
+
+    def test_daily_task(self, start):
+        assert list(run_offsets(make_task(1, 0, hour=9), start, 3 * 1440)) == [1350, 2790, 4230]
+
+    def test_next_runs(self, start):
+        assert next_runs(make_task(1, 0, hour=11), start, 2) == [
+            datetime(2024, 5, 1, 11, 0, tzinfo=timezone.utc),
+            datetime(2024, 5, 2, 11, 0, tzinfo=timezone.utc),
+        ]
+
+
+@pytest.mark.tasks
+class TestForecast:
+    def test_counts_enabled_tasks_per_minute(self, start):
+        tasks = [make_task(1, 0), make_task(2, 0, hour=11), make_task(3, 0, enabled=False)]
+
+        load = concurrency(tasks, start, 120)
+
+        assert load == {30: 2, 90: 1}
+
+    def test_flags_tasks_expiring_in_window(self, start):
+        tasks = [make_task(1, 0, expiry="2024-05-02"), make_task(2, 0, expiry="2024-06-01"), make_task(3, 0)]
+
+        assert [task.task_id for task in expiring(tasks, start, 24 * 60)] == [1]
+
+    def test_plots_one_line_per_hour(self, start):
+        plotted = plot({0: 1, 30: 12}, start, 60).splitlines()
+
+        assert plotted == [
+            "05-01 10h |" + " " * 30 + "1" + "." * 29 + "|",
+            "05-01 11h |+" + "." * 29 + " " * 30 + "|",
+        ]
@@ -0,0 +1,80 @@
+from collections import Counter
+from datetime import datetime, timedelta
+
+from pythonanywhere.server_log import ServerHealth, collect_server_health, parse_server_line
+
+
+def test_parses_server_lines():
+    assert parse_server_line(b"2024-03-01 16:00:05 *** HARAKIRI ON WORKER 2 (pid: 123, try: 1) ***") == (
+        datetime(2024, 3, 1, 16, 0, 5),
+        "harakiri",
+    )
+    assert parse_server_line(b"Fri Mar  1 16:00:06 2024 - Respawned uWSGI worker 2 (new pid: 456)") == (
+        datetime(2024, 3, 1, 16, 0, 6),
+        "respawn",
+    )
+    assert parse_server_line(
+        b'2024-03-01 16:00:07 *** uWSGI listen queue of socket "127.0.0.1:8000" (fd: 3) full !!! (101/100) ***'
+    ) == (datetime(2024, 3, 1, 16, 0, 7), "listen_queue")
+    assert parse_server_line(b"DAMN ! worker 2 (pid: 123) died, killed by signal 9 :( trying respawn ...") == (
+        None,
+        "died",
+    )
+    assert parse_server_line(b"2024-03-01 16:00:08 mapped 145840 bytes") == (datetime(2024, 3, 1, 16, 0, 8), None)
+
+
+class TestServerHealth:
+    def test_builds_timeline_and_saturated_periods(self):
+        health = ServerHealth(bucket=timedelta(minutes=5))
+        for line in [
+            b"2024-03-01 16:00:00 *** Starting uWSGI 2.0.20 (64bit) on [Fri Mar  1 16:00:00 2024] ***",
+            b"2024-03-01 16:02:00 *** HARAKIRI ON WORKER 1 (pid: 1, try: 1) ***",
+            b"DAMN ! worker 1 (pid: 1) died, killed by signal 9 :( trying respawn ...",
+            b"2024-03-01 16:02:01 Respawned uWSGI worker 1 (new pid: 2)",
+            b"2024-03-01 16:06:00 *** uWSGI listen queue of socket \"x\" (fd: 3) full !!! (101/100) ***",
+            b"2024-03-01 16:20:00 *** HARAKIRI ON WORKER 1 (pid: 2, try: 1) ***",
+            b"2024-03-01 16:31:00 Respawned uWSGI worker 1 (new pid: 3)",
+        ]:
+            health.add_line(line)
+
+        assert health.timeline() == [
+            (datetime(2024, 3, 1, 16, 0), Counter(reload=1, harakiri=1, died=1, respawn=1)),
+            (datetime(2024, 3, 1, 16, 5), Counter(listen_queue=1)),
+            (datetime(2024, 3, 1, 16, 20), Counter(harakiri=1)),
+            (datetime(2024, 3, 1, 16, 30), Counter(respawn=1)),
+        ]
+        assert health.saturated_periods() == [
+            (
+                datetime(2024, 3, 1, 16, 0),
+                datetime(2024, 3, 1, 16, 10),
+                Counter(reload=1, harakiri=1, died=1, respawn=1, listen_queue=1),
+            ),
+            (datetime(2024, 3, 1, 16, 20), datetime(2024, 3, 1, 16, 25), Counter(harakiri=1)),
+        ]
+
+    def test_counts_events_before_any_timestamp_as_undated(self):
+        health = ServerHealth()
+        health.add_line(b"Respawned uWSGI worker 1 (new pid: 2)")
+
+        assert health.timeline() == []
+        assert health.totals == Counter(respawn=1)
+
+
+class TestCollectServerHealth:
+    def test_streams_logs(self, tmp_path, mocker):
+        mocker.patch("pythonanywhere.webapp_logs.LOG_DIR", str(tmp_path))
+        (tmp_path / "foo.com.server.log").write_bytes(b"2024-03-01 16:02:00 *** HARAKIRI ON WORKER 1 ***\n")
+        (tmp_path / "foo.com.server.log.1").write_bytes(b"2024-03-01 16:03:00 *** HARAKIRI ON WORKER 2 ***\n")
+
+        health, errors = collect_server_health("foo.com", [0, 1])
+
+        assert errors == []
+        assert health.timeline() == [(datetime(2024, 3, 1, 16, 0), Counter(harakiri=2))]
+
+    def test_reports_unreadable_logs(self, mocker):
+        mocker.patch("pythonanywhere.webapp_logs.RemoteLog").return_value.iter_lines.side_effect = Exception("nope")
+
+        health, errors = collect_server_health("foo.com", [0])
+
+        assert health.timeline() == []
+        assert [(path, str(error)) for path, error in errors] == [("/var/log/foo.com.server.log", "nope")]
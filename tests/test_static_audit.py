@@ -0,0 +1,91 @@
+from unittest.mock import call
+
+import pytest
+from pythonanywhere_core.exceptions import PythonAnywhereApiException
+
+from pythonanywhere.static_audit import (
+    StaticAudit,
+    collect_static_audit,
+    get_static_file_mappings,
+    locate_directory,
+    url_prefix,
+)
+
+
+def access_line(path, status=200, response_time=0.05):
+    return (
+        f'1.2.3.4 - - [01/Mar/2024:16:00:05 +0000] "GET {path} HTTP/1.1" {status} 1234 '
+        f'"-" "Mozilla/5.0" "1.2.3.4" response-time={response_time}'
+    ).encode()
+
+
+def test_url_prefix():
+    assert url_prefix("/assets/css/site.css") == "/assets/"
+    assert url_prefix("/favicon.ico") == "/favicon.ico"
+
+
+class TestGetStaticFileMappings:
+    def test_returns_mappings(self, mocker):
+        mock_call_api = mocker.patch("pythonanywhere.static_audit.call_api")
+        mock_call_api.return_value.json.return_value = [{"id": 1, "url": "/static/", "path": "/home/me/static"}]
+        webapp = mocker.Mock(domain_url="https://www.pythonanywhere.com/api/v0/user/me/webapps/foo.com/")
+
+        assert get_static_file_mappings(webapp) == [{"id": 1, "url": "/static/", "path": "/home/me/static"}]
+        assert mock_call_api.call_args == call(
+            "https://www.pythonanywhere.com/api/v0/user/me/webapps/foo.com/static_files/", "get"
+        )
+
+    def test_raises_on_error(self, mocker):
+        mock_call_api = mocker.patch("pythonanywhere.static_audit.call_api")
+        mock_call_api.return_value.ok = False
+
+        with pytest.raises(PythonAnywhereApiException):
+            get_static_file_mappings(mocker.Mock(domain_url="url/"))
+
+
+class TestStaticAudit:
+    def test_groups_unmapped_successful_asset_requests_by_prefix(self):
+        audit = StaticAudit(mapped_urls=["/static/"])
+        for line in [
+            access_line("/assets/css/site.css?v=3", response_time=0.5),
+            access_line("/assets/js/app.js", 304, 0.25),
+            access_line("/assets/js/missing.js", 404),
+            access_line("/static/css/site.css"),
+            access_line("/api/items/1"),
+            access_line("/favicon.ico", response_time=1.0),
+        ]:
+            audit.add_line(line)
+
+        assert [(prefix, stats.requests, stats.worker_time) for prefix, stats in audit.top()] == [
+            ("/favicon.ico", 1, 1.0),
+            ("/assets/", 2, 0.75),
+        ]
+        assert audit.prefixes["/assets/"].samples == ["/assets/css/site.css", "/assets/js/app.js"]
+
+
+class TestLocateDirectory:
+    def test_finds_directory_holding_requested_files(self, tmp_path):
+        (tmp_path / "assets").mkdir()
+        (tmp_path / "mysite" / "assets" / "css").mkdir(parents=True)
+        (tmp_path / "mysite" / "assets" / "css" / "site.css").touch()
+
+        assert locate_directory("/assets/", ["/assets/css/site.css"], tmp_path) == tmp_path / "mysite" / "assets"
+
+    def test_finds_files_in_root(self, tmp_path):
+        (tmp_path / "favicon.ico").touch()
+
+        assert locate_directory("/favicon.ico", ["/favicon.ico"], tmp_path) == tmp_path / "favicon.ico"
+
+    def test_returns_none_when_files_not_found(self, tmp_path):
+        assert locate_directory("/assets/", ["/assets/site.css"], tmp_path) is None
+
+
+def test_collect_static_audit_streams_logs(tmp_path, mocker):
+    mocker.patch("pythonanywhere.webapp_logs.LOG_DIR", str(tmp_path))
+    (tmp_path / "foo.com.access.log").write_bytes(access_line("/assets/a.css") + b"\n")
+    (tmp_path / "foo.com.access.log.1").write_bytes(access_line("/static/a.css") + b"\n")
+
+    audit, errors = collect_static_audit("foo.com", [0, 1], mapped_urls=["/static/"])
+
+    assert errors == []
+    assert list(audit.prefixes) == ["/assets/"]
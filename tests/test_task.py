@@ -2,7 +2,9 @@ import getpass
 from unittest.mock import call
 
 import pytest
+from pythonanywhere_core.exceptions import PythonAnywhereApiException
 
+from pythonanywhere.schedule_cache import ScheduleCache
 from pythonanywhere.task import Task, TaskList
 
 
@@ -26,6 +28,13 @@ def task_specs():
     }
 
 
+@pytest.fixture
+def enabled_cache(tmp_path, mocker):
+    cache = ScheduleCache(ttl=60, path=tmp_path / "schedule.json")
+    mocker.patch("pythonanywhere.task.Task.cache", cache)
+    return cache
+
+
 @pytest.fixture
 def example_task(task_specs):
     task = Task()
@@ -77,6 +86,28 @@ class TestTaskFromId:
             assert getattr(task, spec) == expected_value
         assert task.__repr__() == "Daily task <42>: 'echo foo' enabled at 16:00"
 
+    def test_uses_one_list_call_when_cache_enabled(self, task_specs, enabled_cache, mocker):
+        mock_get_specs = mocker.patch("pythonanywhere.task.Schedule.get_specs")
+        mock_get_list = mocker.patch("pythonanywhere.task.Schedule.get_list")
+        api_specs = {**task_specs, "id": task_specs.pop("task_id")}
+        mock_get_list.return_value = [api_specs, {**api_specs, "id": 43}]
+
+        tasks = [Task.from_id(42), Task.from_id(43)]
+
+        assert [task.task_id for task in tasks] == [42, 43]
+        assert mock_get_list.call_count == 1
+        assert mock_get_specs.call_count == 0
+
+    def test_falls_back_to_get_specs_when_task_not_in_cached_list(self, task_specs, enabled_cache, mocker):
+        mock_get_specs = mocker.patch("pythonanywhere.task.Schedule.get_specs")
+        mock_get_specs.return_value = task_specs
+        mocker.patch("pythonanywhere.task.Schedule.get_list").return_value = []
+
+        task = Task.from_id(42)
+
+        assert mock_get_specs.call_args == call(42)
+        assert task.task_id == 42
+
 
 @pytest.mark.tasks
 class TestTaskCreateSchedule:
@@ -132,6 +163,45 @@ class TestTaskDeleteSchedule:
         assert str(e.value) == "error msg"
         assert mock_delete.call_count == 1
 
+    def test_removes_task_from_cache(self, example_task, enabled_cache, mocker):
+        mocker.patch("pythonanywhere.task.Schedule.delete").return_value = True
+        enabled_cache.store([{"id": 42}, {"id": 43}])
+
+        example_task.delete_schedule()
+
+        assert enabled_cache.load() == [{"id": 43}]
+
+
+@pytest.mark.tasks
+class TestTaskExtendSchedule:
+    def test_posts_to_extend_url_and_refreshes_specs(self, mocker, example_task, task_specs, enabled_cache):
+        mock_call_api = mocker.patch("pythonanywhere.task.call_api")
+        mock_get_specs = mocker.patch("pythonanywhere.task.Schedule.get_specs")
+        mock_get_specs.return_value = {**task_specs, "expiry": "2999-01-01"}
+        enabled_cache.store([{**task_specs}])
+        example_task.expiry = "2998-01-01"
+        example_task.extend_url = "/user/joe/schedule/task/42/extend"
+
+        result = example_task.extend_schedule()
+
+        site = example_task.schedule.base_url.split("/api/")[0]
+        assert mock_call_api.call_args == call(f"{site}/user/joe/schedule/task/42/extend", "POST")
+        assert mock_get_specs.call_args == call(42)
+        assert result == example_task.expiry == "2999-01-01"
+        assert enabled_cache.load()[0]["expiry"] == "2999-01-01"
+
+    def test_raises_when_extend_fails(self, mocker, example_task):
+        mock_call_api = mocker.patch("pythonanywhere.task.call_api")
+        mock_call_api.return_value.ok = False
+        mock_call_api.return_value.text = "nope"
+        mock_get_specs = mocker.patch("pythonanywhere.task.Schedule.get_specs")
+
+        with pytest.raises(PythonAnywhereApiException) as e:
+            example_task.extend_schedule()
+
+        assert "Could not extend task 42" in str(e.value)
+        assert mock_get_specs.call_count == 0
+
 
 @pytest.mark.tasks
 class TestTaskUpdateSchedule:
@@ -145,16 +215,7 @@ class TestTaskUpdateSchedule:
 
         example_task.update_schedule(params, porcelain=True)
 
-        assert mock_schedule_update.call_args == call(
-            42,
-            {
-                "hour": 16,
-                "minute": 0,
-                "enabled": False,
-                "interval": "daily",
-                "command": "echo foo",
-            },
-        )
+        assert mock_schedule_update.call_args == call(42, {"enabled": False})
         assert mock_info.call_args == call("Task 42 updated:\n<enabled> from 'True' to 'False'")
         assert mock_update_specs.call_args == call(task_specs)
 
@@ -173,6 +234,17 @@ class TestTaskUpdateSchedule:
         assert mock_snake.call_args == call("Task 42 updated: <enabled> from 'True' to 'False'")
         assert mock_update_specs.call_args == call(task_specs)
 
+    def test_patches_cache_with_api_response(self, mocker, example_task, enabled_cache, task_specs):
+        api_specs = {**task_specs, "id": task_specs.pop("task_id")}
+        new_specs = {**api_specs, "enabled": False}
+        mocker.patch("pythonanywhere.task.Schedule.update").return_value = new_specs
+        mocker.patch("pythonanywhere.task.logger.info")
+        enabled_cache.store([api_specs])
+
+        example_task.update_schedule({"enabled": False}, porcelain=True)
+
+        assert enabled_cache.load() == [new_specs]
+
     def test_changes_daily_to_hourly(self, example_task, task_specs, mocker):
         mock_schedule_update = mocker.patch("pythonanywhere.task.Schedule.update")
         mock_update_specs = mocker.patch("pythonanywhere.task.Task.update_specs")
@@ -184,12 +256,11 @@ class TestTaskUpdateSchedule:
 
         assert mock_update_specs.call_args == call(task_specs)
 
-    def test_warns_when_nothing_to_update(self, mocker, example_task, task_specs):
+    def test_warns_without_request_when_nothing_to_update(self, mocker, example_task):
         mock_schedule_update = mocker.patch("pythonanywhere.task.Schedule.update")
         mock_snake = mocker.patch("pythonanywhere.task.snakesay")
         mock_warning = mocker.patch("pythonanywhere.task.logger.warning")
         mock_update_specs = mocker.patch("pythonanywhere.task.Task.update_specs")
-        mock_schedule_update.return_value = task_specs
         params = {"enabled": True, "minute": 0}
 
         example_task.update_schedule(params)
@@ -197,9 +268,30 @@ class TestTaskUpdateSchedule:
         assert mock_snake.call_args == call("Nothing to update!")
         assert mock_warning.call_args == call(mock_snake.return_value)
         assert mock_update_specs.call_count == 0
-        assert mock_schedule_update.call_args == call(
-            42, {"hour": 16, "enabled": True, "interval": "daily", "command": "echo foo"},
+        assert mock_schedule_update.call_count == 0
+
+    def test_sends_only_changed_params(self, mocker, example_task, task_specs):
+        mock_schedule_update = mocker.patch("pythonanywhere.task.Schedule.update")
+        mocker.patch("pythonanywhere.task.logger.info")
+        mock_schedule_update.return_value = {**task_specs, "minute": 5}
+
+        example_task.update_schedule({"command": "echo foo", "hour": 16, "minute": 5})
+
+        assert mock_schedule_update.call_args == call(42, {"minute": 5})
+
+    def test_updates_task_with_unknown_specs_using_response(self, mocker, task_specs):
+        mock_schedule_update = mocker.patch("pythonanywhere.task.Schedule.update")
+        mock_info = mocker.patch("pythonanywhere.task.logger.info")
+        mock_schedule_update.return_value = {**task_specs, "enabled": False}
+        task = Task.to_be_updated(42)
+
+        task.update_schedule({"enabled": False, "hour": 3, "interval": "hourly"}, porcelain=True)
+
+        assert mock_schedule_update.call_args == call(42, {"enabled": False, "interval": "hourly"})
+        assert mock_info.call_args == call(
+            "Task 42 updated:\n<enabled> to 'False'\n<interval> to 'daily'"
         )
+        assert (task.command, task.enabled) == ("echo foo", False)
 
 
 @pytest.mark.tasks
@@ -209,8 +301,59 @@ class TestTaskList:
         mock_get_list.return_value = [task_specs]
         mock_from_specs = mocker.patch("pythonanywhere.task.Task.from_api_specs")
 
-        TaskList()
+        task_list = TaskList()
+
+        assert mock_get_list.call_count == 1
+        assert mock_from_specs.call_count == 0
+
+        task_list.tasks
+        task_list.tasks
 
         assert mock_from_specs.call_args == call(task_specs)
         assert mock_from_specs.call_count == len(mock_get_list.return_value)
         assert mock_get_list.call_count == 1
+
+    def test_uses_and_fills_cache_when_enabled(self, task_specs, enabled_cache, mocker):
+        mock_get_list = mocker.patch("pythonanywhere.task.Schedule.get_list")
+        mock_get_list.return_value = [task_specs]
+
+        first, second = TaskList(), TaskList()
+
+        assert mock_get_list.call_count == 1
+        assert first.specs == second.specs == [task_specs]
+
+    def test_tasks_share_one_schedule_client(self, task_specs, mocker):
+        mock_get_list = mocker.patch("pythonanywhere.task.Schedule.get_list")
+        mock_get_list.return_value = [task_specs, {**task_specs, "task_id": 43}]
+
+        tasks = list(TaskList())
+
+        assert len(tasks) == 2
+        assert tasks[0].schedule is tasks[1].schedule is Task.schedule
+        assert [task.task_id for task in tasks] == [42, 43]
+
+
+@pytest.mark.tasks
+class TestTaskLogfilePath:
+    def test_strips_files_url_prefix(self, example_task):
+        example_task.logfile = f"/user/{example_task.user}/files/var/log/tasklog-42.log"
+
+        assert example_task.logfile_path == "/var/log/tasklog-42.log"
+
+    def test_is_none_without_logfile(self):
+        assert Task().logfile_path is None
+
+
+@pytest.mark.tasks
+class TestTaskUpdateSpecs:
+    def test_maps_id_and_ignores_unknown_specs(self, task_specs):
+        task = Task()
+
+        task.update_specs({"id": 42, "command": "echo foo", "something_new": "bar"})
+
+        assert task.task_id == 42
+        assert task.command == "echo foo"
+        assert not hasattr(task, "something_new")
+
+    def test_is_slotted(self):
+        assert not hasattr(Task(), "__dict__")
@@ -0,0 +1,90 @@
+import json
+import shlex
+import sys
+from datetime import datetime
+
+import pytest
+
+from pythonanywhere.task_mux import JobTable, dispatch, dispatcher_command, main
+from pythonanywhere.task_stats import parse_completion
+
+
+@pytest.fixture
+def table(tmp_path):
+    table = JobTable(tmp_path / "mux.json")
+    table.log_dir = str(tmp_path / "logs")
+    return table
+
+
+@pytest.mark.tasks
+class TestJobTable:
+    def test_adds_replaces_and_removes_jobs(self, table):
+        table.add("backup", "echo backup", hours=[2, 2])
+        table.add("feeds", "echo feeds")
+        table.add("backup", "echo new backup", hours=[3])
+        table.save()
+
+        loaded = JobTable(table.path)
+
+        assert loaded.jobs == [
+            {"name": "feeds", "command": "echo feeds"},
+            {"name": "backup", "command": "echo new backup", "hours": [3]},
+        ]
+        assert loaded.remove("feeds") is True
+        assert loaded.remove("feeds") is False
+
+    def test_validates_hours(self, table):
+        with pytest.raises(ValueError):
+            table.add("backup", "echo backup", hours=[24])
+
+    def test_selects_due_jobs(self, table):
+        table.add("backup", "echo backup", hours=[2])
+        table.add("feeds", "echo feeds")
+
+        assert [job["name"] for job in table.due(datetime(2024, 1, 1, 2, 5))] == ["backup", "feeds"]
+        assert [job["name"] for job in table.due(datetime(2024, 1, 1, 3, 5))] == ["feeds"]
+
+    def test_log_path_is_safe_for_job_name(self, table):
+        assert table.log_path({"name": "my job/1"}).name == "mux-my_job_1.log"
+
+
+@pytest.mark.tasks
+class TestDispatch:
+    def test_runs_due_jobs_logging_each_separately(self, table):
+        table.add("ok", "echo fine")
+        table.add("broken", "echo oops; exit 2")
+        table.add("later", "echo later", hours=[23])
+
+        results = dispatch(table, workers=2, now=datetime(2024, 1, 1, 1, 0))
+
+        assert results == [("ok", 0), ("broken", 2)]
+        ok_log = table.log_path({"name": "ok"}).read_bytes().splitlines()
+        assert ok_log[0] == b"fine"
+        assert parse_completion(ok_log[-1])[2] == 0
+        broken_log = table.log_path({"name": "broken"}).read_bytes().splitlines()
+        assert parse_completion(broken_log[-1])[2] == 2
+        assert not table.log_path({"name": "later"}).exists()
+
+    def test_main_exits_with_failure_when_any_job_failed(self, table, capsys):
+        table.add("broken", "exit 1")
+        table.save()
+
+        assert main([str(table.path), "--workers=1"]) == 1
+        assert "Job broken return code was 1." in capsys.readouterr().out
+
+    def test_dispatcher_command_uses_absolute_table_path(self, tmp_path):
+        command = dispatcher_command(tmp_path / "mux.json", workers=3)
+
+        assert shlex.split(command) == [
+            f"python{sys.version_info.major}.{sys.version_info.minor}",
+            "-m",
+            "pythonanywhere.task_mux",
+            str(tmp_path / "mux.json"),
+            "--workers=3",
+        ]
+        assert sys.executable not in command
+
+    def test_dispatcher_command_uses_given_interpreter(self, tmp_path):
+        command = dispatcher_command(tmp_path / "mux.json", python="python3.11")
+
+        assert shlex.split(command)[0] == "python3.11"
@@ -0,0 +1,166 @@
+import json
+import shlex
+import sys
+from pathlib import Path
+
+import pytest
+
+from pythonanywhere.resource_profile import RunProfile
+from pythonanywhere.task_runner import (
+    aggregate_metrics,
+    default_lock_path,
+    default_metrics_path,
+    main,
+    overlap_guard,
+    read_metrics,
+    unwrap_command,
+    wrap_command,
+)
+
+
+@pytest.mark.tasks
+class TestWrapCommand:
+    def test_wraps_command_with_default_metrics_path(self):
+        command = "echo 'foo bar'"
+
+        wrapped = wrap_command(command, metrics=True)
+
+        assert shlex.split(wrapped) == [
+            f"python{sys.version_info.major}.{sys.version_info.minor}",
+            "-m",
+            "pythonanywhere.task_runner",
+            f"--metrics={default_metrics_path(command)}",
+            "--",
+            command,
+        ]
+
+    def test_wrapped_command_contains_no_local_paths(self):
+        wrapped = wrap_command("echo foo", metrics="/var/log/m.jsonl", lock="~/l.lock")
+
+        assert sys.executable not in wrapped
+        assert sys.prefix not in wrapped
+        assert str(Path.cwd()) not in wrapped
+        assert shlex.split(wrapped)[0] == f"python{sys.version_info.major}.{sys.version_info.minor}"
+
+    def test_wraps_command_with_given_interpreter(self):
+        wrapped = wrap_command("echo foo", metrics=True, python="/home/me/.virtualenvs/app/bin/python")
+
+        assert shlex.split(wrapped)[0] == "/home/me/.virtualenvs/app/bin/python"
+        assert unwrap_command(wrapped)[0] == "echo foo"
+
+    def test_unwraps_wrapped_command(self):
+        wrapped = wrap_command("echo foo && ls -la", metrics="/var/log/m.jsonl")
+
+        assert unwrap_command(wrapped) == ("echo foo && ls -la", {"--metrics": "/var/log/m.jsonl"})
+
+    def test_does_not_unwrap_other_commands(self):
+        assert unwrap_command("python3 -m http.server") == ("python3 -m http.server", {})
+        assert unwrap_command("echo 'unbalanced") == ("echo 'unbalanced", {})
+
+    def test_rewrapping_keeps_original_command(self):
+        wrapped = wrap_command(wrap_command("echo foo", metrics=True), metrics=True)
+
+        assert unwrap_command(wrapped)[0] == "echo foo"
+
+    def test_wraps_command_with_lock_and_policy(self):
+        wrapped = wrap_command("echo foo", lock=True, on_overlap="queue")
+
+        assert unwrap_command(wrapped) == (
+            "echo foo",
+            {"--lock": default_lock_path("echo foo"), "--on-overlap": "queue"},
+        )
+
+    def test_adds_lock_keeping_metrics(self):
+        wrapped = wrap_command(wrap_command("echo foo", metrics="/m.jsonl"), lock="/l.lock")
+
+        assert unwrap_command(wrapped)[1] == {"--metrics": "/m.jsonl", "--lock": "/l.lock", "--on-overlap": "skip"}
+
+    def test_does_not_wrap_without_options(self):
+        assert wrap_command("echo foo", on_overlap="queue") == "echo foo"
+
+    def test_rejects_unknown_overlap_policy(self):
+        with pytest.raises(ValueError):
+            wrap_command("echo foo", lock=True, on_overlap="panic")
+
+    def test_metrics_path_is_stable_for_command(self):
+        assert default_metrics_path("echo foo") == default_metrics_path("echo foo")
+        assert default_metrics_path("echo foo") != default_metrics_path("echo bar")
+        assert default_metrics_path("echo foo").startswith("/var/log/tasklog-metrics-")
+
+
+@pytest.mark.tasks
+class TestRunner:
+    def test_runs_command_and_appends_metrics(self, tmp_path):
+        metrics = tmp_path / "metrics.jsonl"
+
+        assert main([f"--metrics={metrics}", "--", "exit 0"]) == 0
+        assert main([f"--metrics={metrics}", "--", "exit 3"]) == 3
+
+        records = [json.loads(line) for line in metrics.read_text().splitlines()]
+        assert [record["returncode"] for record in records] == [0, 3]
+        assert {"started", "wall", "cpu_user", "peak_rss"} <= set(records[0])
+
+    def test_runs_command_without_metrics(self, tmp_path):
+        assert main(["--", f"touch {tmp_path / 'ran'}"]) == 0
+        assert (tmp_path / "ran").exists()
+
+
+@pytest.mark.tasks
+class TestReadMetrics:
+    def test_reads_valid_records_and_aggregates_them(self):
+        profile = RunProfile(2.0, 1.0, 0.5, 100, 0, 0, 0)
+        lines = [
+            json.dumps({"started": "2024-01-01T00:00:00", **profile._asdict()}).encode(),
+            b"garbage",
+            json.dumps({**profile._asdict(), "returncode": 1}),
+        ]
+
+        profiles = read_metrics(lines)
+        summary = aggregate_metrics(profiles)
+
+        assert len(profiles) == 2
+        assert summary["runs"] == 2
+        assert summary["failures"] == 1
+        assert summary["cpu_user"]["max"] == 1.0
+
+    def test_aggregates_nothing(self):
+        assert aggregate_metrics([]) is None
+
+
+@pytest.mark.tasks
+class TestOverlapGuard:
+    def test_skips_run_while_lock_is_held(self, tmp_path, capsys):
+        lock = str(tmp_path / "task.lock")
+
+        with overlap_guard(lock) as first:
+            with overlap_guard(lock) as second:
+                assert first is True
+                assert second is False
+
+        assert "Skipped run, previous run" in capsys.readouterr().out
+        with overlap_guard(lock) as third:
+            assert third is True
+
+    def test_queues_only_one_run(self, tmp_path, capsys, mocker):
+        lock = str(tmp_path / "task.lock")
+        mock_try_lock = mocker.patch("pythonanywhere.task_runner._try_lock")
+        mock_try_lock.side_effect = [False, True, True]
+
+        with overlap_guard(lock, "queue") as may_run:
+            assert may_run is True
+
+        assert "Waiting for previous run" in capsys.readouterr().out
+
+        mock_try_lock.side_effect = [False, False]
+        with overlap_guard(lock, "queue") as may_run:
+            assert may_run is False
+
+    def test_runner_skips_command_when_locked(self, tmp_path):
+        lock = str(tmp_path / "task.lock")
+
+        with overlap_guard(lock):
+            assert main([f"--lock={lock}", "--", f"touch {tmp_path / 'ran'}"]) == 0
+
+        assert not (tmp_path / "ran").exists()
+        assert main([f"--lock={lock}", "--", f"touch {tmp_path / 'ran'}"]) == 0
+        assert (tmp_path / "ran").exists()
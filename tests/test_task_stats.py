@@ -0,0 +1,92 @@
+from datetime import datetime
+
+import pytest
+
+from pythonanywhere.task import Task
+from pythonanywhere.task_stats import (
+    TaskRunStats,
+    collect_task_stats,
+    parse_completion,
+    percentile,
+)
+
+
+def completion(day, duration, code=0):
+    return (
+        f"2024-03-{day:02d} 16:00:05 -- Completed task, took {duration:.2f} seconds, "
+        f"return code was {code}."
+    ).encode()
+
+
+@pytest.fixture
+def task():
+    return Task.from_api_specs({"id": 42, "command": "echo foo", "logfile": "/user/me/files/tmp/x.log", "user": "me"})
+
+
+@pytest.mark.tasks
+class TestParseCompletion:
+    def test_parses_completion_record(self):
+        assert parse_completion(completion(1, 4, code=1)) == (datetime(2024, 3, 1, 16, 0, 5), 4.0, 1)
+
+    def test_ignores_other_lines(self):
+        assert parse_completion(b"foo") is None
+        assert parse_completion(b"") is None
+
+
+@pytest.mark.tasks
+class TestPercentile:
+    def test_uses_nearest_rank(self):
+        values = list(range(1, 21))
+
+        assert percentile(values, 0.5) == 10
+        assert percentile(values, 0.95) == 19
+        assert percentile([3], 0.95) == 3
+        assert percentile([], 0.5) is None
+
+
+@pytest.mark.tasks
+class TestTaskRunStats:
+    def test_aggregates_runs(self, task):
+        stats = TaskRunStats(task)
+        for day, duration, code in [(1, 1, 0), (2, 1, 0), (3, 3, 1), (4, 3, 0)]:
+            stats.add_line(completion(day, duration, code))
+            stats.add_line(b"some task output")
+
+        assert stats.runs == 4
+        assert stats.failure_rate == 0.25
+        assert stats.total == 8
+        assert stats.p50 == 1
+        assert stats.max == 3
+        assert stats.trend == 2
+        assert stats.first_run == datetime(2024, 3, 1, 16, 0, 5)
+        assert stats.last_run == datetime(2024, 3, 4, 16, 0, 5)
+
+    def test_has_no_values_without_runs(self, task):
+        stats = TaskRunStats(task)
+
+        assert stats.runs == 0
+        assert stats.failure_rate is None
+        assert stats.p95 is None
+        assert stats.trend is None
+
+
+@pytest.mark.tasks
+class TestCollectTaskStats:
+    def test_streams_logfiles_of_all_tasks(self, task, mocker):
+        mock_remote_log = mocker.patch("pythonanywhere.task_stats.RemoteLog")
+        mock_remote_log.return_value.iter_lines.return_value = [completion(1, 2), completion(2, 4)]
+
+        [(stats, error)] = collect_task_stats([task])
+
+        assert mock_remote_log.call_args.args == ("/tmp/x.log",)
+        assert error is None
+        assert stats.runs == 2
+
+    def test_reports_errors_per_task(self, task, mocker):
+        mock_remote_log = mocker.patch("pythonanywhere.task_stats.RemoteLog")
+        mock_remote_log.return_value.iter_lines.side_effect = Exception("nope")
+
+        [(stats, error)] = collect_task_stats([task])
+
+        assert str(error) == "nope"
+        assert stats.runs == 0
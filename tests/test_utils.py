@@ -1,9 +1,7 @@
 import getpass
 from unittest.mock import patch
 
-import pytest
-
-from pythonanywhere.utils import ensure_domain, format_log_deletion_message
+from pythonanywhere.utils import ensure_domain, get_cache_dir, run_concurrently
 
 
 class TestEnsureDomain:
@@ -33,15 +31,24 @@ class TestEnsureDomain:
         assert result == custom_domain
 
 
-@pytest.mark.parametrize(
-    "domain,log_type,log_index,expected",
-    [
-        ("foo.com", "access", 0, "Deleting current access log file for foo.com via API"),
-        ("bar.com", "error", 2, "Deleting old (archive number 2) error log file for bar.com via API"),
-        ("baz.com", "server", 9, "Deleting old (archive number 9) server log file for baz.com via API"),
-    ],
-)
-def test_format_log_deletion_message_with_various_inputs(domain, log_type, log_index, expected):
-    result = format_log_deletion_message(domain, log_type, log_index)
+class TestGetCacheDir:
+    def test_uses_xdg_cache_home(self, monkeypatch, tmp_path):
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+
+        assert get_cache_dir() == tmp_path / "pythonanywhere"
+        assert (tmp_path / "pythonanywhere").is_dir()
+
+
+class TestRunConcurrently:
+    def test_returns_results_and_errors_in_order(self):
+        def invert(x):
+            return 1 / x
+
+        results = run_concurrently(invert, [1, 0, 4], max_workers=2)
+
+        assert [(item, result) for item, result, _ in results] == [(1, 1.0), (0, None), (4, 0.25)]
+        assert isinstance(results[1][2], ZeroDivisionError)
+        assert results[0][2] is None
 
-    assert result == expected
+    def test_handles_no_items(self):
+        assert run_concurrently(str, []) == []
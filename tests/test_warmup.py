@@ -0,0 +1,105 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from pythonanywhere.warmup import WarmupResult, read_urls, time_to_first_success, warm_up
+
+
+@pytest.fixture
+def server():
+    """Local stand-in for a reloaded webapp: /cold responds with 503 to
+    the first two requests, /broken always fails."""
+
+    hits = {}
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            hits[self.path] = hits.get(self.path, 0) + 1
+            if self.path == "/broken" or (self.path == "/cold" and hits[self.path] <= 2):
+                self.send_response(503)
+            else:
+                self.send_response(200)
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}", hits
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_read_urls(tmp_path):
+    urls_file = tmp_path / "urls.txt"
+    urls_file.write_text("# warm up\n/\n\n/api/items\nhttps://cdn.example.com/x\n")
+
+    assert read_urls(urls_file, "foo.com") == [
+        "https://foo.com/",
+        "https://foo.com/api/items",
+        "https://cdn.example.com/x",
+    ]
+
+
+def test_warm_up_retries_until_urls_respond(server):
+    base_url, hits = server
+
+    results = warm_up([f"{base_url}/", f"{base_url}/cold"], timeout=10, interval=0.01)
+
+    assert [(result.url, result.status, result.attempts) for result in results] == [
+        (f"{base_url}/", 200, 1),
+        (f"{base_url}/cold", 200, 3),
+    ]
+    assert all(result.latency is not None and result.ready_after >= result.latency for result in results)
+    assert hits == {"/": 1, "/cold": 3}
+
+
+def test_warm_up_gives_up_after_timeout(server):
+    base_url, _ = server
+
+    result, = warm_up([f"{base_url}/broken"], timeout=0.05, interval=0.01)
+
+    assert result.status == 503
+    assert result.latency is None
+    assert result.ready_after is None
+    assert result.attempts > 1
+
+
+def test_warm_up_uses_given_client():
+    calls = []
+
+    def client(url, timeout):
+        calls.append((url, timeout))
+        if len(calls) == 1:
+            raise ConnectionError("refused")
+        return 200
+
+    result, = warm_up(["https://foo.com/"], client=client, interval=0, request_timeout=5)
+
+    assert calls == [("https://foo.com/", 5), ("https://foo.com/", 5)]
+    assert (result.status, result.attempts, result.error) == (200, 2, None)
+
+
+def test_warm_up_caps_request_timeout_at_time_left(mocker):
+    mocker.patch("pythonanywhere.warmup.time.monotonic", side_effect=[100, 108, 108.5])
+    calls = []
+
+    def client(url, timeout):
+        calls.append(timeout)
+        return 200
+
+    warm_up(["https://foo.com/"], client=client, timeout=10, request_timeout=30)
+
+    assert calls == [2]
+
+
+def test_time_to_first_success():
+    assert time_to_first_success([
+        WarmupResult("a", 200, 1, 0.1, 2.5, None),
+        WarmupResult("b", 200, 1, 0.1, 1.5, None),
+        WarmupResult("c", 503, 4, None, None, None),
+    ]) == 1.5
+    assert time_to_first_success([]) is None
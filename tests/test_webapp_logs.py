@@ -0,0 +1,134 @@
+from unittest.mock import Mock, call
+
+from pythonanywhere.webapp_logs import (
+    WebappLog,
+    collect_logs,
+    delete_webapp_logs,
+    format_deletion_summary,
+    log_path,
+    log_targets,
+)
+
+LOG_INFO = {"access": [0, 1], "error": [0], "server": []}
+
+
+class TestLogTargets:
+    def test_all_types_and_indices_from_log_info(self):
+        assert log_targets(LOG_INFO) == [("access", 0), ("access", 1), ("error", 0)]
+
+    def test_one_type_all_indices(self):
+        assert log_targets(LOG_INFO, "access", "all") == [("access", 0), ("access", 1)]
+
+    def test_all_types_one_index(self):
+        assert log_targets({}, "all", "3") == [("access", 3), ("error", 3), ("server", 3)]
+
+    def test_one_type_one_index(self):
+        assert log_targets({}, "error", 0) == [("error", 0)]
+
+
+class Lines:
+    def __init__(self):
+        self.lines = []
+
+    def add_line(self, line):
+        self.lines.append(line)
+
+    def merge(self, other):
+        self.lines.extend(other.lines)
+
+
+class TestCollectLogs:
+    def test_merges_lines_of_every_log_and_reports_unreadable_ones(self, tmp_path, mocker):
+        mocker.patch("pythonanywhere.webapp_logs.LOG_DIR", str(tmp_path))
+        (tmp_path / "foo.com.server.log").write_bytes(b"a\nb\n")
+        (tmp_path / "foo.com.server.log.1").write_bytes(b"c\n")
+        (tmp_path / "foo.com.server.log.2.gz").write_bytes(b"not gzipped")
+
+        total, errors = collect_logs("foo.com", "server", [0, 1, 2], Lines, max_workers=2)
+
+        assert sorted(total.lines) == [b"a", b"b", b"c"]
+        assert [path for path, _ in errors] == [str(tmp_path / "foo.com.server.log.2.gz")]
+
+
+class TestDeleteWebappLogs:
+    def test_deletes_targets_and_summarizes_per_type(self):
+        webapp = Mock()
+        webapp.delete_log.side_effect = lambda log_type, index: index == 1 and 1 / 0
+
+        summary = delete_webapp_logs(webapp, [("access", 0), ("access", 1), ("error", 0)], max_workers=2)
+
+        assert sorted(webapp.delete_log.call_args_list) == [call("access", 0), call("access", 1), call("error", 0)]
+        assert summary["error"] == ([0], [])
+        deleted, failed = summary["access"]
+        assert deleted == [0]
+        assert [(index, type(error)) for index, error in failed] == [(1, ZeroDivisionError)]
+
+
+class TestFormatDeletionSummary:
+    def test_formats_one_line_per_type(self):
+        summary = {"server": ([], [(2, Exception("gone"))]), "access": ([1, 0], [])}
+
+        assert format_deletion_summary("foo.com", summary) == (
+            "foo.com access logs: deleted 2 (current, 1)\n"
+            "foo.com server logs: deleted 0, failed 1 (2: gone)"
+        )
+
+
+class TestLogPath:
+    def test_returns_current_and_archived_paths(self):
+        assert log_path("foo.com", "access") == "/var/log/foo.com.access.log"
+        assert log_path("foo.com", "error", 1) == "/var/log/foo.com.error.log.1"
+        assert log_path("foo.com", "server", 3) == "/var/log/foo.com.server.log.3.gz"
+
+
+class TestWebappLog:
+    def test_recovers_entries_written_before_rotation(self, tmp_path, mocker):
+        mocker.patch("pythonanywhere.webapp_logs.LOG_DIR", str(tmp_path))
+        current = tmp_path / "foo.com.error.log"
+        current.write_bytes(b"one\n")
+        log = WebappLog("foo.com", "error")
+        assert log.read_new() == b"one\n"
+
+        (tmp_path / "foo.com.error.log.1").write_bytes(b"one\ntwo\n")
+        current.write_bytes(b"")
+
+        assert log.read_new() == b"two\n"
+        current.write_bytes(b"three\n")
+        assert log.read_new() == b"three\n"
+
+    def test_rereads_log_rotated_since_previous_read_and_bigger_than_offset(self, tmp_path, mocker):
+        mocker.patch("pythonanywhere.webapp_logs.LOG_DIR", str(tmp_path))
+        (tmp_path / "foo.com.error.log.1").write_bytes(b"one\ntwo\n")
+        (tmp_path / "foo.com.error.log").write_bytes(b"three\nfour\nfive\n")
+        log = WebappLog("foo.com", "error", offset=4, rotated=True)
+
+        assert log.read_new() == b"two\nthree\nfour\nfive\n"
+        assert log.offset == 16
+        assert log.read_new() == b""
+
+    def test_rechecks_archives_when_idle_and_rereads_rotated_log(self, tmp_path, mocker):
+        mocker.patch("pythonanywhere.webapp_logs.LOG_DIR", str(tmp_path))
+        mock_webapp = mocker.patch("pythonanywhere.webapp_logs.Webapp")
+        mock_webapp.return_value.get_log_info.return_value = {"error": [0]}
+        current = tmp_path / "foo.com.error.log"
+        current.write_bytes(b"one\n")
+        log = WebappLog("foo.com", "error", archives=[])
+        assert log.read_new() == b"one\n"
+        assert log.read_new() == b""
+
+        # rotated in place, new log already as big as the old one
+        (tmp_path / "foo.com.error.log.1").write_bytes(b"one\ntwo\n")
+        current.write_bytes(b"abc\n")
+        mock_webapp.return_value.get_log_info.return_value = {"error": [0, 1]}
+
+        assert log.read_new() == b"two\nabc\n"
+        assert log.archives == [1]
+        assert mock_webapp.call_args == call("foo.com")
+
+    def test_doesnt_check_archives_when_not_given(self, tmp_path, mocker):
+        mocker.patch("pythonanywhere.webapp_logs.LOG_DIR", str(tmp_path))
+        mock_webapp = mocker.patch("pythonanywhere.webapp_logs.Webapp")
+        (tmp_path / "foo.com.error.log").write_bytes(b"")
+
+        assert WebappLog("foo.com", "error").read_new() == b""
+        assert mock_webapp.call_count == 0